@@ -1,21 +1,37 @@
 
 import argparse
-import pandas as pd
-from core.indicators import compute_features
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from crypto_feature_framework.core.processor import compute_features_files, expand_inputs
 
 def main():
     parser = argparse.ArgumentParser(description="Crypto Feature Extractor CLI")
-    parser.add_argument('--input', required=True, help='Path to input CSV')
-    parser.add_argument('--output', default='features_sample.csv', help='Path to output features CSV')
+    parser.add_argument('--input', required=True, nargs='+',
+                        help='Trade CSV paths or globs, in time order; {date}/{month} placeholders expand over --start..--end')
+    parser.add_argument('--start', help='First date of a {date}/{month} input range')
+    parser.add_argument('--end', help='Last date of a {date}/{month} input range')
+    parser.add_argument('--output', default='features_sample.csv',
+                        help='Output .csv/.parquet file, or a directory when --partition is set')
+    parser.add_argument('--partition', choices=['D', 'M', 'Y'], help='Write one file per day/month/year under --output')
+    parser.add_argument('--format', default='parquet', choices=['parquet', 'csv'], help='Partition file format')
     parser.add_argument('--interval', default='1min', help='Time interval for resampling')
+    parser.add_argument('--chunksize', type=int, default=1_000_000, help='Trades read per chunk')
+    parser.add_argument('--workers', type=int, default=None, help='Processes reading files (default: one per CPU)')
 
     args = parser.parse_args()
-    df = pd.read_csv(args.input)
-    df.columns = [c.lower() for c in df.columns]
+    paths = expand_inputs(args.input, args.start, args.end)
+    if not paths:
+        parser.error("no input files matched")
 
-    features = compute_features(df, resample_interval=args.interval)
-    features.to_csv(args.output)
-    print(f"✅ Features written to {args.output}")
+    stats = compute_features_files(paths, args.output, interval=args.interval, chunksize=args.chunksize,
+                                   workers=args.workers, partition=args.partition, fmt=args.format)
+    print(f"✅ Features written to {args.output}: {stats['rows']:,} rows from {stats['trades']:,} trades "
+          f"in {stats['files']} file(s)")
+    print(f"⏱️ {stats['seconds']:.1f}s | {stats['trades_per_sec']:,.0f} trades/sec | "
+          f"peak RSS {stats['peak_rss_mb']:,.0f} MB")
 
 if __name__ == "__main__":
     main()
@@ -1,7 +1,140 @@
 
+import os
+import sys
+
 import numpy as np
 import pandas as pd
 
+from crypto_feature_framework.core.resampler import StreamingResampler
+
+# The app's rolling-window kernel, so indicator windows slide and recenter exactly as RingBuffer does.
+# Imported as utils.* like everywhere else: numba's on-disk cache is keyed by file, not module name
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+from utils.rolling_kernels import COUNT, MEAN, M2, welford_push
+
+from numba import njit
+
+INDICATOR_COLUMNS = ["sma_14", "ema_14", "rsi_14", "bb_mid", "bb_upper", "bb_lower"]
+
+# Sliding windows kept by the indicator kernel
+SMA, GAIN, LOSS, BB = range(4)
+# Scalar state: bars seen, previous price, EMA
+BARS, PREV, EMA = range(3)
+
+
+@njit(cache=True)
+def _indicator_kernel(prices, scalars, buffers, wstate, sizes, alpha, num_std, recenter_every, out):
+    """
+    Advances the indicator state over `prices` (one per bar), writing
+    sma, ema, rsi, bb_mid, bb_upper, bb_lower rows to `out` (NaN during warm-up).
+    """
+    for i in range(prices.shape[0]):
+        price = prices[i]
+
+        if scalars[BARS] == 0:
+            delta = np.nan
+            scalars[EMA] = price
+        else:
+            delta = price - scalars[PREV]
+            scalars[EMA] = (1.0 - alpha) * scalars[EMA] + alpha * price
+        scalars[BARS] += 1
+        scalars[PREV] = price
+
+        welford_push(buffers[SMA], sizes[SMA], wstate[SMA], price, recenter_every)
+        welford_push(buffers[GAIN], sizes[GAIN], wstate[GAIN], delta if delta > 0 else 0.0, recenter_every)
+        welford_push(buffers[LOSS], sizes[LOSS], wstate[LOSS], -delta if delta < 0 else 0.0, recenter_every)
+        welford_push(buffers[BB], sizes[BB], wstate[BB], price, recenter_every)
+
+        out[i, 1] = scalars[EMA]
+        out[i, 0] = wstate[SMA, MEAN] if wstate[SMA, COUNT] == sizes[SMA] else np.nan
+
+        if wstate[GAIN, COUNT] == sizes[GAIN]:
+            rs = wstate[GAIN, MEAN] / (wstate[LOSS, MEAN] + 1e-9)
+            out[i, 2] = 100 - (100 / (1 + rs))
+        else:
+            out[i, 2] = np.nan
+
+        n = wstate[BB, COUNT]
+        if n == sizes[BB]:
+            var = wstate[BB, M2] / (n - 1) if wstate[BB, M2] > 0 else 0.0
+            std = np.sqrt(var)
+            mid = wstate[BB, MEAN]
+            out[i, 3] = mid
+            out[i, 4] = mid + num_std * std
+            out[i, 5] = mid - num_std * std
+        else:
+            out[i, 3] = out[i, 4] = out[i, 5] = np.nan
+
+
+class StreamingIndicators:
+    """
+    Bar-by-bar SMA, EMA, RSI and Bollinger bands with O(1) work per bar.
+
+    Runs the same compiled kernel as compute_indicators() on one bar at a time,
+    so a stream of bars yields exactly the batch values, bit for bit.
+    """
+
+    def __init__(self, sma_window=14, ema_span=14, rsi_period=14, bb_window=20, bb_std=2.0,
+                 recenter_every=10000):
+        self.sizes = np.array([sma_window, rsi_period, rsi_period, bb_window], dtype=np.int64)
+        self.alpha = 2.0 / (ema_span + 1.0)
+        self.num_std = float(bb_std)
+        self.recenter_every = recenter_every
+        self.scalars = np.zeros(3)
+        self.buffers = np.zeros((4, int(self.sizes.max())))
+        self.wstate = np.zeros((4, 5))
+        self._price = np.empty(1)
+        self._out = np.empty((1, len(INDICATOR_COLUMNS)))
+
+    def update(self, price: float):
+        """
+        Adds one bar's price. Returns the indicator dict once every indicator is warm, else None.
+        """
+        self._price[0] = price
+        _indicator_kernel(self._price, self.scalars, self.buffers, self.wstate, self.sizes, self.alpha,
+                          self.num_std, self.recenter_every, self._out)
+        row = self._out[0]
+        if np.isnan(row).any():
+            return None
+        return dict(zip(INDICATOR_COLUMNS, row.tolist()))
+
+    def run(self, prices) -> np.ndarray:
+        """
+        Advances the state over many bars at once; returns the (n, 6) indicator rows.
+        """
+        prices = np.ascontiguousarray(prices, dtype=np.float64)
+        out = np.empty((len(prices), len(INDICATOR_COLUMNS)))
+        _indicator_kernel(prices, self.scalars, self.buffers, self.wstate, self.sizes, self.alpha, self.num_std,
+                          self.recenter_every, out)
+        return out
+
+
+class StreamingFeatures:
+    """
+    Trades in, feature rows out: StreamingResampler bars feeding StreamingIndicators.
+    Emits the same rows compute_features() would for the trades seen so far.
+    """
+
+    def __init__(self, resample_interval='1min', **indicator_params):
+        self.resampler = StreamingResampler(resample_interval)
+        self.indicators = StreamingIndicators(**indicator_params)
+
+    def update(self, timestamps_ns, price, quantity) -> pd.DataFrame:
+        return self._features(self.resampler.update(timestamps_ns, price, quantity))
+
+    def update_bars(self, bars) -> pd.DataFrame:
+        """
+        Same as update(), for raw aggregates already built by StreamingResampler.aggregate().
+        """
+        return self._features(self.resampler.to_frame(self.resampler.merge(bars)))
+
+    def flush(self) -> pd.DataFrame:
+        return self._features(self.resampler.flush())
+
+    def _features(self, bars):
+        return bars_to_features(bars, self.indicators.run(bars["close"].to_numpy()))
+
+
 def compute_vwap(df):
     return (df['price'] * df['quantity']).sum() / df['quantity'].sum()
 
@@ -23,25 +156,31 @@ def compute_trade_frequency(df, resample_interval='1min'):
     trade_counts = df.resample(resample_interval).size()
     return trade_counts
 
+def compute_indicators(prices, **indicator_params) -> np.ndarray:
+    """
+    Batch SMA/EMA/RSI/Bollinger over a bar price array; columns follow INDICATOR_COLUMNS.
+    """
+    return StreamingIndicators(**indicator_params).run(prices)
+
+def bars_to_features(bars, indicators):
+    features = pd.DataFrame({
+        'price': bars['close'],
+        'quantity': bars['volume'],
+        'vwap': bars['vwap']
+    }, index=bars.index)
+    features[INDICATOR_COLUMNS] = indicators
+    features['trade_freq'] = bars['count']
+    return features.dropna()
+
 def compute_features(df, resample_interval='1min'):
     df['timestamp'] = pd.to_datetime(df['timestamp'])
-    df.set_index('timestamp', inplace=True)
-    df = df.sort_index()
-
-    resampled = df.resample(resample_interval).agg({
-        'price': 'last',
-        'quantity': 'sum'
-    }).dropna()
-
-    resampled['vwap'] = df.resample(resample_interval).apply(compute_vwap)
-    resampled['sma_14'] = resampled['price'].rolling(window=14).mean()
-    resampled['ema_14'] = resampled['price'].ewm(span=14, adjust=False).mean()
-    resampled['rsi_14'] = compute_rsi(resampled['price'])
-    bb_mid, bb_upper, bb_lower = compute_bollinger_bands(resampled['price'])
-    resampled['bb_mid'] = bb_mid
-    resampled['bb_upper'] = bb_upper
-    resampled['bb_lower'] = bb_lower
-    resampled['trade_freq'] = compute_trade_frequency(df, resample_interval=resample_interval)
-
-    return resampled.dropna()
- 
\ No newline at end of file
+    df = df.sort_values('timestamp', kind='stable')
+
+    # One vectorized pass: OHLC/VWAP/volume/count per bar from grouped sums
+    resampler = StreamingResampler(resample_interval)
+    bars = pd.concat([
+        resampler.update(df['timestamp'].to_numpy().astype('datetime64[ns]').astype(np.int64),
+                         df['price'].to_numpy(dtype=np.float64), df['quantity'].to_numpy(dtype=np.float64)),
+        resampler.flush()
+    ])
+    return bars_to_features(bars, compute_indicators(bars['close'].to_numpy()))
@@ -0,0 +1,106 @@
+
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from crypto_feature_framework.core.indicators import StreamingFeatures
+from crypto_feature_framework.core.resampler import StreamingResampler, peak_rss_mb
+from crypto_feature_framework.io.reader import read_trade_chunks
+from crypto_feature_framework.io.writer import ColumnarWriter, PartitionedWriter
+
+
+def expand_inputs(patterns, start=None, end=None):
+    """
+    Input files in processing order. Patterns may be globs and may contain
+    {date} (YYYY-MM-DD, daily) or {month} (YYYY-MM, monthly) placeholders,
+    which are filled for every period from `start` to `end` inclusive.
+    Files missing from a date range are skipped; duplicates are dropped.
+    """
+    paths = []
+    for pattern in patterns:
+        if "{date}" in pattern or "{month}" in pattern:
+            if start is None or end is None:
+                raise ValueError(f"{pattern} needs --start and --end")
+            if "{date}" in pattern:
+                periods = [{"date": d.strftime("%Y-%m-%d")} for d in pd.date_range(start, end, freq="D")]
+            else:
+                periods = [{"month": d.strftime("%Y-%m")} for d in pd.date_range(pd.Timestamp(start).replace(day=1),
+                                                                                   end, freq="MS")]
+            paths.extend(sorted(glob.glob(pattern.format(**p))) if glob.has_magic(pattern)
+                         else [pattern.format(**p)] for p in periods)
+        elif glob.has_magic(pattern):
+            paths.append(sorted(glob.glob(pattern)))
+        elif os.path.exists(pattern):
+            paths.append([pattern])
+        else:
+            raise FileNotFoundError(pattern)
+
+    return list(dict.fromkeys(p for group in paths for p in group if os.path.exists(p)))
+
+
+def aggregate_file(path, interval="1min", chunksize=1_000_000):
+    """
+    Worker: streams one trade file into raw bar aggregates (StreamingResampler.aggregate rows).
+    Returns (path, raw bars, trades read, peak RSS in MB).
+    """
+    resampler = StreamingResampler(interval)
+    parts = []
+    trades = 0
+    for ts, price, quantity in read_trade_chunks(path, chunksize):
+        trades += len(ts)
+        parts.append(resampler.merge(resampler.aggregate(ts, price, quantity)))
+    parts.append(resampler.flush_raw())
+    return path, np.vstack(parts), trades, peak_rss_mb()
+
+
+def compute_features_files(paths, output, interval="1min", chunksize=1_000_000, workers=None, partition=None,
+                           fmt="parquet", **indicator_params):
+    """
+    Features for a time-ordered sequence of trade files, as if they were one file.
+
+    Files are read in chunks and turned into bars in a process pool; the bars
+    then run, in file order, through one StreamingFeatures, so a bucket split
+    across two files is merged and indicator warm-up carries over file
+    boundaries. Output goes to one columnar file, or to one file per period
+    under `output` when `partition` is "D", "M" or "Y".
+
+    Returns a summary dict: files, trades, rows, seconds, trades_per_sec, peak_rss_mb.
+    """
+    started = time.perf_counter()
+    features = StreamingFeatures(interval, **indicator_params)
+    workers = workers or min(len(paths), os.cpu_count() or 1)
+    trades = 0
+    peak_rss = 0.0
+
+    writer = PartitionedWriter(output, partition, fmt) if partition else ColumnarWriter(output)
+    with writer:
+        if workers <= 1:
+            results = (aggregate_file(p, interval, chunksize) for p in paths)
+            pool = None
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            results = pool.map(aggregate_file, paths, [interval] * len(paths), [chunksize] * len(paths))
+        try:
+            for path, bars, n, rss in results:
+                trades += n
+                peak_rss = max(peak_rss, rss)
+                writer.write(features.update_bars(bars))
+            writer.write(features.flush())
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        rows = writer.rows
+
+    seconds = time.perf_counter() - started
+    return {
+        "files": len(paths),
+        "trades": trades,
+        "rows": rows,
+        "seconds": seconds,
+        "trades_per_sec": trades / seconds if seconds > 0 else 0.0,
+        "peak_rss_mb": max(peak_rss, peak_rss_mb())
+    }
@@ -0,0 +1,148 @@
+
+import os
+import resource
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from crypto_feature_framework.io.reader import read_trade_chunks
+from crypto_feature_framework.io.schema import BAR_COLUMNS
+from crypto_feature_framework.io.writer import ColumnarWriter
+
+
+class StreamingResampler:
+    """
+    Resamples time-ordered trade chunks into fixed-interval bars
+    (OHLC, mean, VWAP, volume, count) without holding more than one chunk.
+
+    The last bucket of each chunk may continue in the next one, so it is carried
+    over as a partial aggregate and merged, never emitted twice. Empty intervals
+    produce no row.
+    """
+
+    def __init__(self, interval="1min"):
+        self.interval_ns = pd.Timedelta(interval).value
+        self._carry = None  # [bucket, open, high, low, close, price_sum, pv, volume, count]
+
+    def update(self, timestamps_ns, price, quantity) -> pd.DataFrame:
+        """
+        Adds one chunk (epoch-ns timestamps) and returns the bars completed by it.
+        """
+        return self.to_frame(self.merge(self.aggregate(timestamps_ns, price, quantity)))
+
+    def flush(self) -> pd.DataFrame:
+        """
+        Emits the final, possibly partial, bucket.
+        """
+        return self.to_frame(self.flush_raw())
+
+    def aggregate(self, timestamps_ns, price, quantity) -> np.ndarray:
+        """
+        Raw per-bucket aggregates of one chunk, without touching the carry:
+        rows of [bucket, open, high, low, close, price_sum, pv, volume, count].
+        """
+        ts = np.asarray(timestamps_ns, dtype=np.int64)
+        if not len(ts):
+            return np.empty((0, 9))
+        price = np.asarray(price, dtype=np.float64)
+        quantity = np.asarray(quantity, dtype=np.float64)
+        if (np.diff(ts) < 0).any():
+            order = np.argsort(ts, kind="stable")
+            ts, price, quantity = ts[order], price[order], quantity[order]
+
+        bucket = ts // self.interval_ns
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(bucket)) + 1))
+        ends = np.append(starts[1:], len(ts)) - 1
+
+        return np.column_stack([
+            bucket[starts].astype(np.float64),
+            price[starts],
+            np.maximum.reduceat(price, starts),
+            np.minimum.reduceat(price, starts),
+            price[ends],
+            np.add.reduceat(price, starts),
+            np.add.reduceat(price * quantity, starts),
+            np.add.reduceat(quantity, starts),
+            (ends - starts + 1).astype(np.float64)
+        ])
+
+    def merge(self, bars) -> np.ndarray:
+        """
+        Folds time-ordered raw aggregates (from aggregate(), possibly of another
+        resampler) into the carry; returns the raw rows that are now complete.
+        """
+        if not len(bars):
+            return bars
+        bars = np.array(bars, dtype=np.float64)
+        carry = self._carry
+        if carry is not None:
+            if bars[0, 0] == carry[0]:
+                first = bars[0]
+                first[1] = carry[1]
+                first[2] = max(carry[2], first[2])
+                first[3] = min(carry[3], first[3])
+                first[5:] += carry[5:]
+            elif bars[0, 0] < carry[0]:
+                raise ValueError("Trade chunks must be in time order across chunk boundaries")
+            else:
+                bars = np.vstack([carry, bars])
+
+        self._carry = bars[-1].copy()
+        return bars[:-1]
+
+    def flush_raw(self) -> np.ndarray:
+        carry, self._carry = self._carry, None
+        return np.empty((0, 9)) if carry is None else carry[None, :]
+
+    def to_frame(self, bars) -> pd.DataFrame:
+        count = bars[:, 8]
+        volume = bars[:, 7]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            df = pd.DataFrame({
+                "open": bars[:, 1],
+                "high": bars[:, 2],
+                "low": bars[:, 3],
+                "close": bars[:, 4],
+                "mean": bars[:, 5] / count,
+                "vwap": bars[:, 6] / volume,
+                "volume": volume,
+                "count": count.astype(np.int64)
+            }, index=pd.to_datetime(bars[:, 0].astype(np.int64) * self.interval_ns))
+        df.index.name = "timestamp"
+        return df[BAR_COLUMNS]
+
+
+def resample_file(path, output_path, interval="1min", chunksize=1_000_000):
+    """
+    Streams one Binance trade CSV through a StreamingResampler into a columnar file.
+    Returns (output_path, trades read, bars written, peak RSS in MB).
+    """
+    resampler = StreamingResampler(interval)
+    trades = 0
+    with ColumnarWriter(output_path) as writer:
+        for ts, price, quantity in read_trade_chunks(path, chunksize):
+            trades += len(ts)
+            writer.write(resampler.update(ts, price, quantity))
+        writer.write(resampler.flush())
+        bars = writer.rows
+    return output_path, trades, bars, peak_rss_mb()
+
+
+def resample_files(jobs, interval="1min", chunksize=1_000_000, workers=None):
+    """
+    Resamples several trade files at once, one process per file.
+    `jobs` maps input path -> output path; returns resample_file results in job order.
+    """
+    jobs = list(dict(jobs).items())
+    workers = workers or min(len(jobs), os.cpu_count() or 1)
+    if workers <= 1:
+        return [resample_file(src, dst, interval, chunksize) for src, dst in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(resample_file, src, dst, interval, chunksize) for src, dst in jobs]
+        return [f.result() for f in futures]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
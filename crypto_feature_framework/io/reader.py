@@ -0,0 +1,48 @@
+
+import numpy as np
+import pandas as pd
+
+from crypto_feature_framework.io.schema import BINANCE_TRADE_COLUMNS, TRADE_DTYPES
+
+
+def _has_header(path):
+    with open(path, "r") as f:
+        first = f.readline()
+    return bool(first) and not first.lstrip()[:1].isdigit()
+
+
+def to_epoch_ns(timestamps):
+    """
+    Binance trade times are epoch ms in older dumps and epoch µs in newer ones; normalise to ns.
+    Datetime strings (exported CSVs) are parsed as-is.
+    """
+    timestamps = np.asarray(timestamps)
+    if timestamps.dtype == object or np.issubdtype(timestamps.dtype, np.datetime64):
+        return pd.to_datetime(timestamps).to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    ts = timestamps.astype(np.int64)
+    if not len(ts):
+        return ts
+    probe = int(ts[0])
+    if probe < 10**14:
+        return ts * 1_000_000      # ms
+    if probe < 10**17:
+        return ts * 1_000          # µs
+    return ts
+
+
+def read_trade_chunks(path, chunksize=1_000_000):
+    """
+    Yields (timestamp_ns, price, quantity) NumPy arrays from a Binance trade CSV,
+    `chunksize` rows at a time. Only the three needed columns are parsed.
+    Files with a header row (any case) may carry datetime strings as timestamps.
+    """
+    if _has_header(path):
+        reader = pd.read_csv(path, usecols=lambda c: c.strip().lower() in TRADE_DTYPES, chunksize=chunksize)
+    else:
+        reader = pd.read_csv(path, header=None, names=BINANCE_TRADE_COLUMNS, usecols=list(TRADE_DTYPES),
+                             dtype=TRADE_DTYPES, chunksize=chunksize)
+    for chunk in reader:
+        chunk.columns = [c.strip().lower() for c in chunk.columns]
+        yield (to_epoch_ns(chunk["timestamp"].to_numpy()),
+               chunk["price"].to_numpy(),
+               chunk["quantity"].to_numpy())
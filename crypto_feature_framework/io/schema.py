@@ -0,0 +1,12 @@
+
+# Column layout of Binance public trade dumps (data.binance.vision, spot trades), which have no header row
+BINANCE_TRADE_COLUMNS = [
+    "trade_id", "price", "quantity", "quote_quantity",
+    "timestamp", "buyer_is_maker", "best_match"
+]
+
+# Columns the resampler needs, and their dtypes
+TRADE_DTYPES = {"price": "float64", "quantity": "float64", "timestamp": "int64"}
+
+# Resampled bar columns, in output order
+BAR_COLUMNS = ["open", "high", "low", "close", "mean", "vwap", "volume", "count"]
@@ -0,0 +1,109 @@
+
+import glob
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; .parquet output then isn't available
+    pa = pq = None
+
+
+class ColumnarWriter:
+    """
+    Appends DataFrame batches to one output file as they are produced, so the
+    full result never has to sit in memory. `.parquet` paths get one row group
+    per batch (requires pyarrow); anything else is written as CSV.
+    """
+
+    def __init__(self, path, index_label="timestamp"):
+        self.path = path
+        self.index_label = index_label
+        self.parquet = str(path).endswith(".parquet")
+        if self.parquet and pq is None:
+            raise ImportError("pyarrow is required for .parquet output")
+        self.rows = 0
+        self._writer = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def write(self, df: pd.DataFrame):
+        if df is None or df.empty:
+            return
+        if self.parquet:
+            table = pa.Table.from_pandas(df.rename_axis(self.index_label), preserve_index=True)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode="a" if self.rows else "w", header=not self.rows, index_label=self.index_label)
+        self.rows += len(df)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PartitionedWriter:
+    """
+    Writes time-indexed batches into one file per period under `root`, in
+    hive layout (root/date=2024-01-01/features.parquet). Batches must arrive
+    in time order, so only the current partition's file is ever open.
+    """
+
+    FORMATS = {"D": "%Y-%m-%d", "M": "%Y-%m", "Y": "%Y"}
+
+    def __init__(self, root, partition="D", fmt="parquet", index_label="timestamp"):
+        self.root = root
+        self.key_format = self.FORMATS[partition]
+        self.filename = f"features.{fmt}"
+        self.index_label = index_label
+        self.rows = 0
+        self.paths = []
+        self._key = None
+        self._writer = None
+
+    def write(self, df: pd.DataFrame):
+        if df is None or df.empty:
+            return
+        keys = df.index.strftime(self.key_format)
+        for key in pd.unique(keys):
+            if key != self._key:
+                if self._key is not None and key < self._key:
+                    raise ValueError(f"Partition date={key} comes after date={self._key}; batches must be in time order")
+                self.close()
+                path = os.path.join(self.root, f"date={key}", self.filename)
+                self._key = key
+                self._writer = ColumnarWriter(path, self.index_label)
+                self.paths.append(path)
+            self._writer.write(df[keys == key])
+            self.rows += int((keys == key).sum())
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_columnar(path) -> pd.DataFrame:
+    if os.path.isdir(path):
+        # PartitionedWriter output: partitions in key order
+        parts = sorted(glob.glob(os.path.join(path, "date=*", "features.*")))
+        return pd.concat([read_columnar(p) for p in parts]) if parts else pd.DataFrame()
+    if str(path).endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, index_col=0, parse_dates=True)
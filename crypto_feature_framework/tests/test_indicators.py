@@ -0,0 +1,83 @@
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from crypto_feature_framework.core.indicators import (
+    INDICATOR_COLUMNS, StreamingFeatures, StreamingIndicators, compute_bollinger_bands, compute_features,
+    compute_indicators, compute_rsi, compute_vwap
+)
+
+
+def synthetic_trades(n, seed=0):
+    rng = np.random.default_rng(seed)
+    ts_ms = 1_700_000_000_000 + np.cumsum(rng.integers(0, 9000, n))
+    price = 100 + np.cumsum(rng.normal(0, 0.05, n))
+    qty = rng.uniform(0.001, 2.0, n)
+    return ts_ms, price, qty
+
+
+def legacy_features(df, resample_interval='1min'):
+    # compute_features as it was before the streaming kernel
+    df = df.copy()
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    df = df.set_index('timestamp').sort_index()
+    resampled = df.resample(resample_interval).agg({'price': 'last', 'quantity': 'sum'}).dropna()
+    resampled['vwap'] = df.resample(resample_interval).apply(compute_vwap)
+    resampled['sma_14'] = resampled['price'].rolling(window=14).mean()
+    resampled['ema_14'] = resampled['price'].ewm(span=14, adjust=False).mean()
+    resampled['rsi_14'] = compute_rsi(resampled['price'])
+    resampled['bb_mid'], resampled['bb_upper'], resampled['bb_lower'] = compute_bollinger_bands(resampled['price'])
+    resampled['trade_freq'] = df.resample(resample_interval).size()
+    return resampled.dropna()
+
+
+def test_compute_features_matches_pandas_rolling():
+    ts_ms, price, qty = synthetic_trades(20_000)
+    df = pd.DataFrame({"timestamp": pd.to_datetime(ts_ms, unit="ms"), "price": price, "quantity": qty})
+
+    features = compute_features(df.copy())
+    expected = legacy_features(df)
+
+    assert list(features.columns) == list(expected.columns)
+    np.testing.assert_array_equal(features.index.to_numpy().astype("datetime64[ns]"),
+                                  expected.index.to_numpy().astype("datetime64[ns]"))
+    np.testing.assert_array_equal(features["trade_freq"].to_numpy(), expected["trade_freq"].to_numpy())
+    np.testing.assert_array_equal(features["price"].to_numpy(), expected["price"].to_numpy())
+    for col in ["quantity", "vwap"] + INDICATOR_COLUMNS:
+        np.testing.assert_allclose(features[col].to_numpy(), expected[col].to_numpy(), rtol=1e-9, atol=1e-9,
+                                   err_msg=col)
+
+
+def test_streaming_indicators_match_batch_exactly():
+    prices = 100 + np.cumsum(np.random.default_rng(1).normal(0, 0.5, 3000))
+    # Small recenter period so the exact recompute runs in both paths
+    stream = StreamingIndicators(recenter_every=97)
+    rows = [stream.update(p) for p in prices]
+    batch = compute_indicators(prices, recenter_every=97)
+
+    for i, row in enumerate(rows):
+        if np.isnan(batch[i]).any():
+            assert row is None
+        else:
+            assert [row[c] for c in INDICATOR_COLUMNS] == batch[i].tolist()
+    assert rows[18] is None and rows[19] is not None  # Bollinger warm-up is the longest
+
+
+def test_streaming_features_across_trade_chunks():
+    ts_ms, price, qty = synthetic_trades(15_000, seed=2)
+    df = pd.DataFrame({"timestamp": pd.to_datetime(ts_ms, unit="ms"), "price": price, "quantity": qty})
+    batch = compute_features(df)
+
+    live = StreamingFeatures('1min')
+    ts_ns = ts_ms.astype(np.int64) * 1_000_000
+    parts = [live.update(ts_ns[i:i + 1234], price[i:i + 1234], qty[i:i + 1234]) for i in range(0, len(ts_ns), 1234)]
+    streamed = pd.concat(parts + [live.flush()])
+
+    pd.testing.assert_index_equal(streamed.index, batch.index)
+    for col in ["price", "trade_freq"] + INDICATOR_COLUMNS:
+        np.testing.assert_array_equal(streamed[col].to_numpy(), batch[col].to_numpy(), err_msg=col)
+    np.testing.assert_allclose(streamed["vwap"].to_numpy(), batch["vwap"].to_numpy(), rtol=1e-12)
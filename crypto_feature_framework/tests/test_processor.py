@@ -0,0 +1,65 @@
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from crypto_feature_framework.core.indicators import INDICATOR_COLUMNS, compute_features
+from crypto_feature_framework.core.processor import compute_features_files, expand_inputs
+from crypto_feature_framework.io.reader import read_trade_chunks
+from crypto_feature_framework.io.schema import BINANCE_TRADE_COLUMNS
+from crypto_feature_framework.io.writer import read_columnar
+
+
+def write_binance_dumps(tmp_path, n=30_000, files=4, seed=0):
+    rng = np.random.default_rng(seed)
+    ts_ms = 1_700_000_000_000 + np.cumsum(rng.integers(0, 30_000, n))
+    price = 100 + np.cumsum(rng.normal(0, 0.05, n))
+    qty = rng.uniform(0.001, 2.0, n)
+    raw = pd.DataFrame({"trade_id": np.arange(n), "price": price, "quantity": qty, "quote_quantity": price * qty,
+                        "timestamp": ts_ms, "buyer_is_maker": True, "best_match": True})[BINANCE_TRADE_COLUMNS]
+
+    # Split mid-bucket, so bars and indicator windows straddle file boundaries
+    paths = []
+    for i, rows in enumerate(np.array_split(np.arange(n), files)):
+        part = raw.iloc[rows]
+        path = tmp_path / f"BTCUSDT-trades-2023-11-{15 + i:02d}.csv"
+        part.to_csv(path, header=False, index=False)
+        paths.append(str(path))
+    return paths
+
+
+def one_big_file(paths):
+    # The same trades as parsed back from the CSVs, in a single frame
+    chunks = [chunk for path in paths for chunk in read_trade_chunks(path)]
+    return pd.DataFrame({"timestamp": pd.to_datetime(np.concatenate([c[0] for c in chunks])),
+                         "price": np.concatenate([c[1] for c in chunks]),
+                         "quantity": np.concatenate([c[2] for c in chunks])})
+
+
+def test_expand_inputs_date_range_and_globs(tmp_path):
+    paths = write_binance_dumps(tmp_path, n=100)
+    pattern = str(tmp_path / "BTCUSDT-trades-{date}.csv")
+
+    assert expand_inputs([pattern], "2023-11-16", "2023-11-30") == paths[1:]
+    assert expand_inputs([str(tmp_path / "*.csv"), paths[0]]) == paths
+
+
+def test_multi_file_features_match_one_big_file(tmp_path):
+    paths = write_binance_dumps(tmp_path)
+    trades = one_big_file(paths)
+    expected = compute_features(trades)
+
+    out = str(tmp_path / "features")
+    stats = compute_features_files(paths, out, chunksize=997, workers=2, partition="D")
+    got = read_columnar(out)
+
+    assert stats["trades"] == len(trades) and stats["rows"] == len(expected)
+    assert len(os.listdir(out)) == len({ts.date() for ts in expected.index})
+    np.testing.assert_array_equal(got.index.to_numpy(), expected.index.to_numpy())
+    for col in ["price", "trade_freq"] + INDICATOR_COLUMNS:
+        np.testing.assert_array_equal(got[col].to_numpy(), expected[col].to_numpy(), err_msg=col)
+    for col in ("quantity", "vwap"):
+        np.testing.assert_allclose(got[col].to_numpy(), expected[col].to_numpy(), rtol=1e-12)
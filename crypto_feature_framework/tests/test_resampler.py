@@ -0,0 +1,74 @@
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from crypto_feature_framework.core.resampler import StreamingResampler, resample_files
+from crypto_feature_framework.io.schema import BINANCE_TRADE_COLUMNS
+from crypto_feature_framework.io.writer import read_columnar
+
+
+def synthetic_trades(n, seed=0):
+    rng = np.random.default_rng(seed)
+    ts_ms = 1_700_000_000_000 + np.cumsum(rng.integers(0, 4000, n))
+    price = 100 + np.cumsum(rng.normal(0, 0.01, n))
+    qty = rng.uniform(0.001, 2.0, n)
+    return ts_ms, price, qty
+
+
+def pandas_bars(ts_ms, price, qty, interval="1min"):
+    df = pd.DataFrame({"price": price, "quantity": qty, "pv": price * qty},
+                      index=pd.to_datetime(ts_ms, unit="ms"))
+    g = df.resample(interval)
+    bars = g["price"].ohlc()
+    bars["mean"] = g["price"].mean()
+    bars["vwap"] = g["pv"].sum() / g["quantity"].sum()
+    bars["volume"] = g["quantity"].sum()
+    bars["count"] = g["price"].count()
+    return bars[bars["count"] > 0]
+
+
+def test_chunk_boundaries_match_single_pass_resample():
+    ts_ms, price, qty = synthetic_trades(20000)
+    expected = pandas_bars(ts_ms, price, qty)
+
+    resampler = StreamingResampler("1min")
+    parts = []
+    for start in range(0, len(ts_ms), 37):  # Chunks far smaller than a bucket
+        sl = slice(start, start + 37)
+        parts.append(resampler.update(ts_ms[sl] * 1_000_000, price[sl], qty[sl]))
+    parts.append(resampler.flush())
+    bars = pd.concat(parts)
+
+    assert not bars.index.duplicated().any()
+    assert (bars.index == expected.index).all()
+    np.testing.assert_array_equal(bars["count"].to_numpy(), expected["count"].to_numpy())
+    for col in ("open", "high", "low", "close"):
+        np.testing.assert_array_equal(bars[col].to_numpy(), expected[col].to_numpy())
+    for col in ("mean", "vwap", "volume"):
+        np.testing.assert_allclose(bars[col].to_numpy(), expected[col].to_numpy(), rtol=1e-12)
+
+
+def test_resample_files_in_process_pool(tmp_path):
+    jobs = {}
+    expected = {}
+    for i, name in enumerate(("BTCUSDT", "ETHUSDT", "ETHBTC")):
+        ts_ms, price, qty = synthetic_trades(5000, seed=i)
+        raw = pd.DataFrame({"trade_id": np.arange(len(ts_ms)), "price": price, "quantity": qty,
+                            "quote_quantity": price * qty, "timestamp": ts_ms, "buyer_is_maker": True,
+                            "best_match": True})[BINANCE_TRADE_COLUMNS]
+        src = tmp_path / f"{name}.csv"
+        raw.to_csv(src, header=False, index=False)  # Binance dumps have no header row
+        jobs[str(src)] = str(tmp_path / "bars" / f"{name}.parquet")
+        expected[name] = pandas_bars(ts_ms, price, qty)
+
+    results = resample_files(jobs, chunksize=700, workers=2)
+    for (src, dst), (out, trades, bars, _) in zip(jobs.items(), results):
+        name = os.path.basename(src)[:-4]
+        got = read_columnar(dst)
+        assert out == dst and trades == 5000 and bars == len(expected[name])
+        np.testing.assert_allclose(got["close"].to_numpy(), expected[name]["close"].to_numpy(), rtol=1e-14)
+        np.testing.assert_allclose(got["vwap"].to_numpy(), expected[name]["vwap"].to_numpy(), rtol=1e-12)
@@ -1,37 +1,34 @@
 
-import pandas as pd
+import os
+import sys
 
-def process_chunk(chunk, label):
-    chunk.columns = [
-    "trade_id", "price", "quantity", "quote_quantity",
-    "timestamp", "buyer_is_maker", "best_match"
-]
-    chunk["timestamp"] = pd.to_datetime(chunk["timestamp"], unit="ms", errors='coerce')
-    chunk = chunk.dropna(subset=["timestamp"])
-    return chunk.set_index("timestamp").resample("1min").agg({"price": "mean"}).rename(columns={"price": label})
+import pandas as pd
 
-def load_large_file_in_chunks(path, label, chunksize=1_000_000):
-    all_chunks = []
-    for chunk in pd.read_csv(path, chunksize=chunksize):
-        resampled = process_chunk(chunk, label)
-        all_chunks.append(resampled)
-    return pd.concat(all_chunks).sort_index()
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-def compute_features_large(btc_path, ethusd_path, ethbtc_path, output_path):
-    print("🔄 Processing BTCUSD...")
-    btc_df = load_large_file_in_chunks(btc_path, "btc_usd")
+from filters.kalman_spread_estimator import kalman_filter_batch
+from crypto_feature_framework.core.resampler import resample_files
+from crypto_feature_framework.io.writer import read_columnar
 
-    print("🔄 Processing ETHUSD...")
-    ethusd_df = load_large_file_in_chunks(ethusd_path, "eth_usd")
 
-    print("🔄 Processing ETHBTC...")
-    ethbtc_df = load_large_file_in_chunks(ethbtc_path, "eth_btc")
+def compute_features_large(btc_path, ethusd_path, ethbtc_path, output_path, interval="1min",
+                           chunksize=1_000_000, bars_dir="ml_model/bars", price_column="mean"):
+    # Each pair file streams through its own process into 1-minute bars on disk
+    legs = {"btc_usd": btc_path, "eth_usd": ethusd_path, "eth_btc": ethbtc_path}
+    jobs = {path: os.path.join(bars_dir, f"{label}.parquet") for label, path in legs.items()}
+    print("🔄 Resampling BTCUSD, ETHUSD and ETHBTC trades...")
+    for out, trades, bars, rss in resample_files(jobs, interval=interval, chunksize=chunksize):
+        print(f"   {out}: {trades:,} trades -> {bars:,} bars | peak RSS {rss:,.0f} MB")
 
     # Merge and compute features
+    btc_df, ethusd_df, ethbtc_df = (read_columnar(jobs[path])[[price_column]].rename(columns={price_column: label})
+                                    for label, path in legs.items())
     df = btc_df.join(ethusd_df).join(ethbtc_df).dropna()
     df["implied_ethbtc"] = df["eth_usd"] / df["btc_usd"]
     df["spread"] = df["eth_btc"] - df["implied_ethbtc"]
-    df["z_score"] = (df["spread"] - df["spread"].rolling(30).mean()) / df["spread"].rolling(30).std()
+    # Same recursive Kalman z-score the live FeatureEngineer produces
+    df["z_score"] = kalman_filter_batch(df["implied_ethbtc"].to_numpy(), df["eth_btc"].to_numpy())["zscore"]
 
     df.dropna().reset_index().to_csv(output_path, index=False)
     print(f"✅ Feature file saved to {output_path}")
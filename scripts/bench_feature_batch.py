@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+"""
+bench_feature_batch.py
+
+Compares rows/sec of tick-by-tick FeatureEngineer replay against the batch
+compute_batch() path on synthetic interleaved BTC/ETH/ETHBTC trades, and times
+kalman_filter_batch over a year of 1-minute bars for several triangles.
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from feature_engineering.feature_engineer import FeatureEngineer
+from filters.kalman_spread_estimator import kalman_filter_batch
+from messaging.market_event import MarketEventBatch
+
+logging.getLogger("feature_engineer").setLevel(logging.WARNING)
+
+
+def synthetic_batch(n, seed=7):
+    rng = np.random.default_rng(seed)
+    pair = rng.choice(np.array(["btcusdt", "ethusdt", "ethbtc"]), size=n)
+    btc = 30000 * np.exp(np.cumsum(rng.normal(0, 1e-4, n)))
+    eth = 1800 * np.exp(np.cumsum(rng.normal(0, 1e-4, n)))
+    price = np.where(pair == "btcusdt", btc, np.where(pair == "ethusdt", eth, eth / btc + rng.normal(0, 1e-6, n)))
+    timestamp = 1_700_000_000_000_000_000 + np.arange(n, dtype=np.int64) * 1_000_000
+    return MarketEventBatch(timestamp, pair, price, np.ones(n))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FeatureEngineer streaming vs batch benchmark")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--stream-rows", type=int, default=100_000, help="Rows replayed tick-by-tick")
+    parser.add_argument("--triangles", type=int, default=8, help="Triangles for the 1-minute-bar Kalman run")
+    args = parser.parse_args()
+
+    batch = synthetic_batch(args.rows)
+    FeatureEngineer().compute_batch_from_trades(batch.select(np.arange(1000)))  # JIT warm-up
+
+    sample = batch.select(np.arange(min(args.stream_rows, args.rows)))
+    start = time.perf_counter()
+    FeatureEngineer().update_batch(sample)
+    stream_rate = len(sample) / (time.perf_counter() - start)
+    print(f"[BENCH] streaming update : {stream_rate:,.0f} rows/s")
+
+    start = time.perf_counter()
+    FeatureEngineer().compute_batch_from_trades(batch)
+    elapsed = time.perf_counter() - start
+    rate = len(batch) / elapsed
+    print(f"[BENCH] compute_batch    : {rate:,.0f} rows/s ({elapsed:.2f}s for {len(batch):,} rows, "
+          f"{rate / stream_rate:.0f}x)")
+
+    bars = 365 * 24 * 60
+    rng = np.random.default_rng(1)
+    x = 0.05 * np.exp(np.cumsum(rng.normal(0, 1e-4, (bars, args.triangles)), axis=0))
+    y = x * (1 + rng.normal(0, 1e-4, x.shape))
+    start = time.perf_counter()
+    kalman_filter_batch(x, y)
+    elapsed = time.perf_counter() - start
+    print(f"[BENCH] kalman_filter_batch: {args.triangles} triangles x {bars:,} 1m bars in {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
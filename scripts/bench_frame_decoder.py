@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+"""
+bench_frame_decoder.py
+
+Compares messages/sec of the legacy decode path (json.loads + DataNormalizer)
+against FrameDecoder on recorded frames. Pass a file with one raw frame per
+line, or run without arguments to use synthetic Binance trade/depth frames.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from data_pipeline.data_normalizer import DataNormalizer
+from data_pipeline.frame_decoder import FrameDecoder
+
+
+def synthetic_frames(n=200000, depth_ratio=0.3, seed=7):
+    rng = random.Random(seed)
+    frames = []
+    for i in range(n):
+        symbol = rng.choice(("BTCUSDT", "ETHUSDT", "ETHBTC"))
+        if rng.random() < depth_ratio:
+            msg = {
+                "e": "depthUpdate", "E": 1700000000000 + i, "s": symbol, "U": 2 * i + 1, "u": 2 * i + 2,
+                "b": [[f"{rng.uniform(100, 101):.2f}", f"{rng.uniform(0, 3):.4f}"] for _ in range(3)],
+                "a": [[f"{rng.uniform(101, 102):.2f}", f"{rng.uniform(0, 3):.4f}"] for _ in range(3)]
+            }
+        else:
+            msg = {
+                "e": "trade", "E": 1700000000000 + i, "s": symbol, "t": i,
+                "p": f"{rng.uniform(100, 102):.2f}", "q": f"{rng.uniform(0, 3):.5f}",
+                "T": 1700000000000 + i, "m": rng.random() < 0.5, "M": True
+            }
+        frames.append(json.dumps(msg, separators=(",", ":")))
+    return frames
+
+
+def legacy_decode(frames):
+    for raw in frames:
+        msg = json.loads(raw)
+        if "data" in msg:
+            msg = msg["data"]
+        if msg.get("e") == "trade":
+            DataNormalizer.normalize_binance_trade(msg)
+        elif msg.get("e") == "depthUpdate":
+            DataNormalizer.normalize_binance_orderbook(msg)
+
+
+def fast_decode(frames):
+    decode = FrameDecoder().decode
+    for raw in frames:
+        decode(raw)
+
+
+def timed(fn, frames):
+    start = time.perf_counter()
+    fn(frames)
+    return len(frames) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame decoding microbenchmark")
+    parser.add_argument("--frames", help="File with one raw websocket frame per line")
+    args = parser.parse_args()
+
+    if args.frames:
+        with open(args.frames) as f:
+            frames = [line.rstrip("\n") for line in f if line.strip()]
+    else:
+        frames = synthetic_frames()
+
+    baseline = timed(legacy_decode, frames)
+    print(f"[BENCH] legacy json+normalize : {baseline:,.0f} msg/s")
+    rate = timed(fast_decode, frames)
+    print(f"[BENCH] {'fast decode':<22}: {rate:,.0f} msg/s ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+"""
+bench_ml_filter.py
+
+Per-prediction latency of the tree-ensemble classifier behind MLFilter: sklearn
+predict_proba on a one-row DataFrame (the old per-tick path) against the
+compiled node-array traversal, for single rows and small batches. Uses the
+saved model when it loads, otherwise a RandomForest shaped like
+train_ml_filter_combined's trained on synthetic features.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from filters.tree_ensemble import CompiledForest, fidelity_error
+
+FEATURES = ["btc_usd", "eth_usd", "eth_btc", "implied_ethbtc", "spread", "z_score"]
+
+
+def synthetic_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    btc = 30000 + rng.normal(0, 500, n)
+    eth = 2000 + rng.normal(0, 40, n)
+    implied = eth / btc
+    eth_btc = implied + rng.normal(0, 2e-4, n)
+    spread = eth_btc - implied
+    return np.column_stack([btc, eth, eth_btc, implied, spread, spread / 2e-4])
+
+
+def load_or_train(path, trees):
+    try:
+        model = joblib.load(path)
+        print(f"[BENCH] model {path}")
+        return model
+    except Exception:
+        X = synthetic_rows(20_000)
+        y = np.where(X[:, 4] > 1e-4, -1, np.where(X[:, 4] < -1e-4, 1, 0))
+        print(f"[BENCH] synthetic RandomForest, {trees} trees, max_depth=7")
+        return RandomForestClassifier(n_estimators=trees, max_depth=7, random_state=42).fit(
+            pd.DataFrame(X, columns=FEATURES), y)
+
+
+def per_call_us(fn, args, repeat):
+    fn(args[0])  # Warm-up (JIT compile for the compiled path)
+    start = time.perf_counter()
+    for i in range(repeat):
+        fn(args[i % len(args)])
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MLFilter inference latency benchmark")
+    parser.add_argument("--model", default="ml_model/triangular_rf_model.pkl")
+    parser.add_argument("--trees", type=int, default=100, help="Trees in the synthetic fallback model")
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=32)
+    args = parser.parse_args()
+
+    model = load_or_train(args.model, args.trees)
+    compiled = CompiledForest.from_model(model)
+    rows = synthetic_rows(4096, seed=1)
+    error = fidelity_error(model, compiled, np.vstack([rows, compiled.probe_rows()]), FEATURES)
+    print(f"[BENCH] {len(compiled.roots)} trees, {len(compiled.feature):,} nodes | max |predict_proba diff| {error:.3g}")
+
+    frames = [pd.DataFrame(rows[i:i + 1], columns=FEATURES) for i in range(256)]
+    sklearn_row = per_call_us(model.predict_proba, frames, args.repeat)
+    compiled_row = per_call_us(compiled.predict_proba, list(rows[:256]), args.repeat * 10)
+    print(f"[BENCH] single row: predict_proba {sklearn_row:,.1f} µs | compiled {compiled_row:,.2f} µs "
+          f"| x{sklearn_row / compiled_row:,.0f}")
+
+    batches = [rows[i:i + args.batch] for i in range(0, 4096 - args.batch, args.batch)]
+    frames = [pd.DataFrame(b, columns=FEATURES) for b in batches]
+    sklearn_batch = per_call_us(model.predict_proba, frames, max(args.repeat // 4, 1)) / args.batch
+    compiled_batch = per_call_us(compiled.predict_proba, batches, args.repeat) / args.batch
+    print(f"[BENCH] batch of {args.batch}, per row: predict_proba {sklearn_batch:,.1f} µs | "
+          f"compiled {compiled_batch:,.2f} µs | x{sklearn_batch / compiled_batch:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
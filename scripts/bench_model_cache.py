@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+"""
+bench_model_cache.py
+
+Startup time and memory of several components (live controller, signal
+generators, signal engine) and forked workers each building an MLFilter on the
+same artifact: every one unpickling and compiling its own copy (the old
+behaviour) against the shared model cache, where the artifact is loaded once
+per process and the compiled node arrays are memory-mapped. Memory is total
+PSS (proportional set size: shared pages split between the processes sharing
+them) over the parent and its workers. Uses the saved model when it loads,
+otherwise a synthetic RandomForest.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import argparse
+import multiprocessing
+
+import joblib
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from bench_ml_filter import FEATURES, load_or_train, synthetic_rows
+from filters import model_cache
+from filters.ml_filter import MLFilter
+
+
+def pss_mb() -> float:
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def build(path, n, shared):
+    filters = []
+    for _ in range(n):
+        if not shared:
+            model_cache.clear()
+        filters.append(MLFilter(model_path=path, anomaly_path=""))
+    return filters
+
+
+def worker(args):
+    path, shared, rows = args
+    baseline = pss_mb()
+    filters = build(path, 1, shared)
+    filters[0].predict_proba(rows)  # Touch every tree
+    return pss_mb() - baseline
+
+
+def scenario(path, components, workers, shared, rows):
+    model_cache.clear()
+    if not shared:
+        model_cache.CACHE_DIR = tempfile.mkdtemp()  # Fresh, so each process compiles its own copy
+    baseline = pss_mb()
+    started = time.perf_counter()
+    filters = build(path, components, shared)
+    startup = time.perf_counter() - started
+    filters[0].predict_proba(rows)
+    parent = pss_mb() - baseline
+
+    with multiprocessing.get_context("fork").Pool(workers) as pool:
+        # Each forked worker builds its own MLFilter, as a strategy process would
+        started = time.perf_counter()
+        extra = pool.map(worker, [(path, shared, rows)] * workers)
+        worker_startup = time.perf_counter() - started
+    model_cache.CACHE_DIR = None
+    return startup, worker_startup, parent + sum(extra)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared model cache startup / memory benchmark")
+    parser.add_argument("--model", default="ml_model/triangular_rf_model.pkl")
+    parser.add_argument("--trees", type=int, default=300, help="Trees in the synthetic fallback model")
+    parser.add_argument("--components", type=int, default=4, help="MLFilters built in the parent process")
+    parser.add_argument("--workers", type=int, default=2, help="Forked worker processes")
+    args = parser.parse_args()
+
+    path = args.model
+    try:
+        joblib.load(path)
+    except Exception:
+        path = os.path.join(tempfile.mkdtemp(), "model.pkl")
+        joblib.dump(load_or_train(None, args.trees), path)
+    rows = synthetic_rows(256)
+
+    for label, shared in (("per-component load", False), ("shared cache (cold)", True),
+                          ("shared cache (warm)", True)):
+        startup, worker_startup, memory = scenario(path, args.components, args.workers, shared, rows)
+        print(f"[BENCH] {label:20s} | {args.components} components {startup * 1e3:8.1f} ms | "
+              f"{args.workers} workers {worker_startup * 1e3:8.1f} ms | PSS +{memory:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
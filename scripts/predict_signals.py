@@ -1,11 +1,15 @@
 # /ml_model/generate_signal_predictions.py
 
+import os
+import sys
 import pandas as pd
 import joblib
 import numpy as np
-from collections import deque
 from xgboost import XGBClassifier
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+from utils.ring_buffer import RingBuffer
+
 # -------------------------------
 # Load ML Models
 # -------------------------------
@@ -18,7 +22,7 @@ anomaly_model, scaler = anomaly_data["model"], anomaly_data["scaler"]
 # -------------------------------
 class KalmanMonitor:
     def __init__(self, window=100):
-        self.residuals = deque(maxlen=window)
+        self.residuals = RingBuffer(window)
 
     def update(self, eth, btc, ethbtc):
         implied = btc * ethbtc
@@ -26,7 +30,7 @@ class KalmanMonitor:
         self.residuals.append(residual)
 
     def get_score(self):
-        return max(0.0, 1.0 - np.std(self.residuals)) if len(self.residuals) >= 10 else 1.0
+        return max(0.0, 1.0 - self.residuals.std()) if len(self.residuals) >= 10 else 1.0
 
 # -------------------------------
 # Load Features
@@ -1,3 +1,5 @@
+import os
+import sys
 import argparse
 import yaml
 import pandas as pd
@@ -6,9 +8,13 @@ import joblib
 from sklearn.model_selection import TimeSeriesSplit
 from sklearn.metrics import classification_report
 from xgboost import XGBClassifier
-from scipy.stats import zscore
 from binance_downloader import download_binance_klines
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from filters.kalman_spread_estimator import kalman_filter_batch
+from feature_engineering.triple_barrier import label_spread
+
 # --- Load Config ---
 def load_config(config_path):
     with open(config_path, "r") as f:
@@ -21,7 +27,12 @@ def compute_features(df_btc, df_eth, df_ethbtc, cfg):
 
     df['implied_ethbtc'] = df['eth_price'] / df['btc_price']
     df['spread'] = df['implied_ethbtc'] - df['ethbtc_price']
-    df['zscore'] = zscore(df['spread'].ffill().dropna(), nan_policy='omit')
+
+    # Same recursive Kalman z-score the live FeatureEngineer produces (no look-ahead)
+    valid = df[['implied_ethbtc', 'ethbtc_price']].notna().all(axis=1).to_numpy()
+    kf = kalman_filter_batch(df['implied_ethbtc'].to_numpy()[valid], df['ethbtc_price'].to_numpy()[valid])
+    df['zscore'] = np.nan
+    df.loc[valid, 'zscore'] = kf['zscore']
 
     for win in cfg['feature_params']['momentum_windows']:
         df[f'mom_btc_{win}'] = df['btc_price'].pct_change(win)
@@ -32,27 +43,12 @@ def compute_features(df_btc, df_eth, df_ethbtc, cfg):
     return df.dropna()
 
 # --- Triple-Barrier Labeling ---
-def label_triple_barrier(df, horizon, vol_mult):
-    labels = np.zeros(len(df))
-    rolling_std = df['spread'].rolling(horizon).std()
-
-    for i in range(len(df) - horizon):
-        current_spread = df['spread'].iloc[i]
-        thresh = vol_mult * rolling_std.iloc[i]
-        future = df['spread'].iloc[i+1:i+horizon+1]
-
-        tp = current_spread + thresh
-        sl = current_spread - thresh
-
-        if (future >= tp).any():
-            labels[i] = 1
-        elif (future <= sl).any():
-            labels[i] = -1
-        else:
-            labels[i] = 0
-
-    df = df.iloc[:len(labels)].copy()
-    df['label'] = labels
+def label_triple_barrier(df, horizon, vol_mult, n_jobs=1):
+    # Compiled labeler; same labels as the original per-row pandas loop
+    labels, _ = label_spread(df['spread'], horizon, vol_mult, n_jobs=n_jobs)
+
+    df = df.copy()
+    df['label'] = labels.astype(float)
     return df.dropna()
 
 # --- Model Training (Last Fold Only) ---
@@ -5,8 +5,13 @@ import logging
 import time
 
 from data_pipeline.data_normalizer import DataNormalizer
+from data_pipeline.order_book import OrderBookManager, BinanceSnapshotSource
+from data_pipeline.frame_decoder import FrameDecoder, TRADE, DEPTH
+from data_pipeline.ingest_queue import IngestQueue, CONFLATE
+from data_pipeline.frame_journal import JournalingSnapshotSource
 from feature_engineering.feature_engineer import FeatureEngineer
 from messaging.market_event import MarketEvent
+from metrics import latency
 
 logger = logging.getLogger("binance_ingestor")
 logging.basicConfig(level=logging.INFO)
@@ -14,8 +19,8 @@ logging.basicConfig(level=logging.INFO)
 PAIRS = ["btcusdt", "ethusdt", "ethbtc"]
 WS_URL = "wss://stream.binance.com:9443/ws"
 
-def build_subscription():
-    streams = [f"{pair}@depth5@100ms" for pair in PAIRS] + [f"{pair}@trade" for pair in PAIRS]
+def build_subscription(pairs=PAIRS):
+    streams = [f"{pair}@depth@100ms" for pair in pairs] + [f"{pair}@trade" for pair in pairs]
     return {
         "method": "SUBSCRIBE",
         "params": streams,
@@ -23,11 +28,25 @@ def build_subscription():
     }
 
 class BinanceIngestor:
-    def __init__(self, process_event_func):
+    def __init__(self, process_event_func, snapshot_source=None, fast_decode=True,
+                 queue_size=10000, overflow_policy=CONFLATE, journal=None, pairs=None):
         self.process_event_func = process_event_func
+        # Symbols to subscribe, e.g. TriangleUniverse.symbols; defaults to the single ETH/BTC triangle
+        self.pairs = list(pairs) if pairs else PAIRS
         self.feature_engineer = FeatureEngineer()  # Uses internal buffers only
+        # Optional FrameJournal: every raw frame and snapshot is recorded for replay
+        self.journal = journal
+        snapshot_source = snapshot_source or BinanceSnapshotSource()
+        if journal is not None:
+            snapshot_source = JournalingSnapshotSource(snapshot_source, journal)
+        self.book_manager = OrderBookManager(snapshot_source, self.pairs)
+        self.decoder = FrameDecoder() if fast_decode else None
+        # queue_size=0 processes events inline on the socket reader (legacy behaviour)
+        self.queue = IngestQueue(queue_size, overflow_policy) if queue_size else None
+        self._consumer = None
 
     async def process_event(self, event):
+        latency.observe_since_wall(latency.INGEST_QUEUE, event.recv_ns)
         try:
             # Run external pipeline logic (e.g., from live_controller)
             await self.process_event_func(event)
@@ -39,19 +58,51 @@ class BinanceIngestor:
         except Exception as e:
             logger.exception(f"[BINANCE] Error in event processing: {e}")
 
+    async def dispatch(self, event, key=None):
+        """
+        Hand an event to processing: via the bounded queue, or inline if disabled.
+        """
+        if self.queue is None:
+            await self.process_event(event)
+        else:
+            await self.queue.put(event, key)
+
+    async def consume(self):
+        """
+        Processing side of the ingest queue; runs independently of the socket reader.
+        """
+        while True:
+            for event in await self.queue.get_batch():
+                await self.process_event(event)
+
+    async def handle_trade(self, event, recv_ns=None):
+        if recv_ns is not None:
+            event.recv_ns = recv_ns
+            latency.observe_between(latency.EXCHANGE_TO_RECEIVE, event.timestamp, recv_ns)
+        await self.dispatch(event)
+        logger.info(f"[TRADE] {event.pair} | Price: {event.price} | Qty: {event.quantity}")
+
+    async def handle_depth(self, message: dict, recv_ns=None):
+        book = await self.book_manager.on_depth_update(message)
+        if book is None:
+            logger.debug(f"[ORDERBOOK] {message.get('s')} resyncing — event skipped")
+            return
+
+        # Book diffs are applied above in order; only the resulting snapshot events conflate
+        event = DataNormalizer.normalize_binance_orderbook(message, book=book)
+        if recv_ns is not None:
+            event.recv_ns = recv_ns
+            latency.observe_between(latency.EXCHANGE_TO_RECEIVE, event.timestamp, recv_ns)
+        await self.dispatch(event, key=(event.pair, event.event_type))
+        logger.info(f"[ORDERBOOK] {event.pair} | Bid: {book.best_bid()} | Ask: {book.best_ask()}")
+
     async def handle_message(self, message: dict):
         try:
             if message.get("e") == "trade":
-                event = DataNormalizer.normalize_binance_trade(message)
-                event.event_type = "trade"
-                await self.process_event(event)
-                logger.info(f"[TRADE] {event.pair} | Price: {event.price} | Qty: {event.quantity}")
+                await self.handle_trade(DataNormalizer.normalize_binance_trade(message))
 
             elif message.get("e") == "depthUpdate":
-                event = DataNormalizer.normalize_binance_orderbook(message)
-                event.event_type = "orderbook"
-                await self.process_event(event)
-                logger.info(f"[ORDERBOOK] {event.pair} | Bids: {event.bids[0]} | Asks: {event.asks[0]}")
+                await self.handle_depth(message)
 
             else:
                 logger.debug(f"[BINANCE] Unknown event: {message}")
@@ -59,16 +110,43 @@ class BinanceIngestor:
         except Exception as e:
             logger.exception(f"[BINANCE] Message handling failed: {e}")
 
+    async def handle_frame(self, raw, recv_ns=None):
+        """
+        Fast path: decode a raw frame without building the full message dict.
+        """
+        try:
+            t = latency.start()
+            kind, payload = self.decoder.decode(raw)
+            latency.observe(latency.NORMALIZE, t)
+
+            if kind == TRADE:
+                await self.handle_trade(payload, recv_ns)
+            elif kind == DEPTH:
+                await self.handle_depth(payload, recv_ns)
+        except Exception as e:
+            logger.exception(f"[BINANCE] Frame handling failed: {e}")
+
     async def connect_and_listen(self):
+        if self.queue is not None and self._consumer is None:
+            self._consumer = asyncio.create_task(self.consume())
+
         while True:
             try:
                 async with websockets.connect(WS_URL, ping_interval=20, ping_timeout=10) as websocket:
                     logger.info("[BINANCE] Connected to stream")
-                    await websocket.send(json.dumps(build_subscription()))
+                    await websocket.send(json.dumps(build_subscription(self.pairs)))
                     logger.info("[BINANCE] Subscribed to pairs")
 
                     while True:
                         raw = await websocket.recv()
+                        recv_ns = time.time_ns()
+                        if self.journal is not None:
+                            self.journal.append(raw, recv_ns)
+
+                        if self.decoder:
+                            await self.handle_frame(raw, recv_ns)
+                            continue
+
                         msg = json.loads(raw)
 
                         if "e" in msg:
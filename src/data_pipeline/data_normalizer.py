@@ -1,53 +1,26 @@
 # /src/data_pipeline/data_normalizer.py
 
 import logging
-from datetime import datetime
+
+from messaging.market_event import MarketEvent
 
 # Configure logger
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("data_normalizer")
 
 
-class NormalizedEvent:
-    """
-    Represents a normalized market event, such as a trade or order book snapshot,
-    ready for feature engineering or database insertion.
-    """
-
-    def __init__(self, timestamp, exchange, event_type, pair, price, quantity,
-                 side=None, bids=None, asks=None):
-        self.timestamp = timestamp
-        self.exchange = exchange
-        self.event_type = event_type  # 'trade' or 'orderbook'
-        self.pair = pair
-        self.price = price
-        self.quantity = quantity
-        self.side = side
-        self.bids = bids
-        self.asks = asks
-
-    def to_dict(self):
-        return {
-            "timestamp": self.timestamp,
-            "exchange": self.exchange,
-            "event_type": self.event_type,
-            "pair": self.pair,
-            "price": self.price,
-            "quantity": self.quantity,
-            "side": self.side,
-            "bids": self.bids,
-            "asks": self.asks
-        }
+# Kept for existing imports; all events now share the compact MarketEvent type
+NormalizedEvent = MarketEvent
 
 
 class DataNormalizer:
     """
     Static utility class to normalize raw Binance WebSocket messages into
-    XAlgo's internal event schema.
+    XAlgo's internal event schema (MarketEvent, epoch-nanosecond timestamps).
     """
 
     @staticmethod
-    def normalize_binance_trade(msg: dict) -> NormalizedEvent:
+    def normalize_binance_trade(msg: dict) -> MarketEvent:
         """
         Normalize Binance trade event payload.
 
@@ -58,8 +31,8 @@ class DataNormalizer:
           'T': 123456785, 'm': True, 'M': True
         }
         """
-        return NormalizedEvent(
-            timestamp=datetime.utcfromtimestamp(msg['T'] / 1000),
+        return MarketEvent(
+            timestamp=msg['T'] * 1_000_000,
             exchange="binance",
             event_type="trade",
             pair=msg['s'].lower(),
@@ -69,25 +42,38 @@ class DataNormalizer:
         )
 
     @staticmethod
-    def normalize_binance_orderbook(msg: dict) -> NormalizedEvent:
+    def normalize_binance_orderbook(msg: dict, book=None, levels: int = 5) -> MarketEvent:
         """
         Normalize Binance depthUpdate (L2 orderbook) event payload.
 
+        When a synced local OrderBook is given, bids/asks hold its top `levels`
+        as [price, qty] floats and the event keeps a reference to the book, so
+        consumers read prices from memory instead of the raw diff strings.
+
         Example input:
         {
           'e': 'depthUpdate', 'E': 123456789, 's': 'BTCUSDT',
           'U': 157, 'u': 160, 'b': [['0.0024', '10']], 'a': [['0.0026', '100']]
         }
         """
-        return NormalizedEvent(
-            timestamp=datetime.utcfromtimestamp(msg['E'] / 1000),
+        if book is not None:
+            (bid_px, bid_qty), (ask_px, ask_qty) = book.depth(levels)
+            bids = [[p, q] for p, q in zip(bid_px.tolist(), bid_qty.tolist())]
+            asks = [[p, q] for p, q in zip(ask_px.tolist(), ask_qty.tolist())]
+        else:
+            bids = msg.get('b', [])
+            asks = msg.get('a', [])
+
+        return MarketEvent(
+            timestamp=msg['E'] * 1_000_000,
             exchange="binance",
             event_type="orderbook",
             pair=msg['s'].lower(),
             price=None,
             quantity=None,
-            bids=msg.get('b', []),
-            asks=msg.get('a', [])
+            bids=bids,
+            asks=asks,
+            book=book
         )
 
 
@@ -0,0 +1,104 @@
+# /src/data_pipeline/frame_decoder.py
+
+import json
+import logging
+
+from messaging.market_event import MarketEvent
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; stdlib json is the fallback
+    _loads = json.loads
+
+# Configure logger
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("frame_decoder")
+
+TRADE = "trade"
+DEPTH = "depthUpdate"
+
+_TRADE_TAG = '"e":"trade"'
+_DEPTH_TAG = '"e":"depthUpdate"'
+
+
+def _str_field(raw: str, key: str) -> str:
+    """
+    Returns the string value of `key` (given as '"p":"') without parsing the frame.
+    """
+    i = raw.index(key) + len(key)
+    return raw[i:raw.index('"', i)]
+
+
+def _int_field(raw: str, key: str) -> int:
+    i = raw.index(key) + len(key)
+    j = i
+    while raw[j] not in ",}":
+        j += 1
+    return int(raw[i:j])
+
+
+def _bool_field(raw: str, key: str) -> bool:
+    return raw[raw.index(key) + len(key)] == "t"
+
+
+class FrameDecoder:
+    """
+    Decodes raw Binance websocket frames with as little work as possible.
+
+    Trade frames are scanned field-by-field straight into a MarketEvent,
+    skipping the intermediate dict. Depth frames still need their level lists,
+    so they are parsed with orjson (when installed) and returned as dicts for
+    the order book manager.
+    """
+
+    def __init__(self):
+        self.fallbacks = 0
+
+    def decode(self, raw):
+        """
+        Returns (kind, payload): (TRADE, MarketEvent), (DEPTH, dict) or (None, None).
+        """
+        if isinstance(raw, (bytes, bytearray)):
+            raw = raw.decode()
+
+        if _TRADE_TAG in raw:
+            try:
+                return TRADE, self._decode_trade(raw)
+            except (ValueError, IndexError):
+                self.fallbacks += 1  # Unexpected layout, use the full parser
+
+        msg = _loads(raw)
+        if "data" in msg:
+            msg = msg["data"]
+
+        kind = msg.get("e")
+        if kind == TRADE:
+            return TRADE, self._trade_from_dict(msg)
+        if kind == DEPTH:
+            return DEPTH, msg
+        return None, None
+
+    @staticmethod
+    def _decode_trade(raw: str) -> MarketEvent:
+        return MarketEvent(
+            timestamp=_int_field(raw, '"T":') * 1_000_000,
+            exchange="binance",
+            event_type=TRADE,
+            pair=_str_field(raw, '"s":"').lower(),
+            price=float(_str_field(raw, '"p":"')),
+            quantity=float(_str_field(raw, '"q":"')),
+            side='sell' if _bool_field(raw, '"m":') else 'buy'
+        )
+
+    @staticmethod
+    def _trade_from_dict(msg: dict) -> MarketEvent:
+        return MarketEvent(
+            timestamp=msg['T'] * 1_000_000,
+            exchange="binance",
+            event_type=TRADE,
+            pair=msg['s'].lower(),
+            price=float(msg['p']),
+            quantity=float(msg['q']),
+            side='sell' if msg['m'] else 'buy'
+        )
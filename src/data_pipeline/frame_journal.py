@@ -0,0 +1,244 @@
+# /src/data_pipeline/frame_journal.py
+
+import asyncio
+import json
+import mmap
+import queue
+import struct
+import logging
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Configure logger
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("frame_journal")
+
+MAGIC = b"XJNL\x01\x00\x00\x00"
+RECORD = struct.Struct("<qBI")          # recv_ns, kind, payload length
+INDEX_DTYPE = np.dtype([("recv_ns", "<i8"), ("offset", "<u8")])
+
+FRAME = 0      # Raw websocket frame
+SNAPSHOT = 1   # REST depth snapshot used for a book resync
+
+_STOP = object()
+
+
+class FrameJournal:
+    """
+    Segmented append-only binary journal of raw market frames.
+
+    Each record is `<recv_ns:int64><kind:uint8><len:uint32><payload>`. append()
+    only enqueues; a background thread does the file I/O, so the socket reader
+    never blocks on disk. Segments rotate at `segment_bytes` and each one has a
+    sidecar `.idx` file with a (recv_ns, offset) entry every `index_interval` seconds.
+    """
+
+    def __init__(self, directory, segment_bytes: int = 256 * 1024 * 1024, index_interval: float = 1.0):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.index_interval_ns = int(index_interval * 1e9)
+        self.records = 0
+        self._queue = queue.SimpleQueue()
+        self._data = None
+        self._index = None
+        self._offset = 0
+        self._last_index_ns = None
+        self._thread = threading.Thread(target=self._run, name="frame-journal", daemon=True)
+        self._thread.start()
+
+    def append(self, payload, recv_ns: int = None, kind: int = FRAME):
+        """
+        Queue a frame (str or bytes) for writing; stamps the receive time if not given.
+        """
+        self._queue.put((recv_ns or time.time_ns(), kind, payload))
+
+    def append_snapshot(self, snapshot: dict, recv_ns: int = None):
+        self.append(json.dumps(snapshot, separators=(",", ":")), recv_ns, SNAPSHOT)
+
+    def close(self):
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            self._write(*item)
+            # Drain whatever else is pending before flushing
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    self._close_segment()
+                    return
+                self._write(*item)
+            self._data.flush()
+            self._index.flush()
+        self._close_segment()
+
+    def _write(self, recv_ns, kind, payload):
+        if isinstance(payload, str):
+            payload = payload.encode()
+
+        if self._data is None or self._offset >= self.segment_bytes:
+            self._open_segment(recv_ns)
+
+        if self._last_index_ns is None or recv_ns - self._last_index_ns >= self.index_interval_ns:
+            self._index.write(np.array([(recv_ns, self._offset)], dtype=INDEX_DTYPE).tobytes())
+            self._last_index_ns = recv_ns
+
+        self._data.write(RECORD.pack(recv_ns, kind, len(payload)))
+        self._data.write(payload)
+        self._offset += RECORD.size + len(payload)
+        self.records += 1
+
+    def _open_segment(self, recv_ns):
+        self._close_segment()
+        path = self.directory / f"{recv_ns:020d}.jnl"
+        self._data = open(path, "wb")
+        self._index = open(path.with_suffix(".idx"), "wb")
+        self._data.write(MAGIC)
+        self._offset = len(MAGIC)
+        self._last_index_ns = None
+        logger.info(f"[JOURNAL] Opened segment {path.name}")
+
+    def _close_segment(self):
+        if self._data is not None:
+            self._data.close()
+            self._index.close()
+            self._data = self._index = None
+
+
+class JournalingSnapshotSource:
+    """
+    Wraps a snapshot source and records every snapshot it returns in the journal.
+    """
+
+    def __init__(self, inner, journal: FrameJournal):
+        self.inner = inner
+        self.journal = journal
+
+    async def get_snapshot(self, pair: str):
+        snapshot = await self.inner.get_snapshot(pair)
+        if snapshot is not None:
+            self.journal.append_snapshot(dict(snapshot, s=pair.upper()))
+        return snapshot
+
+
+class ReplaySnapshotSource:
+    """
+    Serves recorded snapshots to a replayed book at the point in the stream
+    where they arrived live: replay_journal deliver()s each SNAPSHOT record as
+    it reaches it, and get_snapshot waits for the pair's next one. A fetch thus
+    spans the same frames it did in production, and the diffs it covered are
+    buffered rather than applied to a book synced ahead of time.
+    """
+
+    def __init__(self):
+        self._ready = {}     # pair -> snapshots delivered before a fetch asked for them
+        self._waiting = {}   # pair -> futures of fetches in flight, oldest first
+
+    def deliver(self, snapshot: dict):
+        pair = snapshot["s"].lower()
+        waiting = [fut for fut in self._waiting.get(pair, []) if not fut.done()]
+        if waiting:
+            waiting.pop(0).set_result(snapshot)
+            self._waiting[pair] = waiting
+        else:
+            self._ready.setdefault(pair, []).append(snapshot)
+
+    async def get_snapshot(self, pair: str):
+        ready = self._ready.get(pair)
+        if ready:
+            return ready.pop(0)
+        fut = asyncio.get_running_loop().create_future()
+        self._waiting.setdefault(pair, []).append(fut)
+        return await fut
+
+
+class JournalReader:
+    """
+    Memory-maps journal segments and iterates their records in order.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.segments = sorted(self.directory.glob("*.jnl"))
+
+    def _segment_start(self, path, start_ns):
+        if start_ns is None:
+            return len(MAGIC)
+        idx_path = path.with_suffix(".idx")
+        if not idx_path.exists() or idx_path.stat().st_size == 0:
+            return len(MAGIC)
+        index = np.fromfile(idx_path, dtype=INDEX_DTYPE)
+        pos = int(np.searchsorted(index["recv_ns"], start_ns, side="right")) - 1
+        return int(index["offset"][pos]) if pos >= 0 else len(MAGIC)
+
+    def records(self, start_ns: int = None, end_ns: int = None, kinds=(FRAME, SNAPSHOT)):
+        """
+        Yields (recv_ns, kind, payload bytes) for records in [start_ns, end_ns].
+        """
+        for i, path in enumerate(self.segments):
+            # Skip whole segments that end before start_ns
+            if start_ns is not None and i + 1 < len(self.segments):
+                if int(self.segments[i + 1].stem) <= start_ns:
+                    continue
+            if end_ns is not None and int(path.stem) > end_ns:
+                return
+
+            with open(path, "rb") as f:
+                if path.stat().st_size <= len(MAGIC):
+                    continue
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    if buf[:len(MAGIC)] != MAGIC:
+                        logger.warning(f"[JOURNAL] Skipping {path.name}: bad header")
+                        continue
+                    offset, size = self._segment_start(path, start_ns), len(buf)
+                    unpack = RECORD.unpack_from
+                    while offset + RECORD.size <= size:
+                        recv_ns, kind, length = unpack(buf, offset)
+                        offset += RECORD.size
+                        if offset + length > size:
+                            break  # Partially written tail record
+                        if end_ns is not None and recv_ns > end_ns:
+                            return
+                        if (start_ns is None or recv_ns >= start_ns) and kind in kinds:
+                            yield recv_ns, kind, buf[offset:offset + length]
+                        offset += length
+
+    def frames(self, start_ns: int = None, end_ns: int = None):
+        for recv_ns, _, payload in self.records(start_ns, end_ns, kinds=(FRAME,)):
+            yield recv_ns, payload
+
+
+async def replay_journal(directory, process_event_func, start_ns: int = None, end_ns: int = None) -> int:
+    """
+    Replay a journal at full speed through BinanceIngestor's frame path into
+    `process_event_func` (e.g. live_controller.process_event). Returns frames replayed.
+    """
+    from data_pipeline.binance_ingestor import BinanceIngestor
+
+    reader = JournalReader(directory)
+    snapshots = ReplaySnapshotSource()
+    ingestor = BinanceIngestor(process_event_func, snapshot_source=snapshots, queue_size=0)
+    # A retry's wait is the gap until the next recorded snapshot, not a wall-clock backoff
+    ingestor.book_manager.min_backoff = ingestor.book_manager.max_backoff = 0.0
+    count = 0
+    for _, kind, payload in reader.records(start_ns, end_ns):
+        if kind == SNAPSHOT:
+            snapshots.deliver(json.loads(payload))
+        else:
+            await ingestor.handle_frame(payload)
+            count += 1
+        await asyncio.sleep(0)  # Let resync tasks start, or install a delivered snapshot, before the next frame
+    await ingestor.book_manager.close()
+    logger.info(f"[JOURNAL] Replayed {count} frames from {directory}")
+    return count
@@ -1,10 +1,11 @@
 
-import csv
 import asyncio
 import logging
-from datetime import datetime
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
 from data_pipeline.data_normalizer import DataNormalizer
 from feature_engineering.feature_engineer import FeatureEngineer
 from strategy_core.signal_generator import SignalGenerator
@@ -12,6 +13,7 @@ from risk_manager.risk_manager import RiskManager
 from execution_layer.execution_router import ExecutionRouter
 from execution_layer.pnl_tracker import PnLTracker
 from data_pipeline.timescaledb_adapter import TimescaleDBAdapter
+from messaging.market_event import MarketEventBatch
 
 logger = logging.getLogger("historical_ingestor")
 logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(levelname)s - %(message)s")
@@ -32,34 +34,37 @@ execution_router = ExecutionRouter()
 pnl_tracker = PnLTracker()
 storage_adapter = TimescaleDBAdapter(db_config)
 
-async def process_row(row):
-    try:
-        # Simulate event structure
-        event = {
-            "event_type": "trade",
-            "timestamp": datetime.utcfromtimestamp(int(row['time']) / 1000.0),
-            "exchange": "binance",
-            "pair": "btcusdt",
-            "price": float(row['price']),
-            "quantity": float(row['qty']),
-            "side": "buy" if row['isBuyerMaker'] == 'false' else "sell"
-        }
+def load_trade_batch(file_path, pair="btcusdt") -> MarketEventBatch:
+    """
+    Load a Binance trades CSV (time, price, qty, isBuyerMaker) into a MarketEventBatch.
+    """
+    df = pd.read_csv(file_path, usecols=["time", "price", "qty", "isBuyerMaker"])
+    buyer_maker = df["isBuyerMaker"].astype(str).str.lower() == "true"
+    return MarketEventBatch(
+        timestamp=df["time"].to_numpy(dtype=np.int64) * 1_000_000,
+        pair=np.full(len(df), pair),
+        price=df["price"].to_numpy(dtype=np.float64),
+        quantity=df["qty"].to_numpy(dtype=np.float64),
+        side=np.where(buyer_maker, -1, 1)
+    )
 
-        await storage_adapter.insert_trade_event(event)
+async def process_event(event):
+    try:
         feature = feature_engineer.update(event)
         if feature:
             await storage_adapter.insert_feature_vector(feature)
     except Exception as e:
-        logger.error(f"Error processing row: {e}")
+        logger.error(f"Error processing event: {e}")
 
 async def replay_file():
     await storage_adapter.init_pool()
     file_path = Path("ml_model/data/BTCUSDT-trades-2024-12.csv")
-    with open(file_path, newline='') as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            await process_row(row)
-            await asyncio.sleep(0.001)  # Simulate low-latency streaming
+    batch = load_trade_batch(file_path)
+    await storage_adapter.insert_trade_events(batch)
+
+    for event in batch.to_events():
+        await process_event(event)
+        await asyncio.sleep(0.001)  # Simulate low-latency streaming
 
 if __name__ == "__main__":
     asyncio.run(replay_file())
@@ -0,0 +1,129 @@
+# /src/data_pipeline/ingest_queue.py
+
+import asyncio
+import logging
+from collections import deque
+
+from metrics.metrics import ingest_queue_depth, ingest_dropped, ingest_conflated
+
+# Configure logger
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("ingest_queue")
+
+BLOCK = "block"
+DROP_OLDEST = "drop_oldest"
+CONFLATE = "conflate"
+POLICIES = (BLOCK, DROP_OLDEST, CONFLATE)
+
+
+class IngestQueue:
+    """
+    Bounded asyncio queue between the websocket reader and event processing.
+
+    Overflow policies:
+        block       - the reader waits for space (websocket backpressure)
+        drop_oldest - the oldest queued event is discarded
+        conflate    - events put with a `key` (e.g. (pair, 'orderbook')) replace any
+                      queued event with the same key in place; when still full the
+                      oldest event is dropped
+    """
+
+    def __init__(self, maxsize: int = 10000, policy: str = CONFLATE):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown overflow policy '{policy}', expected one of {POLICIES}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self._items = deque()
+        self._latest = {}  # key -> newest event for conflatable entries
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self.dropped = 0
+        self.conflated = 0
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def full(self) -> bool:
+        return len(self._items) >= self.maxsize
+
+    async def put(self, event, key=None):
+        if self.policy == CONFLATE and key is not None and key in self._latest:
+            self._latest[key] = event
+            self.conflated += 1
+            ingest_conflated.inc()
+            return
+
+        while self.full():
+            if self.policy == BLOCK:
+                self._not_full.clear()
+                await self._not_full.wait()
+            else:
+                self._drop_oldest()
+
+        self._push(event, key)
+
+    def put_nowait(self, event, key=None) -> bool:
+        """
+        Non-blocking put; returns False when a blocking queue is full.
+        """
+        if self.policy == BLOCK and self.full():
+            return False
+        if self.policy == CONFLATE and key is not None and key in self._latest:
+            self._latest[key] = event
+            self.conflated += 1
+            ingest_conflated.inc()
+            return True
+        while self.full():
+            self._drop_oldest()
+        self._push(event, key)
+        return True
+
+    async def get(self):
+        while not self._items:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self._pop()
+
+    async def get_batch(self, max_items: int = 256) -> list:
+        """
+        Wait for at least one event, then drain up to `max_items` without awaiting.
+        """
+        batch = [await self.get()]
+        while self._items and len(batch) < max_items:
+            batch.append(self._pop())
+        return batch
+
+    def _push(self, event, key):
+        if self.policy == CONFLATE and key is not None:
+            self._latest[key] = event
+            self._items.append((key, None))
+        else:
+            self._items.append((None, event))
+        ingest_queue_depth.set(len(self._items))
+        self._not_empty.set()
+
+    def _pop(self):
+        key, event = self._items.popleft()
+        if key is not None:
+            event = self._latest.pop(key)
+        ingest_queue_depth.set(len(self._items))
+        self._not_full.set()
+        return event
+
+    def _drop_oldest(self):
+        self._pop()
+        self.dropped += 1
+        ingest_dropped.labels(policy=self.policy).inc()
+
+    def stats(self) -> dict:
+        return {
+            "depth": len(self._items),
+            "maxsize": self.maxsize,
+            "policy": self.policy,
+            "dropped": self.dropped,
+            "conflated": self.conflated
+        }
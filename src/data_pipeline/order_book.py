@@ -0,0 +1,393 @@
+# /src/data_pipeline/order_book.py
+
+import asyncio
+import json
+import logging
+import random
+from pathlib import Path
+
+import numpy as np
+
+# Configure logger
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("order_book")
+
+BINANCE_REST_URL = "https://api.binance.com/api/v3/depth"
+
+
+class BookSide:
+    """
+    One side of an L2 book stored in preallocated NumPy arrays, sorted best-first.
+
+    Prices are kept as sort keys (price for asks, -price for bids) so both sides
+    use the same ascending searchsorted lookup. Levels beyond `capacity` are dropped.
+    """
+
+    def __init__(self, is_bid: bool, capacity: int = 1000):
+        self.is_bid = is_bid
+        self.capacity = capacity
+        self._keys = np.zeros(capacity, dtype=np.float64)
+        self.prices = np.zeros(capacity, dtype=np.float64)
+        self.qtys = np.zeros(capacity, dtype=np.float64)
+        self.size = 0
+
+    def clear(self):
+        self.size = 0
+
+    def update(self, price: float, qty: float):
+        """
+        Set the quantity at a price level; qty == 0 removes the level.
+        """
+        key = -price if self.is_bid else price
+        n = self.size
+        idx = int(np.searchsorted(self._keys[:n], key))
+        exists = idx < n and self._keys[idx] == key
+
+        if qty == 0.0:
+            if exists:
+                self._keys[idx:n - 1] = self._keys[idx + 1:n]
+                self.prices[idx:n - 1] = self.prices[idx + 1:n]
+                self.qtys[idx:n - 1] = self.qtys[idx + 1:n]
+                self.size = n - 1
+            return
+
+        if exists:
+            self.qtys[idx] = qty
+            return
+
+        if idx >= self.capacity:
+            return  # Worse than every level we keep
+
+        if n == self.capacity:
+            n -= 1  # Drop the worst level to make room
+
+        self._keys[idx + 1:n + 1] = self._keys[idx:n]
+        self.prices[idx + 1:n + 1] = self.prices[idx:n]
+        self.qtys[idx + 1:n + 1] = self.qtys[idx:n]
+        self._keys[idx] = key
+        self.prices[idx] = price
+        self.qtys[idx] = qty
+        self.size = n + 1
+
+    def best_price(self):
+        return self.prices[0] if self.size else None
+
+    def best_qty(self):
+        return self.qtys[0] if self.size else None
+
+    def levels(self, n: int = None):
+        """
+        Returns zero-copy (prices, qtys) views of the best `n` levels.
+        """
+        n = self.size if n is None else min(n, self.size)
+        return self.prices[:n], self.qtys[:n]
+
+
+class OrderBook:
+    """
+    Local L2 order book for one pair, maintained from a REST snapshot plus
+    Binance diff-depth events (`U`/`u` first/last update IDs).
+    """
+
+    def __init__(self, pair: str, capacity: int = 1000):
+        self.pair = pair
+        self.bids = BookSide(is_bid=True, capacity=capacity)
+        self.asks = BookSide(is_bid=False, capacity=capacity)
+        self.last_update_id = 0
+        self.event_time = None
+        self.synced = False
+
+    def load_snapshot(self, snapshot: dict):
+        """
+        Reset the book from a depth snapshot:
+        {'lastUpdateId': 160, 'bids': [['0.0024', '10']], 'asks': [['0.0026', '100']]}
+        """
+        self.bids.clear()
+        self.asks.clear()
+        for price, qty in snapshot.get("bids", []):
+            self.bids.update(float(price), float(qty))
+        for price, qty in snapshot.get("asks", []):
+            self.asks.update(float(price), float(qty))
+        self.last_update_id = int(snapshot["lastUpdateId"])
+        self.synced = True
+
+    def apply_diff(self, msg: dict) -> bool:
+        """
+        Apply a depthUpdate event. Returns False (and marks the book unsynced)
+        when the event does not continue the update-ID sequence.
+        """
+        first_id, last_id = msg["U"], msg["u"]
+
+        if last_id <= self.last_update_id:
+            return True  # Already contained in the snapshot
+
+        if first_id > self.last_update_id + 1:
+            logger.warning(f"[BOOK] {self.pair} sequence gap: expected {self.last_update_id + 1}, got U={first_id}")
+            self.synced = False
+            return False
+
+        for price, qty in msg.get("b", []):
+            self.bids.update(float(price), float(qty))
+        for price, qty in msg.get("a", []):
+            self.asks.update(float(price), float(qty))
+
+        self.last_update_id = last_id
+        self.event_time = msg.get("E")
+        return True
+
+    def best_bid(self):
+        return self.bids.best_price()
+
+    def best_ask(self):
+        return self.asks.best_price()
+
+    def mid_price(self):
+        if not self.bids.size or not self.asks.size:
+            return None
+        return 0.5 * (self.bids.prices[0] + self.asks.prices[0])
+
+    def spread(self):
+        if not self.bids.size or not self.asks.size:
+            return None
+        return self.asks.prices[0] - self.bids.prices[0]
+
+    def top_of_book(self) -> dict:
+        return {
+            "bid": self.bids.best_price(),
+            "bid_qty": self.bids.best_qty(),
+            "ask": self.asks.best_price(),
+            "ask_qty": self.asks.best_qty()
+        }
+
+    def to_snapshot(self) -> dict:
+        """
+        Serialize the book in REST snapshot form.
+        """
+        return {
+            "s": self.pair.upper(),
+            "lastUpdateId": self.last_update_id,
+            "bids": [[repr(float(p)), repr(float(q))] for p, q in zip(*self.bids.levels())],
+            "asks": [[repr(float(p)), repr(float(q))] for p, q in zip(*self.asks.levels())]
+        }
+
+    def depth(self, n: int = 5):
+        """
+        Returns zero-copy views ((bid_px, bid_qty), (ask_px, ask_qty)) for the top `n` levels.
+        """
+        return self.bids.levels(n), self.asks.levels(n)
+
+
+class OrderBookManager:
+    """
+    Keeps one OrderBook per pair in sync with the diff-depth stream.
+
+    Follows Binance's local book procedure: buffer diffs while unsynced, fetch a
+    snapshot, drop diffs already covered by it, and resync whenever a gap appears.
+
+    Snapshots are fetched by one background task per pair, so the socket reader
+    never waits on REST and a burst of diffs during a desync costs one request,
+    not one per diff. A failed fetch, or a snapshot older than the buffered
+    diffs, is retried after an exponential backoff (`min_backoff` doubling up to
+    `max_backoff` seconds) to stay clear of REST rate limits.
+    """
+
+    def __init__(self, snapshot_source, pairs, capacity: int = 1000, max_buffer: int = 10000,
+                 min_backoff: float = 0.25, max_backoff: float = 30.0):
+        self.snapshot_source = snapshot_source
+        self.capacity = capacity
+        self.max_buffer = max_buffer
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.books = {pair: OrderBook(pair, capacity) for pair in pairs}
+        self._pending = {pair: [] for pair in pairs}
+        self._resync_tasks = {}
+        self.resyncs = {pair: 0 for pair in pairs}
+
+    def get_book(self, pair: str):
+        return self.books.get(pair)
+
+    def resyncing(self, pair: str) -> bool:
+        task = self._resync_tasks.get(pair)
+        return task is not None and not task.done()
+
+    async def on_depth_update(self, msg: dict):
+        """
+        Apply a depthUpdate payload; returns the synced book or None while resyncing.
+        Never waits on a snapshot: the diff is buffered and a resync task started if none is running.
+        """
+        pair = msg["s"].lower()
+        book = self.books.get(pair)
+        if book is None:
+            book = self.books[pair] = OrderBook(pair, self.capacity)
+            self._pending[pair] = []
+            self.resyncs[pair] = 0
+
+        if book.synced and book.apply_diff(msg):
+            return book
+
+        pending = self._pending[pair]
+        pending.append(msg)
+        if len(pending) > self.max_buffer:
+            del pending[0]
+
+        if not self.resyncing(pair):
+            self._resync_tasks[pair] = asyncio.create_task(self._resync_until_synced(pair))
+        return None
+
+    async def _resync_until_synced(self, pair: str):
+        delay = self.min_backoff
+        while not await self.resync(pair):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_backoff)
+
+    async def resync(self, pair: str) -> bool:
+        """
+        Fetches one snapshot and replays the buffered diffs on it; returns whether the book is synced.
+        """
+        book = self.books[pair]
+        pending = self._pending[pair]
+
+        snapshot = await self.snapshot_source.get_snapshot(pair)
+        if snapshot is None:
+            return False
+
+        # Diffs that arrived while the snapshot was in flight are in `pending` too
+        book.load_snapshot(snapshot)
+        self.resyncs[pair] += 1
+
+        # Drop diffs already covered by the snapshot; the next one must bridge it
+        pending[:] = [msg for msg in pending if msg["u"] > book.last_update_id]
+        if pending and pending[0]["U"] > book.last_update_id + 1:
+            logger.warning(f"[BOOK] {pair} snapshot {book.last_update_id} older than buffered diffs, retrying")
+            book.synced = False
+            return False
+
+        for msg in pending:
+            if not book.apply_diff(msg):
+                break
+        pending.clear()
+
+        if book.synced:
+            logger.info(f"[BOOK] {pair} synced at update {book.last_update_id}")
+        return book.synced
+
+    async def close(self):
+        tasks = [task for task in self._resync_tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._resync_tasks.clear()
+
+
+class BinanceSnapshotSource:
+    """
+    Fetches depth snapshots from the Binance REST API.
+    """
+
+    def __init__(self, limit: int = 1000, url: str = BINANCE_REST_URL):
+        self.limit = limit
+        self.url = url
+
+    async def get_snapshot(self, pair: str):
+        import aiohttp
+
+        params = {"symbol": pair.upper(), "limit": self.limit}
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(self.url, params=params) as resp:
+                    resp.raise_for_status()
+                    return await resp.json()
+        except Exception as e:
+            logger.error(f"[BOOK] Snapshot fetch failed for {pair}: {e}")
+            return None
+
+
+class LocalDepthSource:
+    """
+    Offline snapshot/diff fixture source for tests and throughput runs.
+
+    `snapshots` maps pair -> list of snapshots ordered by lastUpdateId. When diffs
+    are consumed through `stream()`, `get_snapshot` serves the newest snapshot the
+    exchange could have returned at that point in the stream.
+    """
+
+    def __init__(self, snapshots: dict, diffs: list):
+        self.snapshots = {pair: sorted(snaps, key=lambda s: s["lastUpdateId"]) for pair, snaps in snapshots.items()}
+        self.diffs = diffs
+        self.position = None
+        self.snapshot_requests = 0
+
+    def stream(self):
+        for msg in self.diffs:
+            self.position = msg["u"]
+            yield msg
+
+    async def get_snapshot(self, pair: str):
+        self.snapshot_requests += 1
+        snaps = self.snapshots.get(pair, [])
+        if self.position is not None:
+            snaps = [s for s in snaps if s["lastUpdateId"] < self.position]
+        return snaps[-1] if snaps else None
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Load a JSON-lines fixture: lines with 'lastUpdateId' are snapshots
+        (must carry 's'), everything else is treated as a depthUpdate.
+        """
+        snapshots, diffs = {}, []
+        with open(Path(path)) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                msg = json.loads(line)
+                if "lastUpdateId" in msg:
+                    snapshots.setdefault(msg["s"].lower(), []).append(msg)
+                else:
+                    diffs.append(msg)
+        return cls(snapshots, diffs)
+
+    @classmethod
+    def synthetic(cls, pair="btcusdt", n_updates=1000, levels=20, mid=30000.0, tick=0.01,
+                  start_id=100, drop_every=None, seed=42):
+        """
+        Build a random-walk book fixture. `drop_every` removes every n-th diff
+        from the stream to simulate sequence gaps; a snapshot of the true book is
+        recorded at each dropped diff so a resync can bridge the gap.
+        """
+        rng = random.Random(seed)
+        snapshot = {
+            "s": pair.upper(),
+            "lastUpdateId": start_id,
+            "bids": [[f"{mid - tick * (i + 1):.2f}", f"{rng.uniform(0.1, 5):.4f}"] for i in range(levels)],
+            "asks": [[f"{mid + tick * (i + 1):.2f}", f"{rng.uniform(0.1, 5):.4f}"] for i in range(levels)]
+        }
+        reference = OrderBook(pair)
+        reference.load_snapshot(snapshot)
+
+        snapshots, diffs, update_id = [snapshot], [], start_id
+        for i in range(n_updates):
+            mid += rng.choice((-tick, 0.0, tick))
+            bids = [[f"{mid - tick * rng.randint(1, levels):.2f}", f"{rng.choice((0.0, rng.uniform(0.1, 5))):.4f}"]
+                    for _ in range(3)]
+            asks = [[f"{mid + tick * rng.randint(1, levels):.2f}", f"{rng.choice((0.0, rng.uniform(0.1, 5))):.4f}"]
+                    for _ in range(3)]
+            msg = {
+                "e": "depthUpdate", "E": 1700000000000 + i * 100, "s": pair.upper(),
+                "U": update_id + 1, "u": update_id + 2, "b": bids, "a": asks
+            }
+            update_id += 2
+            reference.apply_diff(msg)
+
+            if drop_every and (i + 1) % drop_every == 0:
+                snapshots.append(reference.to_snapshot())
+                continue
+            diffs.append(msg)
+
+        source = cls({pair: snapshots}, diffs)
+        source.reference = reference
+        return source
+
+
+if __name__ == "__main__":
+    logger.info("[XALGO] Order Book module ready.")
@@ -2,6 +2,8 @@ import asyncpg
 import asyncio
 import logging
 
+from messaging.market_event import ns_to_datetime, SIDE_NAMES
+
 # Configure logger
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("timescaledb_adapter")
@@ -23,7 +25,7 @@ class TimescaleDBAdapter:
         try:
             async with self.pool.acquire() as conn:
                 await conn.execute(query,
-                    event.timestamp,
+                    ns_to_datetime(event.timestamp),
                     event.exchange,
                     event.pair,
                     float(event.price),
@@ -32,6 +34,26 @@ class TimescaleDBAdapter:
         except Exception as e:
             logger.error(f"[DB] Failed to insert trade event: {e}")
 
+    async def insert_trade_events(self, batch):
+        """
+        Bulk insert a MarketEventBatch of trades with a single executemany.
+        """
+        query = """
+        INSERT INTO trade_events (timestamp, exchange, pair, price, quantity, side)
+        VALUES ($1, $2, $3, $4, $5, $6)
+        """
+        rows = [
+            (ns_to_datetime(ts), batch.exchange, pair, price, qty, SIDE_NAMES[side])
+            for ts, pair, price, qty, side in zip(batch.timestamp.tolist(), batch.pair.tolist(),
+                                                  batch.price.tolist(), batch.quantity.tolist(),
+                                                  batch.side.tolist())
+        ]
+        try:
+            async with self.pool.acquire() as conn:
+                await conn.executemany(query, rows)
+        except Exception as e:
+            logger.error(f"[DB] Failed to insert trade batch ({len(rows)} rows): {e}")
+
     async def insert_orderbook_event(self, event):
         query = """
         INSERT INTO orderbook_events (timestamp, exchange, pair, bids, asks)
@@ -40,7 +62,7 @@ class TimescaleDBAdapter:
         try:
             async with self.pool.acquire() as conn:
                 await conn.execute(query,
-                    event.timestamp,
+                    ns_to_datetime(event.timestamp),
                     event.exchange,
                     event.pair,
                     str(event.bids),
@@ -56,7 +78,7 @@ class TimescaleDBAdapter:
         try:
             async with self.pool.acquire() as conn:
                 await conn.execute(query,
-                    feature["timestamp"],
+                    ns_to_datetime(feature["timestamp"]),
                     feature["spread"],
                     feature["volatility"],
                     feature["imbalance"])
@@ -1,24 +1,18 @@
 class ExecutionSafety:
-    def __init__(self):
-        self.leg1_filled = False
-        self.leg2_filled = False
-        self.leg3_filled = False
+    def __init__(self, n_legs: int = 3):
+        self.reset(n_legs)
 
-    def reset(self):
-        self.leg1_filled = False
-        self.leg2_filled = False
-        self.leg3_filled = False
+    def reset(self, n_legs: int = None):
+        # Cycles found by the arbitrage scanner can have any number of legs; triangles have 3
+        self.n_legs = n_legs or self.n_legs
+        self.filled = [False] * self.n_legs
 
     def update_leg_status(self, leg_id: int, filled: bool):
-        if leg_id == 1:
-            self.leg1_filled = filled
-        elif leg_id == 2:
-            self.leg2_filled = filled
-        elif leg_id == 3:
-            self.leg3_filled = filled
+        if 1 <= leg_id <= self.n_legs:
+            self.filled[leg_id - 1] = filled
 
     def is_cycle_complete(self):
-        return self.leg1_filled and self.leg2_filled and self.leg3_filled
+        return all(self.filled)
 
     def detect_incomplete_cycle(self):
-        return self.leg1_filled and (not self.leg2_filled or not self.leg3_filled)
\ No newline at end of file
+        return self.filled[0] and not all(self.filled[1:])
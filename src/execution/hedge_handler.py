@@ -1,7 +1,5 @@
 import logging
-from prometheus_client import Counter
-
-hedge_activations = Counter("xalgo_hedge_trades", "Number of emergency hedge trades executed")
+from metrics.metrics import hedge_activations  # Registered once, in metrics.metrics
 
 class HedgeHandler:
     def __init__(self, broker):
@@ -0,0 +1,82 @@
+import numpy as np
+
+
+class BookFeatures:
+    """
+    Incremental order-book features per pair, refreshed on every orderbook event.
+
+    For the top `levels` of the book (level i weighted by 1 / (i + 1)):
+        imbalance  = (W_bid - W_ask) / (W_bid + W_ask), in [-1, 1]
+        weighted_mid (microprice) = (ask * bid_qty + bid * ask_qty) / (bid_qty + ask_qty) at the top level
+    Values live in one preallocated array, so updates allocate nothing per pair.
+    """
+
+    IMBALANCE, MICROPRICE, MID, SPREAD = range(4)
+
+    def __init__(self, pairs, levels: int = 5):
+        self.levels = levels
+        self.index = {pair: i for i, pair in enumerate(pairs)}
+        self.weights = 1.0 / np.arange(1, levels + 1, dtype=np.float64)
+        self.values = np.zeros((len(pairs), 4), dtype=np.float64)
+        self.updated = np.zeros(len(pairs), dtype=bool)
+
+    def update(self, event) -> bool:
+        """
+        Refresh features for the event's pair. Uses the live OrderBook when the
+        event carries one, else the [price, qty] lists on the event.
+        """
+        i = self.index.get(event.pair)
+        if i is None:
+            return False
+
+        book = event.book
+        if book is not None:
+            bid_px, bid_qty = book.bids.prices, book.bids.qtys
+            ask_px, ask_qty = book.asks.prices, book.asks.qtys
+            n_bid = min(book.bids.size, self.levels)
+            n_ask = min(book.asks.size, self.levels)
+        else:
+            if not event.bids or not event.asks:
+                return False
+            bids = np.asarray(event.bids[:self.levels], dtype=np.float64)
+            asks = np.asarray(event.asks[:self.levels], dtype=np.float64)
+            bid_px, bid_qty, ask_px, ask_qty = bids[:, 0], bids[:, 1], asks[:, 0], asks[:, 1]
+            n_bid, n_ask = len(bids), len(asks)
+
+        if not n_bid or not n_ask:
+            return False
+
+        w = self.weights
+        w_bid = float(np.dot(w[:n_bid], bid_qty[:n_bid]))
+        w_ask = float(np.dot(w[:n_ask], ask_qty[:n_ask]))
+
+        bid, ask = float(bid_px[0]), float(ask_px[0])
+        q_bid, q_ask = float(bid_qty[0]), float(ask_qty[0])
+
+        row = self.values[i]
+        total = w_bid + w_ask
+        row[self.IMBALANCE] = (w_bid - w_ask) / total if total > 0 else 0.0
+        row[self.MICROPRICE] = (ask * q_bid + bid * q_ask) / (q_bid + q_ask) if q_bid + q_ask > 0 else 0.5 * (bid + ask)
+        row[self.MID] = 0.5 * (bid + ask)
+        row[self.SPREAD] = ask - bid
+        self.updated[i] = True
+        return True
+
+    def imbalance(self, pair: str) -> float:
+        return float(self.values[self.index[pair], self.IMBALANCE])
+
+    def microprice(self, pair: str):
+        i = self.index[pair]
+        return float(self.values[i, self.MICROPRICE]) if self.updated[i] else None
+
+    def as_dict(self) -> dict:
+        """
+        Flat feature dict: imbalance_<pair>, microprice_<pair> for every pair, so the
+        key set never changes. Until a pair's book is seen its imbalance is 0.0 and
+        its microprice NaN.
+        """
+        out = {}
+        for pair, i in self.index.items():
+            out[f"imbalance_{pair}"] = float(self.values[i, self.IMBALANCE])
+            out[f"microprice_{pair}"] = float(self.values[i, self.MICROPRICE]) if self.updated[i] else np.nan
+        return out
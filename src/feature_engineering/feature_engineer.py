@@ -1,8 +1,9 @@
 import numpy as np
 import pandas as pd
-from collections import deque
 import logging
-from filters.kalman_spread_estimator import KalmanSpreadEstimator
+from filters.kalman_spread_estimator import KalmanSpreadEstimator, kalman_filter_batch
+from feature_engineering.book_features import BookFeatures
+from feature_engineering.triangle_state import TriangleState
 
 # Logger setup
 logging.basicConfig(level=logging.INFO)
@@ -11,33 +12,31 @@ logger = logging.getLogger("feature_engineer")
 class FeatureEngineer:
     """
     Computes real-time engineered features from normalized trade events.
-    Supports adaptive spread analysis and basic volatility/imbalance tracking.
+    Supports adaptive spread analysis, volatility tracking, and order-book
+    imbalance/microprice features maintained from orderbook events.
     """
 
-    def __init__(self, db_conn=None, maxlen=500):
-        self.prices = {
-            'btcusdt': deque(maxlen=maxlen),
-            'ethusdt': deque(maxlen=maxlen),
-            'ethbtc': deque(maxlen=maxlen)
-        }
-        self.timestamps = deque(maxlen=maxlen)
+    def __init__(self, db_conn=None, legs=("btcusdt", "ethusdt", "ethbtc"), max_leg_age_ms=5000.0):
+        self.triangle = TriangleState(legs, max_leg_age_ms=max_leg_age_ms)
         self.db_conn = db_conn
         self.kalman = KalmanSpreadEstimator()
+        self.book_features = BookFeatures(list(legs))
+        self.warmed_up = False
 
     def update(self, event):
         """
-        Receives a normalized event and updates internal buffers.
+        Receives a MarketEvent and updates internal buffers.
         If sufficient data is present, calculates feature vector.
         """
-        if event.event_type != 'trade':
+        if event.event_type == 'orderbook':
+            self.book_features.update(event)
             return None
 
-        pair = event.pair
-        if pair not in self.prices:
+        if event.event_type != 'trade':
             return None
 
-        self.prices[pair].append(float(event.price))
-        self.timestamps.append(event.timestamp)
+        if not self.triangle.update(event.pair, float(event.price), getattr(event, "quantity", None), event.timestamp):
+            return None
 
         if self.ready():
             fv = self.calculate_features()
@@ -45,36 +44,143 @@ class FeatureEngineer:
 
         return None
 
+    def update_batch(self, batch):
+        """
+        Replays a MarketEventBatch of trades straight from its arrays
+        (no per-row event objects). Returns the feature vectors produced.
+        """
+        features = []
+        update = self.triangle.update
+        for ts, pair, price, qty in zip(batch.timestamp.tolist(), batch.pair.tolist(), batch.price.tolist(),
+                                        batch.quantity.tolist()):
+            if not update(pair, price, qty, ts):
+                continue
+            if self.ready():
+                fv = self.calculate_features()
+                if fv:
+                    features.append(fv)
+        return features
+
+    def align_trades(self, batch):
+        """
+        Turns an interleaved MarketEventBatch of trades into time-aligned as-of
+        arrays: one row per trade on a triangle leg that the streaming path would
+        turn into a feature vector (every leg seen, and warmed up on fresh legs).
+
+        Returns (timestamps, base, cross, direct, leg_age_ns) for legs in triangle order.
+        """
+        n = len(batch)
+        rows = np.arange(n)
+        tracked = np.zeros(n, dtype=bool)
+        complete = np.ones(n, dtype=bool)
+        asof, asof_ns = [], []
+
+        for pair in self.triangle.legs:
+            mask = batch.pair == pair
+            tracked |= mask
+            last = np.maximum.accumulate(np.where(mask, rows, -1))
+            asof.append(batch.price[np.maximum(last, 0)])
+            asof_ns.append(batch.timestamp[np.maximum(last, 0)])
+            complete &= last >= 0
+
+        asof_ns = np.vstack(asof_ns)
+        newest_ns = asof_ns.max(axis=0)
+        leg_age_ns = newest_ns - asof_ns.min(axis=0)
+        warmed = np.logical_or.accumulate(tracked & complete & (leg_age_ns <= self.triangle.max_leg_age_ns))
+
+        keep = tracked & warmed
+        return (newest_ns[keep], asof[0][keep], asof[1][keep], asof[2][keep], leg_age_ns[keep])
+
+    def compute_batch(self, btc_usdt, eth_usdt, eth_btc, timestamps=None, imbalance=None, leg_age_ns=None,
+                      include_prices=False):
+        """
+        Vectorized feature matrix for time-aligned price arrays; row i equals the
+        feature vector a fresh streaming FeatureEngineer returns on the i-th ready tick.
+
+        Spread math is vectorized and the Kalman recursion runs in a compiled loop.
+        Returns a dict of column arrays.
+        """
+        btc_usdt = np.asarray(btc_usdt, dtype=np.float64)
+        eth_usdt = np.asarray(eth_usdt, dtype=np.float64)
+        eth_btc = np.asarray(eth_btc, dtype=np.float64)
+
+        implied_ethbtc = eth_usdt / btc_usdt
+        spread = eth_btc - implied_ethbtc
+
+        k = self.kalman
+        kf = kalman_filter_batch(implied_ethbtc, eth_btc, Q=k.Q, R=k.R, window=k.window)
+        leg_age_ns = (np.asarray(leg_age_ns, dtype=np.int64) if leg_age_ns is not None
+                      else np.zeros(len(spread), dtype=np.int64))
+
+        features = {
+            "timestamp": (np.asarray(timestamps, dtype=np.int64) if timestamps is not None
+                          else np.arange(len(spread), dtype=np.int64)),
+            "spread": spread,
+            "spread_zscore": kf["zscore"],
+            "volatility": kf["spread_std"],
+            "imbalance": (np.asarray(imbalance, dtype=np.float64) if imbalance is not None
+                          else np.zeros(len(spread))),
+            "leg_age_ms": leg_age_ns * 1e-6,
+            "stale": leg_age_ns > self.triangle.max_leg_age_ns
+        }
+        if include_prices:
+            features.update({
+                "btc_usd": btc_usdt,
+                "eth_usd": eth_usdt,
+                "eth_btc": eth_btc,
+                "implied_ethbtc": implied_ethbtc,
+                "kalman_alpha": kf["alpha"],
+                "kalman_beta": kf["beta"]
+            })
+        return features
+
+    def compute_batch_from_trades(self, batch, include_prices=False):
+        """
+        Batch equivalent of feeding every trade in `batch` through update().
+        """
+        timestamps, btc_usdt, eth_usdt, eth_btc, leg_age_ns = self.align_trades(batch)
+        return self.compute_batch(btc_usdt, eth_usdt, eth_btc, timestamps=timestamps, leg_age_ns=leg_age_ns,
+                                  include_prices=include_prices)
+
     def ready(self):
         """
-        Determines if enough data is buffered for feature calculation.
+        Warm-up gate: opens the first time every leg has a price within
+        max_leg_age_ms of the others. Later vectors are tagged stale instead.
         """
-        return all(len(q) > 10 for q in self.prices.values())
+        if not self.warmed_up:
+            self.warmed_up = not self.triangle.stale()
+        return self.warmed_up
 
     def calculate_features(self):
         """
         Computes Kalman-filtered spread, volatility (as spread std), and synthetic imbalance.
         """
         try:
-            btc_usdt = self.prices['btcusdt'][-1]
-            eth_usdt = self.prices['ethusdt'][-1]
-            eth_btc = self.prices['ethbtc'][-1]
-
-            implied_ethbtc = eth_usdt / btc_usdt
-            spread = eth_btc - implied_ethbtc
+            triangle = self.triangle
+            btc_usdt, eth_usdt, eth_btc = triangle.price.tolist()
+            implied_ethbtc = triangle.implied
+            spread = triangle.spread
+            leg_age_ns = triangle.leg_age_ns()
 
             # Update Kalman filter
             self.kalman.update(implied_ethbtc, eth_btc)
             zscore = self.kalman.get_zscore()
 
-            imbalance = np.random.uniform(-1, 1)  # 🔄 Replace with real imbalance when available
+            # Depth-weighted imbalance of the traded leg (0.0 until its book has been seen)
+            imbalance = self.book_features.imbalance(triangle.legs[triangle.DIRECT])
 
             feature_vector = {
-                "timestamp": self.timestamps[-1],
+                "timestamp": int(triangle.last_ns),
                 "spread": spread,
                 "spread_zscore": zscore,
                 "volatility": self.kalman.spread_std,
-                "imbalance": imbalance
+                "imbalance": imbalance,
+                "btc_price": btc_usdt,
+                "eth_price": eth_usdt,
+                "eth_btc": eth_btc,
+                "leg_age_ms": leg_age_ns * 1e-6,
+                "stale": leg_age_ns > triangle.max_leg_age_ns,
+                **self.book_features.as_dict()
             }
 
             logger.info(f"[FEATURE_VECTOR] {feature_vector}")
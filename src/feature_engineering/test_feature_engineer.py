@@ -1,5 +1,5 @@
 import random
-from datetime import datetime
+import time
 from feature_engineering.feature_engineer import FeatureEngineer
 
 class MockEvent:
@@ -7,7 +7,7 @@ class MockEvent:
         self.event_type = 'trade'
         self.pair = pair
         self.price = price
-        self.timestamp = datetime.utcnow()
+        self.timestamp = time.time_ns()
 
 # Initialize
 fe = FeatureEngineer()
@@ -0,0 +1,193 @@
+import itertools
+
+import numpy as np
+
+from numba import njit
+
+from utils.rolling_kernels import kalman_step, welford_push, window_std
+
+BASE, CROSS, DIRECT = range(3)  # Leg slots, as in TriangleState
+
+
+class TriangleUniverse:
+    """
+    Set of triangles (base/quote, cross/quote, cross/base) over a list of markets,
+    plus a CSR index from each symbol to the (triangle, leg) slots it feeds.
+    """
+
+    def __init__(self, markets):
+        # markets: iterable of (base_asset, quote_asset), e.g. ("ETH", "BTC")
+        self.markets = sorted({(b.upper(), q.upper()) for b, q in markets})
+        listed = set(self.markets)
+
+        triangles = []
+        quotes = {q for _, q in self.markets}
+        for cross, base in self.markets:
+            for quote in sorted(quotes - {cross, base}):
+                if (base, quote) in listed and (cross, quote) in listed:
+                    triangles.append((symbol(base, quote), symbol(cross, quote), symbol(cross, base)))
+        self.triangles = triangles
+
+        self.symbols = sorted({s for tri in triangles for s in tri})
+        self.symbol_ids = {s: i for i, s in enumerate(self.symbols)}
+        self.legs = np.array([[self.symbol_ids[s] for s in tri] for tri in triangles], dtype=np.int64).reshape(-1, 3)
+
+        # symbol id -> rows sym_slots[sym_ptr[id]:sym_ptr[id + 1]] of (triangle, leg)
+        slots = sorted((sid, t, leg) for t, row in enumerate(self.legs.tolist()) for leg, sid in enumerate(row))
+        self.sym_ptr = np.searchsorted(np.array([s for s, _, _ in slots], dtype=np.int64),
+                                       np.arange(len(self.symbols) + 1))
+        self.sym_slots = np.array([(t, leg) for _, t, leg in slots], dtype=np.int64).reshape(-1, 2)
+
+    @classmethod
+    def from_assets(cls, assets, quotes=("USDT",)):
+        """
+        Every asset against every quote, plus crosses quoted in the earlier-listed
+        asset: ["BTC", "ETH", "BNB"] gives ETHBTC, BNBBTC and BNBETH.
+        """
+        assets = [a.upper() for a in assets]
+        markets = [(a, q.upper()) for a in assets for q in quotes if a != q.upper()]
+        markets += [(later, earlier) for earlier, later in itertools.combinations(assets, 2)]
+        return cls(markets)
+
+    def __len__(self):
+        return len(self.triangles)
+
+    def triangles_for(self, pair: str):
+        sid = self.symbol_ids.get(pair)
+        if sid is None:
+            return []
+        return self.sym_slots[self.sym_ptr[sid]:self.sym_ptr[sid + 1], 0].tolist()
+
+
+def symbol(base: str, quote: str) -> str:
+    return f"{base}{quote}".lower()
+
+
+@njit(cache=True)
+def _on_tick(slots, price, size, px, qty, event_ns, ts, seen, warmed, max_age_ns,
+             implied, spread, leg_age, kalman, resid, resid_state, zscore, Q, R, recenter_every, out):
+    """
+    Applies one tick to every (triangle, leg) slot of its symbol and advances the
+    Kalman spread model of each warmed triangle. Writes emitting triangle ids to
+    `out` and returns how many there are.
+    """
+    window = resid.shape[1]
+    n_out = 0
+    for k in range(slots.shape[0]):
+        t = slots[k, 0]
+        leg = slots[k, 1]
+        price[t, leg] = px
+        size[t, leg] = qty
+        event_ns[t, leg] = ts
+        seen[t, leg] = True
+
+        if not (seen[t, 0] and seen[t, 1] and seen[t, 2]):
+            continue
+
+        newest = max(event_ns[t, 0], event_ns[t, 1], event_ns[t, 2])
+        leg_age[t] = newest - min(event_ns[t, 0], event_ns[t, 1], event_ns[t, 2])
+        if not warmed[t]:
+            if leg_age[t] > max_age_ns:
+                continue
+            warmed[t] = True
+
+        x = price[t, CROSS] / price[t, BASE]
+        y = price[t, DIRECT]
+        implied[t] = x
+        spread[t] = y - x
+
+        r = kalman_step(kalman[t], x, y, Q, R)
+        welford_push(resid[t], window, resid_state[t], r, recenter_every)
+        kalman[t, 5] = window_std(resid_state[t])
+        zscore[t] = r / kalman[t, 5]
+
+        out[n_out] = t
+        n_out += 1
+    return n_out
+
+
+class TriangleEngine:
+    """
+    Spread and Kalman z-score state for every triangle in a TriangleUniverse.
+
+    All per-triangle state lives in contiguous arrays indexed by triangle id. A
+    tick touches only the triangles its symbol belongs to, in one compiled call,
+    so hundreds of triangles run on one core with no per-triangle objects.
+    """
+
+    ALPHA, BETA, P00, P01, P11, STD = range(6)
+
+    def __init__(self, universe: TriangleUniverse, max_leg_age_ms=5000.0, Q=1e-5, R=1e-3, window=200,
+                 recenter_every=10000):
+        self.universe = universe
+        n = len(universe)
+        self.max_leg_age_ns = int(max_leg_age_ms * 1e6)
+        self.Q, self.R = float(Q), float(R)
+        self.recenter_every = recenter_every
+
+        self.price = np.zeros((n, 3))
+        self.size = np.zeros((n, 3))
+        self.event_ns = np.zeros((n, 3), dtype=np.int64)
+        self.seen = np.zeros((n, 3), dtype=bool)
+        self.warmed = np.zeros(n, dtype=bool)
+
+        self.implied = np.zeros(n)
+        self.spread = np.zeros(n)
+        self.leg_age_ns = np.zeros(n, dtype=np.int64)
+        self.zscore = np.zeros(n)
+
+        self.kalman = np.zeros((n, 6))
+        self.kalman[:, self.BETA] = 1.0
+        self.kalman[:, self.P00] = self.kalman[:, self.P11] = 1.0
+        self.kalman[:, self.STD] = 1.0
+        self.resid = np.zeros((n, window))
+        self.resid_state = np.zeros((n, 5))  # pos, count, pushes, mean, m2
+
+        self._out = np.empty(max(n, 1), dtype=np.int64)
+        self._slots = [universe.sym_slots[universe.sym_ptr[i]:universe.sym_ptr[i + 1]]
+                       for i in range(len(universe.symbols))]
+
+    def on_tick(self, pair: str, price: float, size: float, event_ns: int) -> np.ndarray:
+        """
+        Applies a trade to every triangle containing `pair`. Returns the ids of
+        triangles that produced a fresh spread/z-score (a view, valid until the next tick).
+        """
+        sid = self.universe.symbol_ids.get(pair)
+        if sid is None:
+            return self._out[:0]
+        n = _on_tick(self._slots[sid], self.price, self.size, float(price), float(size or 0.0),
+                     self.event_ns, int(event_ns), self.seen, self.warmed, self.max_leg_age_ns,
+                     self.implied, self.spread, self.leg_age_ns, self.kalman, self.resid, self.resid_state,
+                     self.zscore, self.Q, self.R, self.recenter_every, self._out)
+        return self._out[:n]
+
+    def update(self, event):
+        """
+        MarketEvent entry point; non-trade events are ignored.
+        """
+        if event.event_type != 'trade':
+            return self._out[:0]
+        return self.on_tick(event.pair, event.price, event.quantity, event.timestamp)
+
+    def stale(self, ids=None) -> np.ndarray:
+        ages = self.leg_age_ns if ids is None else self.leg_age_ns[ids]
+        return ages > self.max_leg_age_ns
+
+    def feature_vector(self, t: int) -> dict:
+        """
+        FeatureEngineer-shaped dict for one triangle; built on demand, off the hot path.
+        """
+        base, cross, direct = self.universe.triangles[t]
+        return {
+            "triangle": f"{base}/{cross}/{direct}",
+            "timestamp": int(self.event_ns[t].max()),
+            "spread": float(self.spread[t]),
+            "spread_zscore": float(self.zscore[t]),
+            "volatility": float(self.kalman[t, self.STD]),
+            "implied": float(self.implied[t]),
+            "leg_age_ms": int(self.leg_age_ns[t]) * 1e-6,
+            "stale": bool(self.leg_age_ns[t] > self.max_leg_age_ns)
+        }
+
+    def snapshot(self) -> list:
+        return [self.feature_vector(t) for t in np.flatnonzero(self.warmed).tolist()]
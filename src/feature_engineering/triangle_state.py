@@ -0,0 +1,78 @@
+import numpy as np
+
+
+class TriangleState:
+    """
+    As-of snapshot of one triangle's three legs: latest price, size and event
+    time (epoch ns) per leg.
+
+    Legs are (base/quote, cross/quote, cross/base), e.g. ("btcusdt", "ethusdt", "ethbtc").
+    The implied cross rate is recomputed only when a quote leg's price changes, and
+    the snapshot knows how old its oldest leg is relative to the newest tick.
+    """
+
+    BASE, CROSS, DIRECT = range(3)
+
+    def __init__(self, legs=("btcusdt", "ethusdt", "ethbtc"), max_leg_age_ms: float = 5000.0):
+        self.legs = tuple(legs)
+        self.index = {pair: i for i, pair in enumerate(self.legs)}
+        self.max_leg_age_ns = int(max_leg_age_ms * 1e6)
+
+        self.price = np.zeros(3, dtype=np.float64)
+        self.size = np.zeros(3, dtype=np.float64)
+        self.event_ns = np.zeros(3, dtype=np.int64)
+        self.seen = np.zeros(3, dtype=bool)
+
+        self.implied = 0.0
+        self.spread = 0.0
+        self._complete = False
+
+    def update(self, pair: str, price: float, size: float, event_ns: int) -> bool:
+        """
+        Applies a tick to its leg. Returns False when the pair is not part of this triangle.
+        """
+        i = self.index.get(pair)
+        if i is None:
+            return False
+
+        price_changed = not self.seen[i] or price != self.price[i]
+        self.price[i] = price
+        self.size[i] = size if size is not None else 0.0
+        self.event_ns[i] = event_ns
+        self.seen[i] = True
+
+        if not self._complete:
+            self._complete = bool(self.seen.all())
+            if not self._complete:
+                return True
+            self.implied = float(self.price[self.CROSS] / self.price[self.BASE])
+        elif price_changed and i != self.DIRECT:
+            self.implied = float(self.price[self.CROSS] / self.price[self.BASE])
+
+        if price_changed:
+            self.spread = float(self.price[self.DIRECT]) - self.implied
+        return True
+
+    def complete(self) -> bool:
+        return self._complete
+
+    @property
+    def last_ns(self) -> int:
+        """
+        Event time of the newest leg.
+        """
+        return int(self.event_ns.max())
+
+    def leg_age_ns(self) -> int:
+        """
+        Age of the oldest leg at the time of the newest leg.
+        """
+        if not self._complete:
+            return -1
+        return int(self.event_ns.max() - self.event_ns.min())
+
+    def stale(self) -> bool:
+        return not self.complete() or self.leg_age_ns() > self.max_leg_age_ns
+
+    def prices(self) -> dict:
+        return dict(zip(self.legs, self.price.tolist()))
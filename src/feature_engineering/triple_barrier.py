@@ -0,0 +1,101 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from numba import njit
+
+
+@njit(cache=True, nogil=True)
+def _triple_barrier_kernel(values, upper, lower, end, first_touch, labels, hits):
+    for i in range(labels.shape[0]):
+        last = end[i]
+        if last <= i:
+            continue  # No vertical barrier ahead of this row: left unlabeled
+
+        up, lo = upper[i], lower[i]
+        first_lower = -1
+        hit = -1
+        for j in range(i + 1, last + 1):
+            v = values[j]
+            if v >= up:
+                labels[i] = 1
+                hit = j
+                break
+            if first_lower < 0 and v <= lo:
+                first_lower = j
+                if first_touch:
+                    break
+
+        if hit < 0:
+            if first_lower >= 0:
+                labels[i] = -1
+                hit = first_lower
+            else:
+                hit = last  # Vertical barrier
+        hits[i] = hit
+
+
+def _label_chunk(values, upper, lower, end, first_touch, start, stop):
+    # Rows [start, stop) only look ahead to their own vertical barrier: slice that overlap in
+    last = int(end[start:stop].max()) if stop > start else start
+    stop_values = max(last + 1, stop)
+    labels = np.zeros(stop - start, dtype=np.int8)
+    hits = np.full(stop - start, -1, dtype=np.int64)
+    _triple_barrier_kernel(values[start:stop_values], upper[start:stop], lower[start:stop],
+                           np.where(end[start:stop] >= 0, end[start:stop] - start, -1), first_touch, labels, hits)
+    return labels, np.where(hits >= 0, hits + start, -1)
+
+
+def triple_barrier_labels(values, upper, lower, horizon=None, vertical=None, first_touch=True, n_jobs=1,
+                          chunk_size=250_000):
+    """
+    Triple-barrier labels for a series.
+
+    upper/lower are absolute barrier levels per row (so they can be asymmetric).
+    The vertical barrier is either `horizon` rows ahead (rows without a full
+    horizon left are unlabeled) or an explicit array of last-index-inclusive
+    ends, e.g. np.searchsorted(ts, ts + horizon_ns, side='right') - 1.
+
+    With first_touch=True the earliest barrier hit decides; with False an upper
+    hit anywhere before the vertical barrier wins over a lower hit, as in the
+    original train_triangular_model labeler.
+
+    Returns (labels, hit_index): labels in {-1, 0, 1} (int8); hit_index is the
+    row where the deciding barrier was hit (the vertical barrier for label 0),
+    or -1 for unlabeled rows. n_jobs > 1 labels chunks of `chunk_size` rows on
+    threads, each chunk overlapping the next by its look-ahead.
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    upper = np.ascontiguousarray(upper, dtype=np.float64)
+    lower = np.ascontiguousarray(lower, dtype=np.float64)
+    n = len(values)
+
+    if vertical is None:
+        if horizon is None:
+            raise ValueError("triple_barrier_labels needs a horizon or vertical barrier array")
+        end = np.arange(n, dtype=np.int64) + horizon
+        end[end > n - 1] = -1
+    else:
+        end = np.minimum(np.asarray(vertical, dtype=np.int64), n - 1)
+
+    bounds = [(s, min(s + chunk_size, n)) for s in range(0, n, chunk_size)] if n_jobs > 1 else [(0, n)]
+    if len(bounds) == 1:
+        return _label_chunk(values, upper, lower, end, first_touch, 0, n)
+
+    # The kernel releases the GIL, so threads label chunks in parallel
+    with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+        parts = list(pool.map(lambda b: _label_chunk(values, upper, lower, end, first_touch, *b), bounds))
+    return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+
+def label_spread(spread, horizon, upper_mult, lower_mult=None, first_touch=False, n_jobs=1):
+    """
+    Volatility-scaled barriers around a pandas spread series: spread +/- mult *
+    rolling(horizon) std, with a `horizon`-row vertical barrier. The defaults
+    reproduce label_triple_barrier in scripts/train_triangular_model.py exactly.
+    """
+    lower_mult = upper_mult if lower_mult is None else lower_mult
+    rolling_std = spread.rolling(horizon).std().to_numpy()
+    values = spread.to_numpy(dtype=np.float64)
+    return triple_barrier_labels(values, values + upper_mult * rolling_std, values - lower_mult * rolling_std,
+                                 horizon=horizon, first_touch=first_touch, n_jobs=n_jobs)
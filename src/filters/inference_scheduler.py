@@ -0,0 +1,80 @@
+import asyncio
+import logging
+import time
+
+from metrics.metrics import inference_batch_size, inference_queue_delay
+
+logger = logging.getLogger("inference_scheduler")
+
+
+class InferenceScheduler:
+    """
+    Micro-batches MLFilter scoring across concurrent coroutines.
+
+    score() parks the caller on a future. Pending requests are scored together
+    by one MLFilter.score_batch call (one predict_proba, one anomaly
+    decision_function) as soon as `max_batch` are waiting or `max_delay_us` has
+    passed since the first of them. With max_delay_us=0 the batch is flushed on
+    the next event-loop turn: a lone caller waits for nothing, while callers
+    that are ready in the same turn share the call.
+    """
+
+    def __init__(self, ml_filter, max_batch=32, max_delay_us=200.0):
+        self.ml_filter = ml_filter
+        self.max_batch = max(int(max_batch), 1)
+        self.max_delay = max(float(max_delay_us), 0.0) * 1e-6
+        self._pending = []  # (enqueued perf_counter, feature vector, future)
+        self._timer = None
+        self.batches = 0
+        self.scored = 0
+
+    async def score(self, fv: dict) -> dict:
+        """
+        Same result as ml_filter.predict_with_confidence(fv), computed in a micro-batch.
+        """
+        return await self.submit(fv)
+
+    def submit(self, fv: dict) -> asyncio.Future:
+        """
+        Queues fv without waiting and returns the future of its result. Requests
+        submitted before the caller next yields land in the same batch.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((time.perf_counter(), fv, future))
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self.flush) if self.max_delay else loop.call_soon(self.flush)
+        return future
+
+    def flush(self):
+        """
+        Scores everything pending now. Called by the deadline timer or when a batch fills up.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        started = time.perf_counter()
+        for enqueued, _, _ in pending:
+            inference_queue_delay.observe(started - enqueued)
+        inference_batch_size.observe(len(pending))
+
+        try:
+            results = self.ml_filter.score_batch([fv for _, fv, _ in pending])
+        except Exception as e:
+            logger.error(f"[Inference] Batch of {len(pending)} failed: {e}")
+            for _, _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.scored += len(pending)
+        for (_, _, future), result in zip(pending, results):
+            if not future.done():  # Skip callers that were cancelled while queued
+                future.set_result(result)
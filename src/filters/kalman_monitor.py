@@ -1,9 +1,8 @@
-import numpy as np
-from collections import deque
+from utils.ring_buffer import RingBuffer
 
 class KalmanMonitor:
     def __init__(self, window=100):
-        self.residuals = deque(maxlen=window)
+        self.residuals = RingBuffer(window)
 
     def update(self, residual):
         self.residuals.append(residual)
@@ -11,5 +10,5 @@ class KalmanMonitor:
     def get_score(self):
         if len(self.residuals) < 5:
             return 1.0  # assume stable
-        std = np.std(self.residuals)
+        std = self.residuals.std()
         return max(0.0, 1.0 - std)
\ No newline at end of file
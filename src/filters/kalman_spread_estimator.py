@@ -1,39 +1,71 @@
 import numpy as np
 
+from utils.ring_buffer import RingBuffer
+from utils.rolling_kernels import ALPHA, BETA, kalman_step, welford_push, window_std
+
+from numba import njit
+
+
 class KalmanSpreadEstimator:
-    def __init__(self, initial_alpha=0.0, initial_beta=1.0, Q=1e-5, R=1e-3):
-        self.alpha = initial_alpha
-        self.beta = initial_beta
+    """
+    Recursive Kalman regression y = alpha + beta * x with a rolling z-score of the residual.
+
+    The 2x2 covariance update is done in closed form on scalars and the rolling
+    residual std is maintained incrementally by a RingBuffer, so each update is
+    O(1) with no NumPy temporaries.
+    """
+
+    def __init__(self, initial_alpha=0.0, initial_beta=1.0, Q=1e-5, R=1e-3, window=200):
+        self.alpha = float(initial_alpha)
+        self.beta = float(initial_beta)
         self.Q = Q
         self.R = R
-        self.P = np.eye(2)
-        self.state = np.array([self.alpha, self.beta])
+        # Symmetric covariance [[p00, p01], [p01, p11]]
+        self.p00, self.p01, self.p11 = 1.0, 0.0, 1.0
         self.last_spread = 0.0
         self.spread_std = 1.0
-        self.spread_history = []
+
+        self.window = window
+        self.residuals = RingBuffer(window)
+
+    @property
+    def state(self):
+        return np.array([self.alpha, self.beta])
+
+    @property
+    def P(self):
+        return np.array([[self.p00, self.p01], [self.p01, self.p11]])
+
+    @property
+    def spread_history(self):
+        """
+        Residuals currently in the rolling window, oldest first (zero-copy view).
+        """
+        return self.residuals.view()
 
     def update(self, x, y):
-        phi = np.array([1.0, x])
-        y_pred = np.dot(phi, self.state)
+        p00, p01, p11 = self.p00, self.p01, self.p11
 
-        # Kalman gain
-        P_phi = self.P @ phi
-        S = max(phi @ P_phi + self.R, 1e-8)  # Stability safeguard
-        K = P_phi / S
+        # P @ phi with phi = [1, x]
+        pp0 = p00 + p01 * x
+        pp1 = p01 + p11 * x
 
-        residual = y - y_pred
-        self.state += K * residual
+        S = max(pp0 + pp1 * x + self.R, 1e-8)  # Stability safeguard
+        k0 = pp0 / S
+        k1 = pp1 / S
 
-        # Covariance update with symmetry enforcement
-        P_new = self.P - np.outer(K, phi) @ self.P + self.Q * np.eye(2)
-        self.P = 0.5 * (P_new + P_new.T)
+        residual = y - (self.alpha + self.beta * x)
+        self.alpha += k0 * residual
+        self.beta += k1 * residual
 
-        self.last_spread = residual
-        self.spread_history.append(residual)
+        # P - K (P phi)^T + Q I, symmetric by construction
+        self.p00 = p00 - k0 * pp0 + self.Q
+        self.p01 = p01 - k0 * pp1
+        self.p11 = p11 - k1 * pp1 + self.Q
 
-        if len(self.spread_history) > 200:
-            self.spread_history = self.spread_history[-200:]
-        self.spread_std = np.std(self.spread_history) or 1.0
+        self.last_spread = residual
+        self.residuals.push(residual)
+        self.spread_std = self.residuals.std() or 1.0
 
         return residual
 
@@ -41,4 +73,62 @@ class KalmanSpreadEstimator:
         return self.last_spread / self.spread_std
 
     def get_params(self):
-        return {'alpha': self.state[0], 'beta': self.state[1]}
+        return {'alpha': self.alpha, 'beta': self.beta}
+
+
+@njit(cache=True)
+def _kalman_batch_kernel(x, y, alpha, beta, Q, R, window, recenter_every):
+    n = x.shape[0]
+    alphas = np.empty(n)
+    betas = np.empty(n)
+    residuals = np.empty(n)
+    stds = np.empty(n)
+
+    k = np.array([alpha, beta, 1.0, 0.0, 1.0])
+    buf = np.zeros(window)
+    state = np.zeros(5)
+
+    for i in range(n):
+        r = kalman_step(k, x[i], y[i], Q, R)
+        welford_push(buf, window, state, r, recenter_every)
+        alphas[i] = k[ALPHA]
+        betas[i] = k[BETA]
+        residuals[i] = r
+        stds[i] = window_std(state)
+
+    return alphas, betas, residuals, stds
+
+
+def kalman_filter_batch(x, y, initial_alpha=0.0, initial_beta=1.0, Q=1e-5, R=1e-3, window=200,
+                        recenter_every=10000):
+    """
+    Run the KalmanSpreadEstimator recursion over whole arrays in one compiled loop.
+
+    Returns a dict of arrays: alpha, beta, residual, spread_std and zscore, where
+    row i is the estimator's state after its i-th update() on (x[i], y[i]). The
+    kernel performs the same floating-point operations in the same order as the
+    streaming estimator, so the series match it bit-for-bit.
+
+    2-D inputs of shape (rows, triangles) filter each column independently and
+    return arrays of the same shape.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if x.ndim == 2:
+        columns = [kalman_filter_batch(x[:, j], y[:, j], initial_alpha, initial_beta, Q, R, window, recenter_every)
+                   for j in range(x.shape[1])]
+        return {key: np.column_stack([c[key] for c in columns]) for key in ("alpha", "beta", "residual",
+                                                                           "spread_std", "zscore")}
+
+    x = np.ascontiguousarray(x)
+    y = np.ascontiguousarray(y)
+    alphas, betas, residuals, stds = _kalman_batch_kernel(
+        x, y, float(initial_alpha), float(initial_beta), float(Q), float(R), int(window), int(recenter_every)
+    )
+    return {
+        "alpha": alphas,
+        "beta": betas,
+        "residual": residuals,
+        "spread_std": stds,
+        "zscore": residuals / stds
+    }
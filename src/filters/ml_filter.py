@@ -1,9 +1,12 @@
+import os
 import numpy as np
 import pandas as pd
-import joblib
 import logging
-from prometheus_client import Counter, Gauge
-from collections import deque
+from collections import namedtuple
+from prometheus_client import Counter
+from utils.ring_buffer import RingBuffer
+from filters.tree_ensemble import CompiledForest, fidelity_error
+from filters import model_cache
 
 logger = logging.getLogger("ml_filter")
 logging.basicConfig(
@@ -15,95 +18,179 @@ logging.basicConfig(
 prediction_total = Counter("mlfilter_total_predictions", "Total ML predictions")
 prediction_correct = Counter("mlfilter_correct_predictions", "Heuristic-correct predictions")
 
-confidence_score_gauge = Gauge("mlfilter_confidence_score", "Confidence score")
-anomaly_score_gauge = Gauge("mlfilter_anomaly_score", "Anomaly score")
-cointegration_score_gauge = Gauge("mlfilter_cointegration_score", "Cointegration score")
-composite_score_gauge = Gauge("mlfilter_composite_score", "Composite fusion score")
+# Score gauges are shared with metrics.prometheus_scores; registering them twice fails
+from metrics.prometheus_scores import (
+    confidence_score_gauge, anomaly_score_gauge, cointegration_score_gauge, composite_score_gauge
+)
 
 # --- KalmanMonitor ---
 class KalmanMonitor:
     def __init__(self, window=100):
-        self.residuals = deque(maxlen=window)
+        self.residuals = RingBuffer(window)
     def update(self, eth_usd, btc_usd, eth_btc):
         implied = btc_usd * eth_btc
         residual = eth_usd - implied
         self.residuals.append(residual)
     def get_score(self):
-        return max(0.0, 1.0 - np.std(self.residuals)) if len(self.residuals) >= 10 else 1.0
+        return max(0.0, 1.0 - self.residuals.std()) if len(self.residuals) >= 10 else 1.0
+
+# --- Default artifacts, shared by every component that builds an MLFilter ---
+DEFAULT_MODEL_PATH = os.getenv("XALGO_MODEL_PATH", "ml_model/triangular_rf_model.pkl")
+DEFAULT_ANOMALY_PATH = os.getenv("XALGO_ANOMALY_PATH", "ml_model/anomaly_filter.pkl")
+
+# --- Live feature schema: columns of every model MLFilter scores with (and the registry accepts) ---
+FEATURE_ORDER = [
+    "btc_usd", "eth_usd", "eth_btc",
+    "implied_ethbtc", "spread", "z_score"
+]
+
+# --- Active model: swapped as one object so readers never see a mixed pair ---
+LoadedModel = namedtuple("LoadedModel", ["model", "compiled", "version"])
 
 # --- MLFilter with fusion ---
 class MLFilter:
+    # Largest predict_proba difference tolerated before falling back to the sklearn path
+    FIDELITY_TOL = 1e-9
+
     def __init__(self,
-                 model_path="ml_model/triangular_rf_model.pkl",
-                 anomaly_path="ml_model/anomaly_filter.pkl"):
-        self.model = None
+                 model_path=DEFAULT_MODEL_PATH,
+                 anomaly_path=DEFAULT_ANOMALY_PATH,
+                 compile_model=True):
+        self.compile_model = compile_model
+        self.active = LoadedModel(None, None, None)
         self.anomaly_model = None
         self.anomaly_scaler = None
-        self.feature_order = [
-            "btc_usd", "eth_usd", "eth_btc",
-            "implied_ethbtc", "spread", "z_score"
-        ]
+        self.feature_order = list(FEATURE_ORDER)
         self.kalman = KalmanMonitor()
+        self.predictions = 0          # Plain counts behind the prometheus counters, for drift checks
+        self.correct_predictions = 0
         self._load_model(model_path, anomaly_path)
 
+    @property
+    def model(self):
+        return self.active.model
+
+    @property
+    def compiled(self):
+        return self.active.compiled
+
     def _load_model(self, model_path, anomaly_path):
+        # Artifacts come from the process-wide cache: every MLFilter on the same file shares one model
         try:
-            self.model = joblib.load(model_path)
+            self.active = self.prepare(model_cache.load_artifact(model_path), version=model_path, path=model_path)
             logger.info(f"[MLFilter] Loaded model from {model_path}")
         except Exception as e:
             logger.warning(f"[MLFilter] Failed to load model: {e}")
 
         try:
-            obj = joblib.load(anomaly_path)
+            obj = model_cache.load_artifact(anomaly_path)
             self.anomaly_model = obj["model"]
             self.anomaly_scaler = obj["scaler"]
             logger.info(f"[MLFilter] Loaded anomaly model from {anomaly_path}")
         except Exception as e:
             logger.warning(f"[MLFilter] Failed to load anomaly model: {e}")
 
+    def prepare(self, model, version=None, path=None) -> LoadedModel:
+        """
+        Wraps a fitted classifier for install(), compiled when compile_model is set.
+        With the artifact's `path`, the compiled forest comes from (and goes to)
+        the shared memory-mapped cache instead of being rebuilt.
+        """
+        if not self.compile_model:
+            return LoadedModel(model, None, version)
+        if path is not None:
+            return LoadedModel(model, model_cache.load_compiled(path, model, self._compile), version)
+        return LoadedModel(model, self._compile(model), version)
+
+    def install(self, loaded: LoadedModel) -> LoadedModel:
+        """
+        Makes `loaded` the live model in one assignment; returns the one it replaced.
+        """
+        previous, self.active = self.active, loaded
+        return previous
+
+    def _compile(self, model):
+        # Flatten the ensemble for the compiled path, but only keep it if it reproduces predict_proba
+        try:
+            compiled = CompiledForest.from_model(model)
+            error = fidelity_error(model, compiled, compiled.probe_rows(), self.feature_order)
+        except Exception as e:
+            logger.info(f"[MLFilter] Compiled inference unavailable, using predict_proba: {e}")
+            return None
+        if error > self.FIDELITY_TOL:
+            logger.warning(f"[MLFilter] Compiled model deviates from predict_proba by {error:.3g}; not used")
+            return None
+        logger.info(f"[MLFilter] Compiled {len(compiled.roots)} trees / {len(compiled.feature)} nodes "
+                    f"(max |dp| = {error:.3g})")
+        return compiled
+
+    def predict_proba(self, X, active: LoadedModel = None) -> np.ndarray:
+        """
+        Class probabilities for rows of features in feature_order (2D array or a single row).
+        """
+        active = active or self.active
+        if active.compiled is not None:
+            return active.compiled.predict_proba(X)
+        X = np.asarray(X, dtype=np.float64).reshape(-1, len(self.feature_order))
+        return active.model.predict_proba(pd.DataFrame(X, columns=self.feature_order))
+
     def predict(self, fv: dict) -> int:
         return self.predict_with_confidence(fv)["signal"]
 
     def predict_with_confidence(self, fv: dict) -> dict:
-        if not self.model:
+        return self.score_batch([fv])[0]
+
+    def score_batch(self, fvs) -> list:
+        """
+        predict_with_confidence for several feature vectors with one predict_proba
+        and one anomaly decision_function call. Results are in input order.
+        """
+        active = self.active  # One model for the whole batch, even if a swap lands meanwhile
+        if not active.model:
             logger.warning("[MLFilter] No ML model. Default ALLOW.")
-            return {"signal": 1, "confidence": 0.0, "composite": 0.0}
+            return [{"signal": 1, "confidence": 0.0, "composite": 0.0} for _ in fvs]
 
         try:
             # Extract feature input
-            X = pd.DataFrame([[fv.get(k, 0.0) for k in self.feature_order]], columns=self.feature_order)
-            proba = self.model.predict_proba(X)[0]
-            pred = int(np.argmax(proba))
-            signal = [-1, 0, 1][pred]
-            confidence = float(np.max(proba))
-            prediction_total.inc()
-
-            if (signal == 1 and fv.get("spread", 0.0) < 0) or (signal == -1 and fv.get("spread", 0.0) > 0):
-                prediction_correct.inc()
+            X = np.array([[fv.get(k, 0.0) for k in self.feature_order] for fv in fvs], dtype=np.float64)
+            proba = self.predict_proba(X, active)
 
             # Anomaly score
-            anomaly_score = 1.0
+            anomaly_scores = np.ones(len(fvs))
             if self.anomaly_model and self.anomaly_scaler:
-                X_scaled = self.anomaly_scaler.transform(X)
-                raw = self.anomaly_model.decision_function(X_scaled)[0]
-                anomaly_score = 1.0 - (raw - self.anomaly_model.offset_)  # normalize flip
-
-            # Cointegration score
-            self.kalman.update(fv.get("eth_usd", 0.0), fv.get("btc_usd", 0.0), fv.get("eth_btc", 0.0))
-            cointegration = self.kalman.get_score()
-
-            # Composite score
-            composite = 0.4 * confidence + 0.4 * cointegration + 0.2 * (1 - anomaly_score)
-
-            # Push metrics
-            confidence_score_gauge.set(confidence)
-            anomaly_score_gauge.set(anomaly_score)
-            cointegration_score_gauge.set(cointegration)
-            composite_score_gauge.set(composite)
-
-            logger.info(f"[MLFilter] Signal={signal} | Conf={confidence:.3f} | Anom={anomaly_score:.3f} | Coin={cointegration:.3f} | Comp={composite:.3f}")
-            return {"signal": signal, "confidence": confidence, "composite": composite}
+                X_scaled = self.anomaly_scaler.transform(pd.DataFrame(X, columns=self.feature_order))
+                raw = self.anomaly_model.decision_function(X_scaled)
+                anomaly_scores = 1.0 - (raw - self.anomaly_model.offset_)  # normalize flip
+
+            results = []
+            for fv, p, anomaly_score in zip(fvs, proba, anomaly_scores.tolist()):
+                pred = int(np.argmax(p))
+                signal = [-1, 0, 1][pred]
+                confidence = float(np.max(p))
+                prediction_total.inc()
+                self.predictions += 1
+
+                if (signal == 1 and fv.get("spread", 0.0) < 0) or (signal == -1 and fv.get("spread", 0.0) > 0):
+                    prediction_correct.inc()
+                    self.correct_predictions += 1
+
+                # Cointegration score
+                self.kalman.update(fv.get("eth_usd", 0.0), fv.get("btc_usd", 0.0), fv.get("eth_btc", 0.0))
+                cointegration = self.kalman.get_score()
+
+                # Composite score
+                composite = 0.4 * confidence + 0.4 * cointegration + 0.2 * (1 - anomaly_score)
+
+                # Push metrics
+                confidence_score_gauge.set(confidence)
+                anomaly_score_gauge.set(anomaly_score)
+                cointegration_score_gauge.set(cointegration)
+                composite_score_gauge.set(composite)
+
+                logger.info(f"[MLFilter] Signal={signal} | Conf={confidence:.3f} | Anom={anomaly_score:.3f} | Coin={cointegration:.3f} | Comp={composite:.3f}")
+                results.append({"signal": signal, "confidence": confidence, "composite": composite})
+            return results
 
         except Exception as e:
             logger.error(f"[MLFilter] Scoring error: {e}")
-            return {"signal": 1, "confidence": 0.0, "composite": 0.0}
+            return [{"signal": 1, "confidence": 0.0, "composite": 0.0} for _ in fvs]
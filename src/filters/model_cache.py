@@ -0,0 +1,128 @@
+# /src/filters/model_cache.py
+
+import hashlib
+import logging
+import os
+import threading
+import time
+import weakref
+
+import joblib
+
+from filters.tree_ensemble import CompiledForest
+
+logger = logging.getLogger("model_cache")
+
+# Compiled node arrays are kept as <cache dir>/<sha256>/*.npy and memory-mapped by every process
+# that loads the artifact; by default the cache dir is ".compiled" beside the artifact itself
+CACHE_DIR = os.getenv("XALGO_MODEL_CACHE")
+
+_lock = threading.RLock()
+_hashes = {}                                # (abspath, size, mtime_ns) -> sha256
+_artifacts = weakref.WeakValueDictionary()  # sha256 -> unpickled artifact, while anything still uses it
+_pinned = {}                                # sha256 -> artifacts that cannot be weakly referenced (dicts)
+_compiled = weakref.WeakValueDictionary()   # sha256 -> CompiledForest over mapped pages
+_uncompilable = set()                       # sha256 of artifacts the compiler rejected
+
+
+def artifact_hash(path) -> str:
+    """
+    sha256 of the file's contents, recomputed only when its size or mtime changes.
+    """
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    digest = _hashes.get(key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        digest = _hashes[key] = h.hexdigest()
+    return digest
+
+
+def load_artifact(path):
+    """
+    joblib.load, once per process per distinct file content: two paths holding
+    the same bytes, or the same path loaded by several components, share one object.
+    """
+    with _lock:
+        digest = artifact_hash(path)
+        obj = _artifacts.get(digest, _pinned.get(digest))
+        if obj is not None:
+            return obj
+        started = time.perf_counter()
+        obj = joblib.load(path)
+        try:
+            _artifacts[digest] = obj
+        except TypeError:
+            _pinned[digest] = obj
+        logger.info(f"[MODEL CACHE] Loaded {path} ({digest[:12]}) in {time.perf_counter() - started:.3f}s")
+        return obj
+
+
+def load_compiled(path, model, compile_fn, cache_dir=None):
+    """
+    The CompiledForest for the artifact at `path`, backed by memory-mapped .npy files.
+
+    On the first load of an artifact anywhere, compile_fn(model) builds (and
+    fidelity-checks) the forest, which is then written under cache_dir. Later
+    loads, in this or any other process, map those files instead of compiling,
+    so the node arrays are read from disk once and their pages shared, including
+    by workers forked after the load. Returns None when compile_fn does.
+    """
+    cache_dir = cache_dir or CACHE_DIR or os.path.join(os.path.dirname(os.path.abspath(path)), ".compiled")
+    with _lock:
+        digest = artifact_hash(path)
+        if digest in _uncompilable:
+            return None
+        compiled = _compiled.get(digest)
+        if compiled is not None:
+            return compiled
+
+        directory = os.path.join(str(cache_dir), digest)
+        if os.path.exists(os.path.join(directory, "meta.json")):
+            try:
+                compiled = _compiled[digest] = CompiledForest.load(directory)
+                return compiled
+            except Exception as e:
+                logger.warning(f"[MODEL CACHE] Ignoring unreadable cache {directory}: {e}")
+
+        compiled = compile_fn(model)
+        if compiled is None:
+            _uncompilable.add(digest)
+            return None
+        try:
+            _publish(compiled, directory)
+            compiled = CompiledForest.load(directory)
+        except OSError as e:
+            logger.warning(f"[MODEL CACHE] Could not write {directory}, compiled model stays private: {e}")
+        _compiled[digest] = compiled
+        return compiled
+
+
+def _publish(compiled, directory):
+    # Written under a temporary name and renamed, so a concurrent reader never maps a partial cache
+    tmp = f"{directory}.tmp-{os.getpid()}-{time.time_ns()}"
+    compiled.save(tmp)
+    try:
+        os.rename(tmp, directory)
+    except OSError:
+        if not os.path.exists(os.path.join(directory, "meta.json")):
+            raise
+        # Another process published the same artifact first; its files are identical
+        for name in os.listdir(tmp):
+            os.remove(os.path.join(tmp, name))
+        os.rmdir(tmp)
+
+
+def clear():
+    """
+    Forgets every in-process entry (the on-disk compiled cache is kept).
+    """
+    with _lock:
+        _hashes.clear()
+        _artifacts.clear()
+        _pinned.clear()
+        _compiled.clear()
+        _uncompilable.clear()
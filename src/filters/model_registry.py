@@ -0,0 +1,224 @@
+# /src/filters/model_registry.py
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from filters import model_cache
+from metrics.metrics import model_version, model_swaps, model_load_failures
+
+logger = logging.getLogger("model_registry")
+
+MODEL_FILE = "model.pkl"
+META_FILE = "meta.json"
+
+
+def publish_model(root, model, feature_order, **meta) -> int:
+    """
+    Writes a fitted model as the next registry version: root/<version>/{model.pkl, meta.json}.
+    The version directory is built under a temporary name and renamed into
+    place, so a watching registry never sees a half-written artifact.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    tmp = root / f".tmp-{os.getpid()}-{time.time_ns()}"
+    tmp.mkdir()
+    joblib.dump(model, tmp / MODEL_FILE)
+    meta = dict(meta, feature_order=list(feature_order), created=time.time(), model_type=type(model).__name__)
+
+    while True:
+        version = max(list_versions(root), default=0) + 1
+        meta["version"] = version
+        (tmp / META_FILE).write_text(json.dumps(meta, indent=2))
+        try:
+            tmp.rename(root / str(version))
+            return version
+        except OSError:
+            if not (root / str(version)).exists():
+                raise
+            # Another publisher took this version number; try the next one
+
+
+def list_versions(root) -> list:
+    root = Path(root)
+    if not root.is_dir():
+        return []
+    return sorted(int(p.name) for p in root.iterdir() if p.name.isdigit() and (p / META_FILE).exists())
+
+
+class ModelRegistry:
+    """
+    Watches a directory of versioned model artifacts (see publish_model) and
+    hot-swaps MLFilter's live model.
+
+    A background thread polls for versions newer than the live one, then loads,
+    schema-checks against MLFilter.feature_order, compiles and warms each one
+    off the trading loop. Only then is it installed, by a single assignment,
+    so scoring never waits on a load and never sees a half-swapped model.
+    Replaced models are kept (up to `keep`) for rollback().
+
+    Other MLFilters that must score with the same model (e.g. one owned by a
+    SignalGenerator) are attach()ed; every swap and rollback installs into all of them.
+    """
+
+    def __init__(self, root, ml_filter, poll_interval: float = 5.0, keep: int = 3):
+        self.root = Path(root)
+        self.ml_filter = ml_filter
+        self.poll_interval = poll_interval
+        self.keep = keep
+        self.followers = []     # Attached MLFilters that mirror ml_filter's live model
+        self.history = []       # Previously live LoadedModels, oldest first
+        self.rejected = set()   # Versions that failed to load or were rolled back
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+        self._publish_version()
+
+    @property
+    def live_version(self):
+        version = self.ml_filter.active.version
+        return version if isinstance(version, int) else None
+
+    def attach(self, ml_filter):
+        """
+        Makes `ml_filter` follow the live model: it gets the current one now and every later swap or rollback.
+        """
+        if ml_filter is None or ml_filter is self.ml_filter or ml_filter in self.followers:
+            return
+        with self._lock:
+            ml_filter.install(self.ml_filter.active)
+            self.followers.append(ml_filter)
+
+    def _install(self, loaded):
+        # Called with the lock held; returns the primary filter's previous model
+        for follower in self.followers:
+            follower.install(loaded)
+        return self.ml_filter.install(loaded)
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="model-registry", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def wake(self):
+        """
+        Polls now instead of at the next interval (thread-safe; e.g. right after a publish).
+        """
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"[REGISTRY] Poll failed: {e}")
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def poll(self):
+        """
+        Activates the newest version that is newer than the live one and not rejected.
+        """
+        live = self.live_version or 0
+        for version in reversed(list_versions(self.root)):
+            if version <= live:
+                return None
+            if version not in self.rejected and self.activate(version):
+                return version
+        return None
+
+    def check_schema(self, model, meta: dict):
+        expected = list(self.ml_filter.feature_order)
+        if meta.get("feature_order") != expected:
+            raise ValueError(f"feature_order {meta.get('feature_order')} != live {expected}")
+        n_features = getattr(model, "n_features_in_", len(expected))
+        if n_features != len(expected):
+            raise ValueError(f"model expects {n_features} features, live vectors have {len(expected)}")
+        names = getattr(model, "feature_names_in_", None)
+        if names is not None and list(names) != expected:
+            raise ValueError(f"model was fit on columns {list(names)}")
+        if not hasattr(model, "predict_proba"):
+            raise ValueError(f"{type(model).__name__} has no predict_proba")
+
+    def load(self, version: int):
+        """
+        Loads, checks, compiles and warms one version; returns an installable LoadedModel.
+        """
+        path = self.root / str(version)
+        meta = json.loads((path / META_FILE).read_text())
+        model = model_cache.load_artifact(path / MODEL_FILE)
+        self.check_schema(model, meta)
+        loaded = self.ml_filter.prepare(model, version=version, path=path / MODEL_FILE)
+        # Warm-up: first calls pay for lazy initialisation, not the first live tick
+        warm = np.zeros((4, len(self.ml_filter.feature_order)))
+        proba = self.ml_filter.predict_proba(warm, loaded)
+        if proba.shape != (4, 3):
+            raise ValueError(f"predict_proba returned shape {proba.shape}, expected (4, 3)")
+        return loaded
+
+    def activate(self, version: int) -> bool:
+        started = time.perf_counter()
+        try:
+            loaded = self.load(version)
+        except Exception as e:
+            self.rejected.add(version)
+            model_load_failures.inc()
+            logger.error(f"[REGISTRY] Rejected model v{version}: {e}")
+            return False
+
+        with self._lock:
+            previous = self._install(loaded)
+            self._remember(previous)
+        model_swaps.labels(action="swap").inc()
+        self._publish_version()
+        logger.info(f"[REGISTRY] Live model v{version} (was {previous.version}) | "
+                    f"loaded in {time.perf_counter() - started:.2f}s | compiled={loaded.compiled is not None}")
+        return True
+
+    def rollback(self):
+        """
+        Reinstates the previously live model; the version rolled back from is not reloaded by poll().
+        Returns the version now live, or None when there is nothing to roll back to.
+        """
+        with self._lock:
+            if not self.history:
+                return None
+            current = self._install(self.history.pop())
+            if isinstance(current.version, int):
+                self.rejected.add(current.version)
+        model_swaps.labels(action="rollback").inc()
+        self._publish_version()
+        logger.warning(f"[REGISTRY] Rolled back from {current.version} to {self.ml_filter.active.version}")
+        return self.ml_filter.active.version
+
+    def _remember(self, previous):
+        if previous.model is not None:
+            self.history.append(previous)
+            del self.history[:-self.keep]
+
+    def _publish_version(self):
+        model_version.set(self.live_version if self.live_version is not None else -1)
+
+    def status(self) -> dict:
+        return {
+            "live_version": self.ml_filter.active.version,
+            "compiled": self.ml_filter.active.compiled is not None,
+            "available": list_versions(self.root),
+            "rollback_to": [m.version for m in reversed(self.history)],
+            "rejected": sorted(self.rejected)
+        }
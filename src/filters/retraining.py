@@ -0,0 +1,156 @@
+# /src/filters/retraining.py
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from filters.model_registry import publish_model
+from metrics.metrics import retrain_triggers, retrain_runs, retraining_active, retrain_duration
+from tools.train_ml_filter_combined import load_data, train_model
+
+logger = logging.getLogger("retraining")
+
+# Worker-process dataset cache: (path, size, mtime_ns) -> labelled DataFrame
+_datasets = {}
+
+
+def _limit_worker(niceness, cpus):
+    # Runs once in the worker: lower its priority and keep it off the trading loop's cores
+    if niceness:
+        os.nice(niceness)
+    if cpus and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+
+
+def _load_dataset(path):
+    """
+    Returns (DataFrame or None, cache hit). Reloads only when the file changes.
+    """
+    if not os.path.exists(path):
+        return None, False
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if key in _datasets:
+        return _datasets[key], True
+    df = load_data(path)
+    _datasets.clear()  # Keep only the newest dataset
+    if df is not None:
+        _datasets[key] = df
+    return df, False
+
+
+def run_training(data_path, registry_dir, feature_order):
+    """
+    Worker: trains train_ml_filter_combined's model on the live feature schema
+    and publishes it to the registry. Returns (version or None, seconds, dataset cache hit).
+    """
+    started = time.perf_counter()
+    df, cached = _load_dataset(data_path)
+    model = train_model(df, feature_cols=list(feature_order)) if df is not None else None
+    if model is None:
+        return None, time.perf_counter() - started, cached
+    version = publish_model(registry_dir, model, feature_order, source=data_path, rows=len(df))
+    return version, time.perf_counter() - started, cached
+
+
+class RetrainingService:
+    """
+    Drift-triggered retraining in a separate, long-lived worker process.
+
+    trigger() never blocks: it submits a run and returns. At most one run is in
+    flight, and triggers within `min_interval` seconds of the last start are
+    dropped (debounced). The worker runs at lower priority (`niceness`) and,
+    when `cpus` is given, pinned to those cores, so the trading loop keeps its
+    CPU. It keeps the last training dataset in memory between runs and
+    publishes each model to the registry, which loads and swaps it off the loop.
+
+    The worker is started once in start() and reused. Call start() while the
+    process is still single-threaded (before the metrics server, DB pool or
+    registry thread) so it can be forked cheaply; once other threads exist,
+    forking could copy a lock held by one of them, so a forkserver is used instead.
+    """
+
+    def __init__(self, registry=None, data_path="ml_model/data/features_triangular_labeled.csv",
+                 registry_dir="ml_model/registry", feature_order=None, min_interval=600.0, niceness=10, cpus=None):
+        self.registry = registry
+        self.data_path = data_path
+        self.registry_dir = registry_dir
+        self.feature_order = list(feature_order or registry.ml_filter.feature_order)
+        self.min_interval = min_interval
+        self.niceness = niceness
+        self.cpus = set(cpus) if cpus else None
+        self.runs = 0
+        self.last_version = None
+        self._pool = None
+        self._future = None
+        self._last_start = None
+
+    @property
+    def running(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def start(self):
+        if self._pool is None:
+            method = "fork" if threading.active_count() == 1 else "forkserver"
+            self._pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context(method),
+                                             initializer=_limit_worker, initargs=(self.niceness, self.cpus))
+            self._pool.submit(os.getpid).result()  # Start the worker now, not from a later trigger
+
+    def stop(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def trigger(self, reason: str = "") -> bool:
+        """
+        Requests a retraining run; returns True if one was started.
+        """
+        now = time.monotonic()
+        if self.running or (self._last_start is not None and now - self._last_start < self.min_interval):
+            retrain_triggers.labels(result="debounced").inc()
+            return False
+
+        self.start()
+        self._last_start = now
+        retrain_triggers.labels(result="started").inc()
+        retraining_active.set(1)
+        logger.warning(f"[RETRAINING] Started in worker process | {reason}")
+        self._future = self._pool.submit(run_training, self.data_path, self.registry_dir, self.feature_order)
+        self._future.add_done_callback(self._finished)
+        return True
+
+    def _finished(self, future):
+        # Runs on the executor's management thread
+        retraining_active.set(0)
+        self.runs += 1
+        if future.cancelled():
+            retrain_runs.labels(outcome="cancelled").inc()
+            return
+        try:
+            version, seconds, cached = future.result()
+        except Exception as e:
+            retrain_runs.labels(outcome="failed").inc()
+            logger.error(f"[RETRAINING] Run failed: {e}")
+            return
+
+        retrain_duration.set(seconds)
+        if version is None:
+            retrain_runs.labels(outcome="no_model").inc()
+            logger.warning(f"[RETRAINING] No model produced ({seconds:.1f}s)")
+            return
+        retrain_runs.labels(outcome="published").inc()
+        self.last_version = version
+        logger.info(f"[RETRAINING] Published v{version} in {seconds:.1f}s (dataset cached={cached})")
+        if self.registry is not None:
+            self.registry.wake()
+
+    def status(self) -> dict:
+        return {
+            "running": self.running,
+            "runs": self.runs,
+            "last_version": self.last_version,
+            "seconds_since_start": None if self._last_start is None else time.monotonic() - self._last_start
+        }
@@ -0,0 +1,233 @@
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from numba import njit
+
+
+@njit(cache=True)
+def _forest_kernel(X, roots, feature, threshold, left, right, missing, value, tree_output, out):
+    """
+    Sums the leaf values of every tree for each row of X into `out` (zeroed by the caller).
+    Internal nodes go left when x <= threshold and to `missing` when x is NaN.
+    """
+    n_outputs = value.shape[1]
+    for i in range(X.shape[0]):
+        for t in range(roots.shape[0]):
+            node = roots[t]
+            while feature[node] >= 0:
+                x = X[i, feature[node]]
+                if x != x:
+                    node = missing[node]
+                elif x <= threshold[node]:
+                    node = left[node]
+                else:
+                    node = right[node]
+            col = tree_output[t]
+            if col < 0:
+                for c in range(n_outputs):
+                    out[i, c] += value[node, c]
+            else:
+                out[i, col] += value[node, 0]
+
+
+class CompiledForest:
+    """
+    Tree ensemble flattened into packed node arrays and evaluated by a compiled
+    traversal, for single rows and small batches without sklearn/xgboost call overhead.
+
+    All trees share one set of arrays: feature (-1 on leaves), threshold,
+    left/right/missing child ids (absolute) and leaf values. Features are rounded
+    to float32 before comparison, as both sklearn and XGBoost do.
+    Built with from_model(); predict_proba() matches the source model's.
+    """
+
+    def __init__(self, roots, feature, threshold, left, right, missing, value, tree_output, link, classes,
+                 n_features, base_margin=0.0):
+        self.roots = np.ascontiguousarray(roots, dtype=np.int64)
+        self.feature = np.ascontiguousarray(feature, dtype=np.int64)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+        self.left = np.ascontiguousarray(left, dtype=np.int64)
+        self.right = np.ascontiguousarray(right, dtype=np.int64)
+        self.missing = np.ascontiguousarray(missing, dtype=np.int64)
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
+        self.tree_output = np.ascontiguousarray(tree_output, dtype=np.int64)
+        self.link = link  # "mean" (random forest), "softmax" or "sigmoid" (boosted margins)
+        self.classes = np.asarray(classes)
+        self.n_features = n_features
+        self.base_margin = base_margin
+        self.n_outputs = 1 if link == "sigmoid" else len(self.classes)
+
+    @classmethod
+    def from_model(cls, model):
+        """
+        Flattens a fitted sklearn forest classifier (RandomForest, ExtraTrees) or
+        an XGBoost classifier. Raises TypeError for anything else.
+        """
+        if hasattr(model, "get_booster"):
+            return cls._from_xgboost(model)
+        if hasattr(model, "estimators_") and hasattr(model, "classes_") and \
+                all(hasattr(est, "tree_") and hasattr(est, "classes_") for est in np.ravel(model.estimators_)):
+            return cls._from_sklearn_forest(model)
+        raise TypeError(f"Cannot compile {type(model).__name__}")
+
+    @classmethod
+    def _from_sklearn_forest(cls, model):
+        roots, feature, threshold, left, right, missing, value = [], [], [], [], [], [], []
+        offset = 0
+        for est in model.estimators_:
+            tree = est.tree_
+            leaf = tree.children_left < 0
+            roots.append(offset)
+            feature.append(np.where(leaf, -1, tree.feature))
+            threshold.append(tree.threshold)
+            left.append(np.where(leaf, -1, tree.children_left + offset))
+            right.append(np.where(leaf, -1, tree.children_right + offset))
+            go_left = getattr(tree, "missing_go_to_left", np.zeros(tree.node_count, dtype=bool)).astype(bool)
+            missing.append(np.where(leaf, -1, np.where(go_left, tree.children_left, tree.children_right) + offset))
+
+            # Per-tree class probabilities, normalised exactly as DecisionTreeClassifier.predict_proba
+            proba = tree.value[:, 0, :]
+            normalizer = proba.sum(axis=1)[:, None]
+            normalizer[normalizer == 0.0] = 1.0
+            value.append(proba / normalizer)
+            offset += tree.node_count
+
+        return cls(roots, np.concatenate(feature), np.concatenate(threshold), np.concatenate(left),
+                   np.concatenate(right), np.concatenate(missing), np.concatenate(value),
+                   np.full(len(roots), -1), "mean", model.classes_, model.n_features_in_)
+
+    @classmethod
+    def _from_xgboost(cls, model):
+        booster = model.get_booster()
+        config = json.loads(booster.save_config())
+        objective = config["learner"]["objective"]["name"]
+        n_classes = int(config["learner"]["learner_model_param"].get("num_class", 0)) or 2
+        base_score = float(config["learner"]["learner_model_param"]["base_score"])
+        names = booster.feature_names or []
+        index = {name: i for i, name in enumerate(names)}
+
+        if objective.startswith("multi:"):
+            link, base_margin = "softmax", base_score
+        elif objective == "binary:logistic":
+            link, base_margin = "sigmoid", math.log(base_score / (1.0 - base_score))
+        else:
+            raise TypeError(f"Cannot compile XGBoost objective {objective}")
+
+        roots, feature, threshold, left, right, missing, value, tree_output = [], [], [], [], [], [], [], []
+        for t, dump in enumerate(booster.get_dump(dump_format="json")):
+            offset = len(feature)
+            roots.append(offset)
+            tree_output.append(t % n_classes if link == "softmax" else 0)
+            nodes = {}
+            stack = [json.loads(dump)]
+            while stack:
+                node = stack.pop()
+                nodes[node["nodeid"]] = node
+                stack.extend(node.get("children", ()))
+            ids = {nid: offset + k for k, nid in enumerate(sorted(nodes))}
+            for nid in sorted(nodes):
+                node = nodes[nid]
+                if "leaf" in node:
+                    feature.append(-1)
+                    threshold.append(0.0)
+                    left.append(-1)
+                    right.append(-1)
+                    missing.append(-1)
+                    value.append(float(node["leaf"]))
+                    continue
+                split = node["split"]
+                feature.append(index[split] if split in index else int(split.lstrip("f")))
+                # XGBoost goes left on x < split in float32; on float32 inputs that is x <= the next float32 down
+                threshold.append(float(np.nextafter(np.float32(node["split_condition"]), np.float32(-np.inf))))
+                left.append(ids[node["yes"]])
+                right.append(ids[node["no"]])
+                missing.append(ids[node["missing"]])
+                value.append(0.0)
+
+        classes = getattr(model, "classes_", np.arange(n_classes))
+        return cls(roots, feature, threshold, left, right, missing, np.asarray(value)[:, None], tree_output, link,
+                   classes, model.n_features_in_, base_margin)
+
+    ARRAYS = ("roots", "feature", "threshold", "left", "right", "missing", "value", "tree_output", "classes")
+
+    def save(self, directory):
+        """
+        Writes the node arrays as .npy files (plus meta.json) into `directory`, for load().
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name in self.ARRAYS:
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name), allow_pickle=False)
+        meta = {"link": self.link, "n_features": int(self.n_features), "base_margin": float(self.base_margin)}
+        with open(os.path.join(directory, "meta.json"), "w") as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, directory, mmap_mode="r"):
+        """
+        Reads a save()d forest. With mmap_mode="r" the node arrays are read-only
+        views of the files' pages, shared by every process that maps them.
+        """
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode, allow_pickle=False)
+                  for name in cls.ARRAYS}
+        return cls(**arrays, **meta)
+
+    def predict_proba(self, X) -> np.ndarray:
+        """
+        Class probabilities for a 2D batch (or a single 1D row), shaped like sklearn's predict_proba.
+        """
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+        out = np.zeros((X.shape[0], self.n_outputs))
+        _forest_kernel(X, self.roots, self.feature, self.threshold, self.left, self.right, self.missing, self.value,
+                       self.tree_output, out)
+
+        if self.link == "mean":
+            return out / len(self.roots)
+        margin = out + self.base_margin
+        if self.link == "sigmoid":
+            p = 1.0 / (1.0 + np.exp(-margin))
+            return np.hstack([1.0 - p, p])
+        margin -= margin.max(axis=1, keepdims=True)
+        e = np.exp(margin)
+        return e / e.sum(axis=1, keepdims=True)
+
+    def probe_rows(self, n=512, seed=0) -> np.ndarray:
+        """
+        Rows built from the split thresholds themselves and their float32 neighbours,
+        so a fidelity check exercises every boundary the model can see.
+        """
+        rng = np.random.default_rng(seed)
+        X = np.zeros((n, self.n_features))
+        internal = self.feature >= 0
+        for f in range(self.n_features):
+            cuts = self.threshold[internal & (self.feature == f)].astype(np.float32)
+            cuts = cuts[np.isfinite(cuts)]
+            if not len(cuts):
+                continue
+            candidates = np.concatenate([cuts, np.nextafter(cuts, np.float32(np.inf)),
+                                         np.nextafter(cuts, np.float32(-np.inf))])
+            X[:, f] = rng.choice(candidates, size=n)
+        return X
+
+
+def fidelity_error(model, compiled: CompiledForest, X, feature_names=None) -> float:
+    """
+    Largest absolute difference between model.predict_proba and the compiled
+    forest on rows X (passed to the model as a DataFrame when it was fit on named columns).
+    """
+    X = np.asarray(X, dtype=np.float64)
+    names = getattr(model, "feature_names_in_", None)
+    if names is None:
+        names = feature_names
+    if names is not None:
+        X_model = pd.DataFrame(X, columns=list(names))
+    else:
+        X_model = X
+    return float(np.max(np.abs(np.asarray(model.predict_proba(X_model)) - compiled.predict_proba(X))))
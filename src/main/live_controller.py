@@ -5,8 +5,6 @@ import sys
 import time
 import asyncio
 import logging
-import subprocess
-import uvicorn
 from fastapi import FastAPI
 from fastapi.responses import Response, JSONResponse
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST, start_http_server
@@ -43,31 +41,52 @@ app.include_router(execution_controller.router)
 # ----------------------
 from metrics.metrics import (
     spread_gauge, volatility_gauge, imbalance_gauge, pnl_gauge,
-    heartbeat_gauge
+    heartbeat_gauge, leg_age_gauge, stale_features, arb_candidates,
+    model_precision_score, model_pnl_error
 )
 from data_pipeline.data_normalizer import DataNormalizer
 from feature_engineering.feature_engineer import FeatureEngineer
+from feature_engineering.triangle_engine import TriangleEngine, TriangleUniverse
 from strategy_core.signal_generator import SignalGenerator
-from filters.ml_filter import MLFilter, prediction_total, prediction_correct
+from strategy_core.arbitrage_scanner import ArbitrageScanner
+from filters.ml_filter import MLFilter
+from filters.inference_scheduler import InferenceScheduler
+from filters.model_registry import ModelRegistry
+from filters.retraining import RetrainingService
 from risk_manager.risk_manager import RiskManager
 from execution_layer.execution_router import ExecutionRouter
 from execution_layer.pnl_tracker import PnLTracker
 from data_pipeline.timescaledb_adapter import TimescaleDBAdapter
 from metrics.prometheus_scores import push_scores_to_prometheus
 from data_pipeline.binance_ingestor import BinanceIngestor
+from data_pipeline.frame_journal import FrameJournal
+from metrics import latency
+from messaging.message_bus import AsyncMessageBus, TRADES, BOOKS, FEATURES, SIGNALS, ORDERS
+from messaging.market_event import MarketEventBatch
 
 # ----------------------
 # Core Component Initialization
 # ----------------------
 normalizer = DataNormalizer()
 feature_engineer = FeatureEngineer()
+
+# Triangle universe scanned alongside the traded ETH/BTC triangle, e.g. XALGO_TRIANGLE_ASSETS=BTC,ETH,BNB,SOL
+triangle_assets = os.getenv("XALGO_TRIANGLE_ASSETS", "BTC,ETH").split(",")
+triangle_universe = TriangleUniverse.from_assets(triangle_assets)
+triangle_engine = TriangleEngine(triangle_universe)
+triangle_scores = {}  # Triangle name -> latest MLFilter result for its feature vector, served on /triangles
+
+# Cycles of any length over the same subscribed markets, from top-of-book quotes
+arbitrage_scanner = ArbitrageScanner()
+for base, quote in triangle_universe.markets:
+    arbitrage_scanner.add_market(f"{base}{quote}", base, quote)
 risk_manager = RiskManager()
 execution_router = ExecutionRouter()
 pnl_tracker = PnLTracker()
 
 try:
-    signal_generator = SignalGenerator()
     ml_filter = MLFilter()
+    signal_generator = SignalGenerator(ml_filter=ml_filter)  # One filter: its veto and the gate swap together
 except Exception as e:
     logger.warning(f"[MLFilter] Model initialization failed: {e}")
 
@@ -79,6 +98,33 @@ except Exception as e:
     signal_generator = DummySignalGenerator()
     ml_filter = None
 
+# Micro-batched ML scoring; a 0µs deadline batches only requests that are ready in the same loop turn
+inference = InferenceScheduler(
+    ml_filter,
+    max_batch=int(os.getenv("XALGO_INFERENCE_MAX_BATCH", 32)),
+    max_delay_us=float(os.getenv("XALGO_INFERENCE_MAX_DELAY_US", 0))
+) if ml_filter else None
+
+# Versioned artifacts published by the trainer; loaded, checked and swapped in off the event loop
+model_registry = ModelRegistry(
+    os.getenv("XALGO_MODEL_REGISTRY", "ml_model/registry"),
+    ml_filter,
+    poll_interval=float(os.getenv("XALGO_MODEL_POLL_SECONDS", 5))
+) if ml_filter else None
+if model_registry:
+    model_registry.attach(execution_controller.signal_gen.ml_filter)  # The /trade and /execute endpoints
+
+# Drift retraining in a low-priority worker process, e.g. XALGO_RETRAIN_CPUS=2,3 to keep it off the loop's core
+retrain_cpus = os.getenv("XALGO_RETRAIN_CPUS")
+retrainer = RetrainingService(
+    model_registry,
+    data_path=os.getenv("XALGO_RETRAIN_DATA", "ml_model/data/features_triangular_labeled.csv"),
+    registry_dir=os.getenv("XALGO_MODEL_REGISTRY", "ml_model/registry"),
+    min_interval=float(os.getenv("XALGO_RETRAIN_MIN_INTERVAL", 600)),
+    niceness=int(os.getenv("XALGO_RETRAIN_NICE", 10)),
+    cpus=[int(c) for c in retrain_cpus.split(",")] if retrain_cpus else None
+) if model_registry else None
+
 # ----------------------
 # Database Adapter
 # ----------------------
@@ -91,6 +137,27 @@ db_config = {
 }
 storage_adapter = TimescaleDBAdapter(db_config)
 
+# ----------------------
+# Message Bus (DB writes run off the signal path)
+# ----------------------
+bus = AsyncMessageBus()
+
+async def write_trades(events):
+    await storage_adapter.insert_trade_events(MarketEventBatch.from_events(events))
+
+async def write_orderbooks(events):
+    for event in events:
+        await storage_adapter.insert_orderbook_event(event)
+
+async def write_features(features):
+    for feature in features:
+        await storage_adapter.insert_feature_vector(feature)
+
+bus.subscribe(TRADES, write_trades, name="db_writer", batch_size=500)
+bus.subscribe(BOOKS, write_orderbooks, name="db_writer", batch_size=100)
+bus.subscribe(FEATURES, write_features, name="db_writer", batch_size=100)
+bus.subscribe(ORDERS, storage_adapter.insert_execution_order, name="db_writer")
+
 # ----------------------
 # Heartbeat Loop
 # ----------------------
@@ -102,29 +169,88 @@ async def heartbeat_loop():
         emit_heartbeat()
         await asyncio.sleep(1)
 
+# ----------------------
+# Drift Monitoring
+# ----------------------
+def drift_stats() -> dict:
+    # Plain counts from the live MLFilter; prometheus Counters don't support arithmetic
+    total = max(ml_filter.predictions, 1) if ml_filter else 1
+    correct = ml_filter.correct_predictions if ml_filter else 0
+    stats = {"precision": correct / total, "pnl_error": abs(pnl_tracker.get_total_pnl() / total)}
+    model_precision_score.set(stats["precision"])
+    model_pnl_error.set(stats["pnl_error"])
+    return stats
+
+# ----------------------
+# Triangle Screening
+# ----------------------
+def submit_triangle_screens(triangle_ids) -> list:
+    # Queued without waiting: they share one score_batch with each other and with the traded
+    # triangle's request, which process_event makes before it next yields
+    screens = []
+    for t in triangle_ids:
+        if triangle_engine.universe.triangles[t] == tuple(feature_engineer.triangle.legs):
+            continue  # Scored on the decision path
+        fv = triangle_engine.feature_vector(t)
+        if not fv["stale"]:
+            screens.append((fv["triangle"], inference.submit(fv)))
+    return screens
+
+async def record_triangle_screens(screens):
+    for name, future in screens:
+        try:
+            triangle_scores[name] = await future
+        except Exception as e:
+            logger.warning(f"[MLFilter] Triangle {name} not scored: {e}")
+
 # ----------------------
 # Core Event Processing Logic
 # ----------------------
 async def process_event(event):
+    decided = False
+    screens = []
     try:
         if event.event_type == 'trade':
-            await storage_adapter.insert_trade_event(event)
+            bus.publish(TRADES, event)
         elif event.event_type == 'orderbook':
-            await storage_adapter.insert_orderbook_event(event)
+            bus.publish(BOOKS, event)
+            for candidate in arbitrage_scanner.update(event):
+                arb_candidates.inc()
+                bus.publish(SIGNALS, candidate)
 
+        t = latency.start()
         feature = feature_engineer.update(event)
+        fresh = triangle_engine.update(event)
+        latency.observe(latency.FEATURES, t)
+
+        if inference:
+            screens = submit_triangle_screens(fresh)
+
         if feature:
-            await storage_adapter.insert_feature_vector(feature)
+            bus.publish(FEATURES, feature)
 
             spread_gauge.set(feature["spread"])
             volatility_gauge.set(feature["volatility"])
             imbalance_gauge.set(feature["imbalance"])
+            leg_age_gauge.set(feature["leg_age_ms"])
 
+            # A leg older than max_leg_age_ms makes the spread meaningless; skip the decision path
+            if feature["stale"]:
+                stale_features.inc()
+                return
+
+            decided = True
+            t = latency.start()
             signal = signal_generator.generate_signal(feature)
+            latency.observe(latency.SIGNAL, t)
+            if signal:
+                bus.publish(SIGNALS, signal)
 
             if signal and signal["decision"] != "HOLD":
-                if ml_filter:
-                    result = ml_filter.predict_with_confidence(feature)
+                if inference:
+                    t = latency.start()
+                    result = await inference.score(feature)
+                    latency.observe(latency.ML_FILTER, t)
                     confidence = result["confidence"]
                     prediction = result["signal"]
                     cointegration = 0.0  # Placeholder
@@ -139,10 +265,16 @@ async def process_event(event):
                 quantity_usd = 1000.0
                 slippage = 0.0005
 
-                if risk_manager.check_trade_permission(signal, quantity_usd, slippage):
+                t = latency.start()
+                permitted = risk_manager.check_trade_permission(signal, quantity_usd, slippage)
+                latency.observe(latency.RISK, t)
+
+                if permitted:
+                    t = latency.start()
                     order = execution_router.simulate_order_execution(signal, base_price, quantity_usd)
+                    latency.observe(latency.EXECUTION, t)
                     if order:
-                        await storage_adapter.insert_execution_order(order)
+                        bus.publish(ORDERS, order)
                         pnl_tracker.update_position(
                             symbol=order['pair'],
                             fill_price=order['filled_price'],
@@ -154,15 +286,20 @@ async def process_event(event):
                         pnl_gauge.set(risk_manager.daily_pnl)
 
                         # 🔁 Runtime Drift Detection + Retraining Trigger
-                        model_precision = prediction_correct / max(prediction_total, 1)
-                        model_pnl_error = abs(pnl_tracker.get_total_pnl() / max(prediction_total, 1))
-
-                        if model_precision < 0.55 or model_pnl_error > 0.002:
-                            logger.warning(f"[RETRAINING] Model drift detected — precision={model_precision:.2f}, pnl_error={model_pnl_error:.6f}")
-                            subprocess.run(["python", "src/tools/train_ml_filter_combined.py"])
+                        drift = drift_stats()
+                        if (drift["precision"] < 0.55 or drift["pnl_error"] > 0.002) and retrainer:
+                            # Debounced; training and the model swap both happen off the event loop
+                            retrainer.trigger(f"precision={drift['precision']:.2f}, pnl_error={drift['pnl_error']:.6f}")
 
     except Exception as e:
         logger.error(f"[LIVE_CONTROLLER] Event processing failed: {e}")
+    finally:
+        if screens:
+            await record_triangle_screens(screens)
+        if decided:
+            latency.observe_since_wall(latency.TICK_TO_DECISION, event.recv_ns)
+            if retrainer and retrainer.running:
+                latency.observe_since_wall(latency.TICK_TO_DECISION_RETRAINING, event.recv_ns)
 
 # ----------------------
 # Startup Routine
@@ -170,9 +307,19 @@ async def process_event(event):
 async def start_pipeline():
     logger.info("[XALGO] Bootstrapping components...")
     await storage_adapter.init_pool()
+    await bus.start()
+    if retrainer:
+        retrainer.start()  # No-op when __main__ already started it
+    if model_registry:
+        model_registry.start()
+
+    # Record raw frames for deterministic replay when a journal directory is configured
+    journal_dir = os.getenv("XALGO_JOURNAL_DIR")
+    journal = FrameJournal(journal_dir) if journal_dir else None
 
     # Run ingestor and heartbeat concurrently
-    ingestor = BinanceIngestor(process_event_func=process_event)
+    ingestor = BinanceIngestor(process_event_func=process_event, journal=journal,
+                               pairs=sorted(set(triangle_universe.symbols) | set(feature_engineer.triangle.legs)))
     await asyncio.gather(
         ingestor.connect_and_listen(),
         heartbeat_loop()
@@ -189,12 +336,22 @@ def metrics():
 def get_pnl():
     return pnl_tracker.summary()
 
+@app.get("/triangles")
+def triangles():
+    return JSONResponse([dict(fv, ml=triangle_scores.get(fv["triangle"])) for fv in triangle_engine.snapshot()])
+
+@app.get("/model")
+def model_status():
+    return JSONResponse(model_registry.status() if model_registry else {"live_version": None})
+
+@app.post("/model/rollback")
+def model_rollback():
+    version = model_registry.rollback() if model_registry else None
+    return JSONResponse({"rolled_back": version is not None, "live_version": version})
+
 @app.get("/drift")
 def model_drift_status():
-    return JSONResponse({
-        "precision": prediction_correct / max(prediction_total, 1),
-        "pnl_error": abs(pnl_tracker.get_total_pnl() / max(prediction_total, 1))
-    })
+    return JSONResponse(dict(drift_stats(), retraining=retrainer.status() if retrainer else None))
 
 @app.on_event("startup")
 async def list_routes():
@@ -207,6 +364,9 @@ async def list_routes():
 # Entrypoint
 # ----------------------
 if __name__ == "__main__":
+    import uvicorn
+    if retrainer:
+        retrainer.start()  # Fork the training worker while this is still the only thread
     start_http_server(9100)
     asyncio.run(start_pipeline())
     uvicorn.run(app, host="0.0.0.0", port=9100)
@@ -23,9 +23,9 @@ logging.basicConfig(
 
 # Core pipeline components
 engineer = FeatureEngineer()
-signal_gen = SignalGenerator()
-executor = BinanceExecutor()
 ml_filter = MLFilter()
+signal_gen = SignalGenerator(ml_filter=ml_filter)
+executor = BinanceExecutor()
 
 # Virtual account for paper trading
 virtual_balance_usd = 50.0
@@ -1,21 +1,125 @@
 # /src/messaging/market_event.py
 
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timedelta
+
+import numpy as np
+
+_EPOCH = datetime(1970, 1, 1)
+
+SIDE_CODES = {"buy": 1, "sell": -1, None: 0}
+SIDE_NAMES = {1: "buy", -1: "sell", 0: None}
+
+
+def ns_to_datetime(ts):
+    """
+    Convert an epoch-nanosecond timestamp to a naive UTC datetime (for the DB layer).
+    Datetimes are passed through unchanged.
+    """
+    if isinstance(ts, datetime) or ts is None:
+        return ts
+    return _EPOCH + timedelta(microseconds=int(ts) // 1000)
+
+
+def datetime_to_ns(dt: datetime) -> int:
+    return (dt - _EPOCH) // timedelta(microseconds=1) * 1000
+
 
-@dataclass
 class MarketEvent:
-    event_type: str                   # e.g. 'trade' or 'orderbook'
-    timestamp: datetime
-    exchange: str
-    pair: str
-
-    # Optional for trade events
-    price: Optional[float] = None
-    quantity: Optional[float] = None
-    side: Optional[str] = None       # 'buy' or 'sell'
-
-    # Optional for orderbook events
-    bids: Optional[str] = None       # JSON or stringified depth data
-    asks: Optional[str] = None
+    """
+    Compact market event (trade or orderbook) shared by the whole pipeline.
+
+    `timestamp` is the exchange event time in int64 epoch nanoseconds. For
+    orderbook events bids/asks hold the top levels as [price, qty] floats and
+    `book` references the live local OrderBook when one is maintained.
+    """
+
+    __slots__ = ("event_type", "timestamp", "exchange", "pair", "price", "quantity",
+                 "side", "bids", "asks", "book", "recv_ns")
+
+    def __init__(self, event_type, timestamp, exchange, pair, price=None, quantity=None,
+                 side=None, bids=None, asks=None, book=None, recv_ns=None):
+        self.event_type = event_type  # 'trade' or 'orderbook'
+        self.timestamp = timestamp
+        self.exchange = exchange
+        self.pair = pair
+        self.price = price
+        self.quantity = quantity
+        self.side = side  # 'buy' or 'sell'
+        self.bids = bids
+        self.asks = asks
+        self.book = book
+        self.recv_ns = recv_ns  # Local socket receive time (epoch ns), for latency tracking
+
+    def to_datetime(self):
+        return ns_to_datetime(self.timestamp)
+
+    def to_dict(self):
+        return {
+            "timestamp": self.timestamp,
+            "exchange": self.exchange,
+            "event_type": self.event_type,
+            "pair": self.pair,
+            "price": self.price,
+            "quantity": self.quantity,
+            "side": self.side,
+            "bids": self.bids,
+            "asks": self.asks
+        }
+
+    def __repr__(self):
+        return f"<MarketEvent {self.event_type} {self.pair} @ {self.timestamp} | {self.price} x {self.quantity}>"
+
+
+class MarketEventBatch:
+    """
+    Many trade events held as parallel NumPy arrays for batch work
+    (replay, feature backfills, bulk DB inserts).
+
+    side is encoded as int8: 1 = buy, -1 = sell, 0 = unknown.
+    """
+
+    __slots__ = ("timestamp", "pair", "price", "quantity", "side", "exchange", "event_type")
+
+    def __init__(self, timestamp, pair, price, quantity, side=None, exchange="binance", event_type="trade"):
+        self.timestamp = np.asarray(timestamp, dtype=np.int64)
+        self.pair = np.asarray(pair)
+        self.price = np.asarray(price, dtype=np.float64)
+        self.quantity = np.asarray(quantity, dtype=np.float64)
+        self.side = (np.zeros(len(self.timestamp), dtype=np.int8) if side is None
+                     else np.asarray(side, dtype=np.int8))
+        self.exchange = exchange
+        self.event_type = event_type
+
+    def __len__(self):
+        return len(self.timestamp)
+
+    def __iter__(self):
+        return self.to_events()
+
+    @classmethod
+    def from_events(cls, events):
+        events = list(events)
+        exchange = events[0].exchange if events else "binance"
+        return cls(
+            timestamp=np.fromiter((e.timestamp for e in events), dtype=np.int64, count=len(events)),
+            pair=np.array([e.pair for e in events]),
+            price=np.fromiter((e.price for e in events), dtype=np.float64, count=len(events)),
+            quantity=np.fromiter((e.quantity for e in events), dtype=np.float64, count=len(events)),
+            side=np.fromiter((SIDE_CODES.get(e.side, 0) for e in events), dtype=np.int8, count=len(events)),
+            exchange=exchange
+        )
+
+    def to_events(self):
+        for ts, pair, price, qty, side in zip(self.timestamp.tolist(), self.pair.tolist(), self.price.tolist(),
+                                              self.quantity.tolist(), self.side.tolist()):
+            yield MarketEvent(self.event_type, ts, self.exchange, pair, price, qty, SIDE_NAMES[side])
+
+    def select(self, mask):
+        """
+        Returns a new batch with rows selected by a boolean mask or index array.
+        """
+        return MarketEventBatch(self.timestamp[mask], self.pair[mask], self.price[mask], self.quantity[mask],
+                                self.side[mask], self.exchange, self.event_type)
+
+    def for_pair(self, pair: str):
+        return self.select(self.pair == pair)
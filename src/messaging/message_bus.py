@@ -1,8 +1,37 @@
 # /src/messaging/message_bus.py
 
+import asyncio
+import inspect
+import logging
+import time
+from collections import deque
 from typing import Callable, List
 
+from metrics.metrics import bus_published, bus_consumed, bus_dropped, bus_queue_depth, bus_queue_lag
+
+logger = logging.getLogger("message_bus")
+
+# Pipeline topics
+TRADES = "trades"
+BOOKS = "books"
+FEATURES = "features"
+SIGNALS = "signals"
+ORDERS = "orders"
+
+# Subscriber queue overflow policies
+DROP_OLDEST = "drop_oldest"  # Full queue discards its oldest message; the publisher never waits
+UNBOUNDED = "unbounded"      # Nothing is dropped; maxsize only triggers a warning
+OVERFLOW_POLICIES = (DROP_OLDEST, UNBOUNDED)
+
+# Topics whose messages must never be dropped (execution records)
+LOSSLESS_TOPICS = {ORDERS}
+
+
 class MessageBus:
+    """
+    Minimal synchronous fan-out bus (no topics). Kept for simple scripts.
+    """
+
     def __init__(self):
         self.subscribers: List[Callable] = []
 
@@ -12,3 +41,174 @@ class MessageBus:
     def publish(self, event):
         for callback in self.subscribers:
             callback(event)
+
+
+class Subscription:
+    """
+    One subscriber on one topic, with its own queue and consumer task.
+
+    With the drop_oldest policy the queue is bounded: when full the oldest
+    message is dropped, so a slow consumer only ever loses its own backlog and
+    never blocks the publisher. With unbounded nothing is dropped and the queue
+    may grow past `maxsize` (logged). Lossless topics (ORDERS) are always unbounded.
+    """
+
+    def __init__(self, topic: str, handler: Callable, name: str, maxsize: int, batch_size: int,
+                 overflow: str = None):
+        if overflow is None:
+            overflow = UNBOUNDED if topic in LOSSLESS_TOPICS else DROP_OLDEST
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow}', expected one of {OVERFLOW_POLICIES}")
+        if topic in LOSSLESS_TOPICS and overflow != UNBOUNDED:
+            raise ValueError(f"Messages on '{topic}' must never be dropped; use overflow='{UNBOUNDED}'")
+        self.topic = topic
+        self.handler = handler
+        self.name = name
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.overflow = overflow
+        self.is_async = inspect.iscoroutinefunction(handler)
+        self.queue = deque()
+        self.dropped = 0
+        self.consumed = 0
+        self.in_flight = 0  # Messages handed to the handler and not yet finished
+        self._depth = bus_queue_depth.labels(topic=topic, subscriber=name)
+        self._ready = asyncio.Event()
+        self._task = None
+
+    def offer(self, message):
+        if len(self.queue) >= self.maxsize:
+            if self.overflow == DROP_OLDEST:
+                self.queue.popleft()
+                self.dropped += 1
+                bus_dropped.labels(topic=self.topic, subscriber=self.name).inc()
+            elif len(self.queue) == self.maxsize:
+                logger.warning(f"[BUS] Subscriber '{self.name}' on '{self.topic}' backlog passed {self.maxsize}")
+        self.queue.append((time.perf_counter(), message))
+        self._depth.set(len(self.queue))
+        self._ready.set()
+
+    async def run(self):
+        labels = {"topic": self.topic, "subscriber": self.name}
+        while True:
+            if not self.queue:
+                self._ready.clear()
+                await self._ready.wait()
+
+            n = min(self.batch_size, len(self.queue))
+            items = [self.queue.popleft() for _ in range(n)]
+            bus_queue_lag.labels(**labels).set(time.perf_counter() - items[0][0])
+            self._depth.set(len(self.queue))
+
+            payload = [msg for _, msg in items] if self.batch_size > 1 else items[0][1]
+            self.in_flight = n
+            try:
+                result = self.handler(payload)
+                if self.is_async:
+                    await result
+            except Exception as e:
+                logger.exception(f"[BUS] Subscriber '{self.name}' on '{self.topic}' failed: {e}")
+            finally:
+                self.in_flight = 0
+
+            self.consumed += n
+            bus_consumed.labels(**labels).inc(n)
+            await asyncio.sleep(0)  # Let other subscribers run between batches
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+class AsyncMessageBus:
+    """
+    Topic-based asyncio message bus.
+
+    publish() is synchronous and never waits: each subscriber has its own queue
+    (bounded, except on lossless topics; see Subscription) and consumer task, so
+    a slow subscriber (e.g. the DB writer) cannot hold up the signal path. Subscribers may take batches (batch_size > 1), in which
+    case the handler receives a list of messages.
+    """
+
+    def __init__(self, default_maxsize: int = 10000):
+        self.default_maxsize = default_maxsize
+        self.topics = {}
+        self._started = False
+
+    def subscribe(self, topic: str, handler: Callable, name: str = None,
+                  maxsize: int = None, batch_size: int = 1, overflow: str = None) -> Subscription:
+        """
+        `overflow` is the subscriber's queue policy (drop_oldest or unbounded); by
+        default unbounded on lossless topics (ORDERS) and drop_oldest elsewhere.
+        """
+        sub = Subscription(
+            topic=topic,
+            handler=handler,
+            name=name or getattr(handler, "__name__", "subscriber"),
+            maxsize=maxsize or self.default_maxsize,
+            batch_size=batch_size,
+            overflow=overflow
+        )
+        self.topics.setdefault(topic, []).append(sub)
+        if self._started:
+            sub.start()
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        subs = self.topics.get(sub.topic, [])
+        if sub in subs:
+            subs.remove(sub)
+        if sub._task is not None:
+            sub._task.cancel()
+            sub._task = None
+
+    def publish(self, topic: str, message) -> int:
+        """
+        Enqueue a message for every subscriber of `topic`; returns the fan-out count.
+        """
+        subs = self.topics.get(topic)
+        bus_published.labels(topic=topic).inc()
+        if not subs:
+            return 0
+        for sub in subs:
+            sub.offer(message)
+        return len(subs)
+
+    async def start(self):
+        self._started = True
+        for subs in self.topics.values():
+            for sub in subs:
+                sub.start()
+
+    async def stop(self):
+        self._started = False
+        for subs in self.topics.values():
+            for sub in subs:
+                await sub.stop()
+
+    async def drain(self, timeout: float = 5.0):
+        """
+        Wait until every subscriber queue is empty and its handler idle (used at shutdown and in tests).
+        """
+        deadline = time.perf_counter() + timeout
+        while any(sub.queue or sub.in_flight for subs in self.topics.values() for sub in subs):
+            if time.perf_counter() > deadline:
+                return False
+            await asyncio.sleep(0.001)
+        return True
+
+    def stats(self) -> dict:
+        return {
+            topic: {sub.name: {"depth": len(sub.queue), "consumed": sub.consumed, "dropped": sub.dropped}
+                    for sub in subs}
+            for topic, subs in self.topics.items()
+        }
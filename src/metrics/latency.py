@@ -0,0 +1,74 @@
+# /src/metrics/latency.py
+
+import os
+import time
+
+from prometheus_client import Histogram
+
+# Set XALGO_LATENCY_METRICS=0 to take all stage timing off the hot path
+ENABLED = os.getenv("XALGO_LATENCY_METRICS", "1") != "0"
+
+# Pipeline stages, in tick order
+EXCHANGE_TO_RECEIVE = "exchange_to_receive"   # exchange E/T time -> socket receive (wall clock)
+NORMALIZE = "normalize"                       # frame decode / normalization
+INGEST_QUEUE = "ingest_queue"                 # receive -> processing start
+FEATURES = "features"                         # FeatureEngineer.update
+SIGNAL = "signal"                             # SignalGenerator.generate_signal
+ML_FILTER = "ml_filter"                       # MLFilter.predict_with_confidence
+RISK = "risk"                                 # RiskManager.check_trade_permission
+EXECUTION = "execution"                       # ExecutionRouter order simulation / routing
+TICK_TO_DECISION = "tick_to_decision"         # socket receive -> order decision
+TICK_TO_DECISION_RETRAINING = "tick_to_decision_retraining"  # same, only while a retraining run is active
+
+STAGES = (EXCHANGE_TO_RECEIVE, NORMALIZE, INGEST_QUEUE, FEATURES, SIGNAL, ML_FILTER, RISK, EXECUTION,
+          TICK_TO_DECISION, TICK_TO_DECISION_RETRAINING)
+
+# 10µs .. 2.5s, roughly x2.5 per bucket
+BUCKETS = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2,
+           0.1, 0.25, 0.5, 1.0, 2.5)
+
+stage_latency = Histogram(
+    "xalgo_stage_latency_seconds",
+    "Per-stage latency from exchange event time to order decision",
+    ["stage"],
+    buckets=BUCKETS
+)
+
+# Pre-bound children so observe() skips the label lookup
+_children = {stage: stage_latency.labels(stage=stage) for stage in STAGES}
+
+_perf_ns = time.perf_counter_ns
+_wall_ns = time.time_ns
+
+
+def set_enabled(enabled: bool):
+    global ENABLED
+    ENABLED = enabled
+
+
+def start() -> int:
+    """
+    Monotonic start mark for a stage; 0 when timing is disabled.
+    """
+    return _perf_ns() if ENABLED else 0
+
+
+def observe(stage: str, start_ns: int):
+    """
+    Record the time elapsed since `start_ns` (from start()) for `stage`.
+    """
+    if ENABLED and start_ns:
+        _children[stage].observe((_perf_ns() - start_ns) * 1e-9)
+
+
+def observe_since_wall(stage: str, wall_ns):
+    """
+    Record wall-clock time elapsed since an epoch-ns timestamp (exchange or receive time).
+    """
+    if ENABLED and wall_ns:
+        _children[stage].observe(max(_wall_ns() - wall_ns, 0) * 1e-9)
+
+
+def observe_between(stage: str, from_wall_ns, to_wall_ns):
+    if ENABLED and from_wall_ns and to_wall_ns:
+        _children[stage].observe(max(to_wall_ns - from_wall_ns, 0) * 1e-9)
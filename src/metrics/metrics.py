@@ -1,22 +1,49 @@
 # /metrics/metrics.py
 
-from prometheus_client import Gauge, Counter
+from prometheus_client import Gauge, Counter, Histogram
 
 # 🔄 Live Market Metrics
 spread_gauge = Gauge('xalgo_latest_spread', 'Latest spread value between ETH and BTC')
 volatility_gauge = Gauge('xalgo_latest_volatility', 'Estimated market volatility')
 imbalance_gauge = Gauge('xalgo_latest_imbalance', 'Current orderbook imbalance')
 pnl_gauge = Gauge('xalgo_daily_pnl', 'Daily cumulative PnL (USD)')
+heartbeat_gauge = Gauge('xalgo_heartbeat_timestamp', 'Unix time of the live controller\'s last heartbeat')
+leg_age_gauge = Gauge('xalgo_triangle_leg_age_ms', 'Age of the oldest triangle leg at the newest tick (ms)')
+stale_features = Counter('xalgo_stale_feature_vectors_total', 'Feature vectors skipped because a triangle leg was stale')
 
 # 📈 Model Metrics
 confidence_score = Gauge('xalgo_latest_confidence_score', 'Confidence score from trained ML model')
 anomaly_score = Gauge('xalgo_anomaly_score', 'Market anomaly detection score')
 cointegration_stability_score = Gauge('xalgo_cointegration_stability_score', 'Kalman filter spread stability score')
+model_version = Gauge("xalgo_model_version", "Registry version of the live ML model (-1 when not from the registry)")
+model_swaps = Counter("xalgo_model_swaps_total", "Live ML model swaps", ["action"])
+model_load_failures = Counter("xalgo_model_load_failures_total", "Registry artifacts rejected at load, schema check or warm-up")
+inference_batch_size = Histogram("xalgo_inference_batch_size", "Feature vectors scored per micro-batch",
+                                 buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256))
+inference_queue_delay = Histogram("xalgo_inference_queue_delay_seconds", "Time a scoring request waited for its micro-batch",
+                                  buckets=(1e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 1e-2))
 
 # 📊 Drift Monitoring
 model_precision_score = Gauge("xalgo_model_precision", "Model precision on live trades")
 model_pnl_error = Gauge("xalgo_model_pnl_error", "Absolute PnL error on ML predictions")
+retrain_triggers = Counter("xalgo_retrain_triggers_total", "Drift retraining triggers", ["result"])
+retrain_runs = Counter("xalgo_retrain_runs_total", "Finished retraining runs", ["outcome"])
+retraining_active = Gauge("xalgo_retraining_active", "1 while a retraining run is in progress")
+retrain_duration = Gauge("xalgo_retrain_last_duration_seconds", "Wall time of the last retraining run")
 
 # 📉 Execution Metrics
 hedge_activations = Counter("xalgo_hedge_trades", "Number of emergency hedge trades executed")
 successful_cycles = Counter("xalgo_successful_cycles", "Full triangle trades completed successfully")
+arb_candidates = Counter("xalgo_arbitrage_candidates_total", "Profitable conversion cycles found by the graph scanner")
+
+# 📥 Ingestion Metrics
+ingest_queue_depth = Gauge("xalgo_ingest_queue_depth", "Events waiting between websocket reader and processing")
+ingest_dropped = Counter("xalgo_ingest_dropped_total", "Events dropped by the ingest queue overflow policy", ["policy"])
+ingest_conflated = Counter("xalgo_ingest_conflated_total", "Order book events replaced by a newer update for the same pair")
+
+# 🚌 Message Bus Metrics
+bus_published = Counter("xalgo_bus_published_total", "Messages published per topic", ["topic"])
+bus_consumed = Counter("xalgo_bus_consumed_total", "Messages consumed per topic and subscriber", ["topic", "subscriber"])
+bus_dropped = Counter("xalgo_bus_dropped_total", "Messages dropped from a full subscriber queue", ["topic", "subscriber"])
+bus_queue_depth = Gauge("xalgo_bus_queue_depth", "Messages waiting in a subscriber queue", ["topic", "subscriber"])
+bus_queue_lag = Gauge("xalgo_bus_queue_lag_seconds", "Time the last consumed batch waited in the subscriber queue", ["topic", "subscriber"])
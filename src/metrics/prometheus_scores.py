@@ -12,7 +12,7 @@ cointegration_score_gauge = Gauge(
     "mlfilter_cointegration_score", "Triangle cointegration stability"
 )
 anomaly_score_gauge = Gauge(
-    "mlfilter_anomaly_score", "Anomaly score from Isolation Forest"
+    "mlfilter_anomaly_score", "Anomaly score from the streaming anomaly detector"
 )
 composite_score_gauge = Gauge(
     "mlfilter_composite_score", "Final composite signal score"
@@ -0,0 +1,159 @@
+import numpy as np
+
+from utils.ring_buffer import RingBuffer
+
+from numba import njit
+
+
+@njit(cache=True)
+def _fill_mass(U, split_feature, split_value, depth, mass):
+    # Mass profile: how many rows of U pass through each node of each tree
+    mass[:] = 0
+    for i in range(U.shape[0]):
+        for t in range(split_feature.shape[0]):
+            node = 0
+            mass[t, 0] += 1
+            for _ in range(depth):
+                if U[i, split_feature[t, node]] < split_value[t, node]:
+                    node = 2 * node + 1
+                else:
+                    node = 2 * node + 2
+                mass[t, node] += 1
+
+
+@njit(cache=True)
+def _mass_scores(U, split_feature, split_value, depth, mass, size_limit, exclude, out):
+    # Half-space tree score: descend while the node holds more than size_limit
+    # reference rows, then add that node's mass scaled by 2^depth. Low = sparse region.
+    # exclude=1 scores rows that are themselves in the mass profile, as if left out of it.
+    for i in range(U.shape[0]):
+        total = 0.0
+        for t in range(split_feature.shape[0]):
+            node = 0
+            k = 0
+            while k < depth and mass[t, node] - exclude > size_limit:
+                if U[i, split_feature[t, node]] < split_value[t, node]:
+                    node = 2 * node + 1
+                else:
+                    node = 2 * node + 2
+                k += 1
+            total += (mass[t, node] - exclude) * 2.0 ** k
+        out[i] = total
+
+
+class HalfSpaceTrees:
+    """
+    Streaming anomaly detector (Tan, Ting & Liu, "Fast Anomaly Detection for
+    Streaming Data", 2011) over fixed-width feature rows.
+
+    The trees are random, full binary splits of the feature space drawn once at
+    construction, so learning never refits anything: it only counts how many of
+    the last `window` rows fall in each node (the reference mass profile),
+    recounted every `rebuild_every` rows (default window / 4). Rows are
+    standardised with the reference window's mean and std and mapped to [0, 1]
+    (+-`z_range` std), so features of any scale can be mixed.
+
+    update(row) costs O(n_trees * depth) to score; each rebuild costs
+    O(window * n_trees * depth), i.e. O(n_trees * depth * window / rebuild_every)
+    per row amortised.
+
+    Scores are in [0, 1]: the fraction of the reference window whose rows sit in
+    denser regions than this one (each reference row scored as if left out).
+    In-distribution rows spread roughly uniformly over [0, 1]; 1.0 means sparser
+    than every reference row.
+    """
+
+    def __init__(self, n_features: int, n_trees: int = 25, depth: int = 10, window: int = 200,
+                 rebuild_every: int = None, size_limit: float = None, z_range: float = 4.0, seed: int = 42):
+        self.n_features = n_features
+        self.n_trees = n_trees
+        self.depth = depth
+        self.window = window
+        self.rebuild_every = max(window // 4, 1) if rebuild_every is None else rebuild_every
+        self.size_limit = 0.1 * window if size_limit is None else size_limit
+        self.z_range = z_range
+
+        rng = np.random.default_rng(seed)
+        n_internal = 2 ** depth - 1
+        self.split_feature = np.zeros((n_trees, n_internal), dtype=np.int64)
+        self.split_value = np.zeros((n_trees, n_internal))
+        for t in range(n_trees):
+            # Each tree works on a randomly shifted range at least as wide as [0, 1]
+            s = rng.random(n_features)
+            half = 2.0 * np.maximum(s, 1.0 - s)
+            self._build(t, 0, s - half, s + half, rng)
+        self.mass = np.zeros((n_trees, 2 ** (depth + 1) - 1), dtype=np.int64)
+
+        self.rows = RingBuffer(window, width=n_features)
+        self.mean = np.zeros(n_features)
+        self.scale = np.ones(n_features)
+        self.reference = None  # Sorted mass scores of the reference window; None while warming up
+        self._since_rebuild = 0
+
+    def _build(self, t, node, low, high, rng):
+        if node >= self.split_feature.shape[1]:
+            return
+        q = rng.integers(self.n_features)
+        mid = (low[q] + high[q]) / 2.0
+        self.split_feature[t, node] = q
+        self.split_value[t, node] = mid
+        left_high, right_low = high.copy(), low.copy()
+        left_high[q] = right_low[q] = mid
+        self._build(t, 2 * node + 1, low, left_high, rng)
+        self._build(t, 2 * node + 2, right_low, high, rng)
+
+    @property
+    def ready(self) -> bool:
+        return self.reference is not None
+
+    def _unit(self, X) -> np.ndarray:
+        z = (np.asarray(X, dtype=np.float64).reshape(-1, self.n_features) - self.mean) / self.scale
+        return np.clip(0.5 + z / (2.0 * self.z_range), 0.0, 1.0)
+
+    def _mass_scores(self, U, exclude=0) -> np.ndarray:
+        out = np.empty(U.shape[0])
+        _mass_scores(U, self.split_feature, self.split_value, self.depth, self.mass, self.size_limit, exclude, out)
+        return out
+
+    def _rebuild(self):
+        X = self.rows.view()
+        self.mean = X.mean(axis=0)
+        std = X.std(axis=0)
+        self.scale = np.where(std > 0, std, 1.0)
+        U = self._unit(X)
+        _fill_mass(U, self.split_feature, self.split_value, self.depth, self.mass)
+        self.reference = np.sort(self._mass_scores(U, exclude=1))
+        self._since_rebuild = 0
+
+    def score(self, X) -> np.ndarray:
+        """
+        Anomaly scores in [0, 1] for rows X against the current reference window, without learning them.
+        """
+        if self.reference is None:
+            raise RuntimeError("HalfSpaceTrees needs one full window before it can score")
+        s = self._mass_scores(self._unit(X))
+        denser = len(self.reference) - np.searchsorted(self.reference, s, side="right")
+        return denser / len(self.reference)
+
+    def update(self, row):
+        """
+        Learns one row and returns its anomaly score, or None until the first window is full.
+        """
+        self.rows.push(row)
+        self._since_rebuild += 1
+        if len(self.rows) == self.window and (self.reference is None or self._since_rebuild >= self.rebuild_every):
+            self._rebuild()
+        if self.reference is None:
+            return None
+        return float(self.score(row)[0])
+
+    def run(self, X) -> np.ndarray:
+        """
+        update() over the rows of X; NaN where update() would return None.
+        """
+        out = np.full(len(X), np.nan)
+        for i, row in enumerate(np.asarray(X, dtype=np.float64)):
+            score = self.update(row)
+            if score is not None:
+                out[i] = score
+        return out
@@ -1,13 +1,21 @@
 import numpy as np
-from sklearn.ensemble import IsolationForest
-from collections import deque
+
+from scoring.half_space_trees import HalfSpaceTrees
+from utils.ring_buffer import RingBuffer
 
 # Rolling buffer for residuals
-residual_buffer = deque(maxlen=200)
+residual_buffer = RingBuffer(200)
+
+# Streaming anomaly model over (spread, spread_zscore, volatility, imbalance), reference window of 200 ticks
+anomaly_model = HalfSpaceTrees(n_features=4, window=200, seed=42)
 
-# Basic anomaly model (can be extended to batch training)
-anomaly_model = IsolationForest(n_estimators=100, contamination=0.05, random_state=42)
-anomaly_window = deque(maxlen=200)
+# The half-space tree percentile p is ~uniform on [0, 1] for normal ticks (mean ~0.5-0.65), while the
+# per-tick IsolationForest refit it replaced scored them at 0.8-1.0 (mean ~0.90). Composite scores use
+# 0.2 * (1 - anomaly), so the raw percentile would add ~0.06-0.1 to every composite and loosen the
+# composite_score > 0.8 gate. p is mapped onto the old score's range instead: replayed ticks fit
+# old ~= 0.79 + 0.18 p, and ANOMALY_FLOOR + ANOMALY_RANGE * p keeps that level while still reaching 1.0.
+ANOMALY_FLOOR = 0.78
+ANOMALY_RANGE = 0.22
 
 def compute_cointegration_score(features: dict) -> float:
     """
@@ -27,7 +35,7 @@ def compute_cointegration_score(features: dict) -> float:
         if len(residual_buffer) < residual_buffer.maxlen:
             return 0.5  # warming up
 
-        std_residual = np.std(residual_buffer)
+        std_residual = residual_buffer.std()
         return float(np.clip(1 - std_residual * 100, 0.0, 1.0))
 
     except Exception:
@@ -35,25 +43,20 @@ def compute_cointegration_score(features: dict) -> float:
 
 def compute_anomaly_score(features: dict) -> float:
     """
-    Applies IsolationForest to detect rare/abnormal feature vectors.
-    Returns a score between 0.0 (normal) to 1.0 (highly anomalous).
+    Scores rare/abnormal feature vectors with streaming half-space trees.
+    Returns a score between ANOMALY_FLOOR (normal) and 1.0 (highly anomalous), linear
+    in the fraction of the last 200-tick reference window lying in denser regions than this vector.
     """
     try:
-        vector = np.array([
+        score = anomaly_model.update((
             features.get("spread", 0.0),
             features.get("spread_zscore", 0.0),
             features.get("volatility", 0.0),
             features.get("imbalance", 0.0)
-        ])
-        anomaly_window.append(vector)
-
-        if len(anomaly_window) < anomaly_window.maxlen:
+        ))
+        if score is None:
             return 0.5  # warming up
-
-        X = np.array(anomaly_window)
-        anomaly_model.fit(X)
-        score = anomaly_model.decision_function([vector])[0]  # higher = more normal
-        return float(np.clip(1 - score, 0.0, 1.0))
+        return ANOMALY_FLOOR + ANOMALY_RANGE * score
 
     except Exception:
         return 0.5
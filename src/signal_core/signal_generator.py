@@ -14,11 +14,11 @@ logging.basicConfig(
 )
 
 class SignalGenerator:
-    def __init__(self, zscore_threshold=2.0, confidence_threshold=0.90):
+    def __init__(self, zscore_threshold=2.0, confidence_threshold=0.90, ml_filter=None):
         self.kalman = KalmanSpreadEstimator()
         self.kalman_monitor = KalmanMonitor()
         self.anomaly_filter = AnomalyFilter()
-        self.ml_filter = MLFilter(model_path="crypto_feature_framework/models/triangular_rf_model.pkl")
+        self.ml_filter = ml_filter or MLFilter()  # Pass the live filter so registry swaps reach the veto
         self.zscore_threshold = zscore_threshold
         self.confidence_threshold = confidence_threshold
         self.drift_monitor = KalmanMonitor()  # Can be replaced with specialized monitor
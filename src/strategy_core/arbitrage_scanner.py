@@ -0,0 +1,314 @@
+import math
+import heapq
+import logging
+
+# Logger setup
+logger = logging.getLogger("arbitrage_scanner")
+logging.basicConfig(
+    level=logging.INFO,
+    format="[%(asctime)s] %(levelname)s - %(name)s - %(message)s"
+)
+
+
+class ArbitrageScanner:
+    """
+    Currency graph with edge weights -log(rate * (1 - fee)); a negative cycle is a
+    profitable conversion loop of any length.
+
+    Instead of rerunning Bellman-Ford, the scanner keeps feasible potentials d
+    (d[v] <= d[u] + w(u, v) on every edge), which certify there is no negative
+    cycle. After an edge update:
+      - if the edge still satisfies its constraint, nothing else can change (O(1));
+      - otherwise any new negative cycle must use that edge, so a Dijkstra over
+        reduced costs w + d[u] - d[v] >= 0, started at the edge head and pruned
+        once it can no longer lower a potential, either reaches the edge tail
+        (negative cycle) or repairs the potentials of the affected nodes only.
+    An edge that closes a negative cycle is held at its tight weight ("deferred")
+    so the potentials stay valid, and is re-checked when any edge on its cycle changes.
+    While it is held, a second cycle through it can hide behind the tight weight, so
+    an update to an edge leaving its target or entering its source also searches
+    for a cycle through both edges. A second cycle that only forms through an edge
+    adjacent to neither end is reported once the recorded cycle closes.
+    """
+
+    def __init__(self, fee: float = 0.001, min_profit: float = 0.0005, base_currencies=("USDT", "BTC", "ETH")):
+        self.fee_weight = -math.log(1.0 - fee)
+        self.min_profit = min_profit
+        self.min_cycle_weight = -math.log(1.0 + min_profit)
+        self.base_currencies = base_currencies
+
+        self.currencies = []      # node id -> currency
+        self.node_ids = {}        # currency -> node id
+        self.markets = {}         # pair -> (base node, quote node)
+        self.potential = []       # node id -> d
+        self.out = []             # node id -> {dst: effective weight}
+        self.weight = {}          # (src, dst) -> real weight
+        self.edge_market = {}     # (src, dst) -> (pair, side)
+        self.deferred = {}        # (src, dst) -> edges of the negative cycle it closes
+        self.watchers = {}        # edge -> deferred edges whose cycle contains it
+        self.deferred_at = {}     # node -> deferred edges starting or ending there
+
+        self.updates = 0
+        self.searches = 0
+
+    def _node(self, currency: str) -> int:
+        node = self.node_ids.get(currency)
+        if node is None:
+            node = len(self.currencies)
+            self.node_ids[currency] = node
+            self.currencies.append(currency)
+            self.potential.append(0.0)
+            self.out.append({})
+        return node
+
+    def add_market(self, pair: str, base: str, quote: str):
+        self.markets[pair.lower()] = (self._node(base.upper()), self._node(quote.upper()))
+
+    def update_quote(self, pair: str, bid: float, ask: float, timestamp=None) -> list:
+        """
+        Applies a top-of-book quote for `pair`. Returns the cycle candidates it closes.
+        """
+        market = self.markets.get(pair)
+        if market is None or bid <= 0 or ask <= 0:
+            return []
+        base, quote = market
+        candidates = []
+        # Sell base at the bid: base -> quote; buy base at the ask: quote -> base
+        self.edge_market[(base, quote)] = (pair, "sell")
+        self.edge_market[(quote, base)] = (pair, "buy")
+        updates = [(base, quote, -math.log(bid) + self.fee_weight), (quote, base, math.log(ask) + self.fee_weight)]
+        # Loosen before tightening, so a moving quote never looks crossed against its own stale side
+        updates.sort(key=lambda e: self.weight.get((e[0], e[1]), math.inf) - e[2])
+        for u, v, w in updates:
+            self._update_edge(u, v, w, timestamp, candidates)
+        return candidates
+
+    def update(self, event) -> list:
+        """
+        MarketEvent entry point: orderbook events update both directions of their pair.
+        """
+        if event.event_type != 'orderbook':
+            return []
+        book = event.book
+        if book is not None:
+            bid, ask = book.best_bid(), book.best_ask()
+        elif event.bids and event.asks:
+            bid, ask = float(event.bids[0][0]), float(event.asks[0][0])
+        else:
+            return []
+        if bid is None or ask is None:
+            return []
+        return self.update_quote(event.pair, float(bid), float(ask), event.timestamp)
+
+    def _update_edge(self, u: int, v: int, w: float, timestamp, candidates: list):
+        self.updates += 1
+        self.weight[(u, v)] = w
+        if (u, v) in self.deferred:
+            self._release((u, v))
+        affected = list(self.watchers.get((u, v), ()))
+        # Deferred edges this one leaves the target of, or enters the source of
+        sharing = [e for e in self.deferred_at.get(u, ()) if e[1] == u]
+        sharing += [e for e in self.deferred_at.get(v, ()) if e[0] == v]
+        self._insert(u, v, w, timestamp, candidates)
+
+        for edge in affected:
+            if edge in self.deferred:
+                self._release(edge)
+                self._insert(edge[0], edge[1], self.weight[edge], timestamp, candidates)
+
+        if (u, v) in self.deferred:
+            return  # Its own cycle was just reported
+        for edge in sharing:
+            if edge in self.deferred and edge not in affected:
+                self._shared_cycle(edge, u, v, timestamp, candidates)
+
+    def _release(self, edge):
+        for node in edge:
+            at = self.deferred_at[node]
+            at.discard(edge)
+            if not at:
+                del self.deferred_at[node]
+        for member in self.deferred.pop(edge):
+            watching = self.watchers.get(member)
+            if watching is not None:
+                watching.discard(edge)
+                if not watching:
+                    del self.watchers[member]
+
+    def _insert(self, u: int, v: int, w: float, timestamp, candidates: list):
+        d = self.potential
+        out = self.out
+        out[u][v] = w
+        delta = d[u] + w - d[v]
+        if delta >= 0.0:
+            return
+
+        # Dijkstra from v over reduced costs; node x can drop by delta + dist(x) while that is < 0
+        self.searches += 1
+        dist = {v: 0.0}
+        parent = {v: u}
+        settled = []
+        heap = [(0.0, v)]
+        while heap:
+            dx, x = heapq.heappop(heap)
+            if dx > dist[x]:
+                continue
+            if delta + dx >= 0.0:
+                break
+            if x == u:
+                self._defer(u, v, parent, timestamp, candidates)
+                return
+            settled.append((x, dx))
+            dxp = d[x]
+            for y, wy in out[x].items():
+                rc = wy + dxp - d[y]
+                nd = dx + (rc if rc > 0.0 else 0.0)
+                if nd < dist.get(y, math.inf):
+                    dist[y] = nd
+                    parent[y] = x
+                    heapq.heappush(heap, (nd, y))
+
+        for x, dx in settled:
+            d[x] += delta + dx
+
+    def _defer(self, u: int, v: int, parent: dict, timestamp, candidates: list):
+        # Cycle u -> v -> ... -> u, recovered by walking parents back from u
+        path = [u]
+        x = u
+        while x != v:
+            x = parent[x]
+            path.append(x)
+        path.reverse()  # v ... u
+        nodes = [u] + path  # u -> v -> ... -> u
+        edges = list(zip(nodes[:-1], nodes[1:]))
+
+        self.out[u][v] = self.potential[v] - self.potential[u]  # Tight, keeps potentials feasible
+        self.deferred[(u, v)] = edges
+        for edge in edges:
+            self.watchers.setdefault(edge, set()).add((u, v))
+        self.deferred_at.setdefault(u, set()).add((u, v))
+        self.deferred_at.setdefault(v, set()).add((u, v))
+
+        cycle_weight = sum(self.weight[edge] for edge in edges)
+        if cycle_weight < self.min_cycle_weight:
+            candidate = self._candidate(nodes, edges, cycle_weight, timestamp)
+            logger.info(f"[ARB] {candidate['decision']} | return={candidate['expected_return']:.5f}")
+            candidates.append(candidate)
+
+    def _shared_cycle(self, edge, a: int, b: int, timestamp, candidates: list):
+        """
+        Reports the cheapest cycle u -> v ~> a -> b ~> u through deferred `edge` (u, v)
+        and the updated edge (a, b), where b == u or a == v leaves one ~> leg empty.
+        Potentials are already feasible here, so nothing is deferred.
+        """
+        u, v = edge
+        # Shortest remaining leg over reduced costs, kept off the deferred edge's far end so the cycle is simple
+        src, dst, avoid = (v, a, u) if b == u else (b, u, v)
+        d = self.potential
+        base = self.weight[edge] + self.weight[(a, b)] + d[dst] - d[src]
+
+        self.searches += 1
+        dist = {src: 0.0}
+        parent = {}
+        heap = [(0.0, src)]
+        while heap:
+            dx, x = heapq.heappop(heap)
+            if dx > dist[x]:
+                continue
+            if base + dx >= self.min_cycle_weight:
+                return
+            if x == dst:
+                break
+            dxp = d[x]
+            for y, wy in self.out[x].items():
+                if y == avoid:
+                    continue
+                rc = wy + dxp - d[y]
+                nd = dx + (rc if rc > 0.0 else 0.0)
+                if nd < dist.get(y, math.inf):
+                    dist[y] = nd
+                    parent[y] = x
+                    heapq.heappush(heap, (nd, y))
+        else:
+            return
+
+        path = [dst]
+        while path[-1] != src:
+            path.append(parent[path[-1]])
+        path.reverse()  # src ... dst
+        nodes = [u] + path + [u] if b == u else [u, v] + path
+        edges = list(zip(nodes[:-1], nodes[1:]))
+
+        cycle_weight = sum(self.weight[e] for e in edges)
+        if cycle_weight < self.min_cycle_weight:
+            candidate = self._candidate(nodes, edges, cycle_weight, timestamp)
+            logger.info(f"[ARB] {candidate['decision']} | return={candidate['expected_return']:.5f}")
+            candidates.append(candidate)
+
+    def _candidate(self, nodes, edges, cycle_weight, timestamp) -> dict:
+        # Start the cycle at the most preferred base currency it passes through
+        currencies = [self.currencies[n] for n in nodes[:-1]]
+        start = 0
+        for base in self.base_currencies:
+            if base in currencies:
+                start = currencies.index(base)
+                break
+        edges = edges[start:] + edges[:start]
+        currencies = currencies[start:] + currencies[:start]
+
+        legs = []
+        for src, dst in edges:
+            pair, side = self.edge_market[(src, dst)]
+            legs.append({
+                "pair": pair,
+                "side": side,
+                "from": self.currencies[src],
+                "to": self.currencies[dst],
+                "rate": math.exp(-self.weight[(src, dst)])  # Net of fee
+            })
+
+        return {
+            "timestamp": timestamp,
+            "decision": "CYCLE " + ">".join(currencies + [currencies[0]]),
+            "side": legs[0]["side"],
+            "cycle": currencies + [currencies[0]],
+            "base_currency": currencies[0],
+            "legs": legs,
+            "expected_return": math.exp(-cycle_weight) - 1.0
+        }
+
+    def has_negative_cycle(self) -> bool:
+        return bool(self.deferred)
+
+    def check_potentials(self, tol: float = 1e-9) -> bool:
+        """
+        True when every effective edge satisfies d[v] <= d[u] + w (debug/test helper).
+        """
+        d = self.potential
+        return all(d[v] <= d[u] + w + tol for u, edges in enumerate(self.out) for v, w in edges.items())
+
+
+def cycle_legs(candidate: dict, broker, quantity: float) -> list:
+    """
+    Turns a candidate into leg callables for TradeStateMachine.execute_legs,
+    one per edge of the cycle (execute_cycle takes only triangles): each places a market order through `broker.place_order` and returns
+    {"filled", "asset", "qty"} with the expected output quantity.
+    `quantity` is in units of the candidate's base currency.
+    """
+    legs = []
+    amounts = [quantity]
+    for leg in candidate["legs"]:
+        amounts.append(amounts[-1] * leg["rate"])
+
+    for leg, qty_in, qty_out in zip(candidate["legs"], amounts[:-1], amounts[1:]):
+        # Orders are sized in the pair's base asset: what we sell, or what we buy
+        amount = qty_in if leg["side"] == "sell" else qty_out
+
+        def place(leg=leg, amount=amount, qty_out=qty_out):
+            result = broker.place_order(pair=leg["pair"].upper(), side=leg["side"].upper(), amount=amount,
+                                        order_type="MARKET")
+            filled = bool(result) and result.get("status") != "error"
+            return {"filled": filled, "asset": leg["to"], "qty": qty_out}
+
+        legs.append(place)
+    return legs
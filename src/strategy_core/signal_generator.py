@@ -12,9 +12,9 @@ logging.basicConfig(
 )
 
 class SignalGenerator:
-    def __init__(self, zscore_threshold=2.0):
+    def __init__(self, zscore_threshold=2.0, ml_filter=None):
         self.kalman = KalmanSpreadEstimator()
-        self.ml_filter = MLFilter(model_path="crypto_feature_framework/models/triangular_rf_model.pkl")
+        self.ml_filter = ml_filter or MLFilter()  # Pass the live filter so registry swaps reach the veto
         self.zscore_threshold = zscore_threshold
         self.confidence_threshold = 0.90  # stricter confidence for trading signal
 
@@ -0,0 +1,154 @@
+import sys
+import os
+import math
+import logging
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from strategy_core.arbitrage_scanner import ArbitrageScanner, cycle_legs
+from execution.trade_state_machine import TradeStateMachine
+
+logging.getLogger("arbitrage_scanner").setLevel(logging.WARNING)
+
+
+class Broker:
+    def __init__(self, fail_on=None):
+        self.orders = []
+        self.fail_on = fail_on
+
+    def place_order(self, pair, side, amount, order_type):
+        if pair == self.fail_on:
+            raise ConnectionError(f"{pair} rejected")
+        self.orders.append((pair, side, amount))
+        return {"status": "FILLED"}
+
+
+def bellman_ford_has_negative_cycle(scanner, tol=1e-12):
+    n = len(scanner.currencies)
+    dist = [0.0] * n
+    edges = list(scanner.weight.items())
+    for _ in range(n):
+        changed = False
+        for (u, v), w in edges:
+            if dist[u] + w < dist[v] - tol:
+                dist[v] = dist[u] + w
+                changed = True
+        if not changed:
+            return False
+    return True
+
+
+def test_matches_bellman_ford_after_every_update():
+    rng = np.random.default_rng(2)
+    currencies = [f"C{i}" for i in range(12)]
+    value = {c: math.exp(rng.normal(0, 1)) for c in currencies}
+    scanner = ArbitrageScanner(fee=0.0005, min_profit=0.0)
+    pairs = []
+    for i, base in enumerate(currencies):
+        for quote in currencies[:i]:
+            if rng.random() < 0.5:
+                pair = f"{base}{quote}".lower()
+                scanner.add_market(pair, base, quote)
+                pairs.append((pair, base, quote))
+
+    found = 0
+    for step in range(4000):
+        pair, base, quote = pairs[rng.integers(len(pairs))]
+        mid = value[base] / value[quote] * math.exp(rng.normal(0, 0.002))
+        candidates = scanner.update_quote(pair, mid * (1 - 1e-4), mid * (1 + 1e-4), timestamp=step)
+
+        assert scanner.check_potentials()
+        assert scanner.has_negative_cycle() == bellman_ford_has_negative_cycle(scanner)
+        for c in candidates:
+            found += 1
+            assert c["cycle"][0] == c["cycle"][-1] == c["base_currency"]
+            assert len(c["legs"]) == len(c["cycle"]) - 1
+            assert abs(math.prod(leg["rate"] for leg in c["legs"]) - 1 - c["expected_return"]) < 1e-9
+            assert c["expected_return"] > 0
+    assert found > 0
+
+
+def test_triangle_candidate_drives_execute_cycle_legs():
+    scanner = ArbitrageScanner(fee=0.001, min_profit=0.0005)
+    scanner.add_market("btcusdt", "BTC", "USDT")
+    scanner.add_market("ethusdt", "ETH", "USDT")
+    scanner.add_market("ethbtc", "ETH", "BTC")
+    assert scanner.update_quote("btcusdt", 29999.0, 30001.0) == []
+    assert scanner.update_quote("ethusdt", 1799.9, 1800.1) == []
+    assert scanner.update_quote("ethbtc", 0.05999, 0.06001) == []
+
+    # ETHBTC bid well above ETHUSDT/BTCUSDT: buy ETH with USDT, sell for BTC, sell BTC
+    candidates = scanner.update_quote("ethbtc", 0.0604, 0.0605)
+    assert len(candidates) == 1
+    c = candidates[0]
+    assert c["cycle"] == ["USDT", "ETH", "BTC", "USDT"]
+    assert [(leg["pair"], leg["side"]) for leg in c["legs"]] == [("ethusdt", "buy"), ("ethbtc", "sell"),
+                                                                 ("btcusdt", "sell")]
+    broker = Broker()
+    results = [leg() for leg in cycle_legs(c, broker, quantity=1000.0)]
+    assert all(r["filled"] for r in results)
+    assert [r["asset"] for r in results] == ["ETH", "BTC", "USDT"]
+    assert abs(results[-1]["qty"] - 1000.0 * (1 + c["expected_return"])) < 1e-9
+    assert [o[:2] for o in broker.orders] == [("ETHUSDT", "BUY"), ("ETHBTC", "SELL"), ("BTCUSDT", "SELL")]
+
+    # Dislocation closes: the deferred edge is re-checked and released
+    assert scanner.update_quote("ethbtc", 0.05999, 0.06001) == []
+    assert not scanner.has_negative_cycle()
+
+
+def test_four_leg_cycle_runs_through_the_state_machine():
+    scanner = ArbitrageScanner(fee=0.001, min_profit=0.0005)
+    for pair, base, quote in [("btcusdt", "BTC", "USDT"), ("ethbtc", "ETH", "BTC"), ("soleth", "SOL", "ETH"),
+                              ("solusdt", "SOL", "USDT")]:
+        scanner.add_market(pair, base, quote)
+    scanner.update_quote("btcusdt", 29999.0, 30001.0)
+    scanner.update_quote("ethbtc", 0.05999, 0.06001)
+    scanner.update_quote("soleth", 0.01999, 0.02001)
+    assert scanner.update_quote("solusdt", 35.99, 36.01) == []
+
+    # SOLUSDT bid above the BTC > ETH > SOL route: no triangle exists, only the 4-leg cycle
+    (c,) = scanner.update_quote("solusdt", 36.5, 36.6)
+    assert c["cycle"] == ["USDT", "BTC", "ETH", "SOL", "USDT"]
+
+    broker = Broker()
+    legs = cycle_legs(c, broker, quantity=1000.0)
+    assert len(legs) == 4
+    assert TradeStateMachine(broker).execute_legs(legs, c["base_currency"]) is True
+    assert [o[:2] for o in broker.orders] == [("BTCUSDT", "BUY"), ("ETHBTC", "BUY"), ("SOLETH", "BUY"),
+                                              ("SOLUSDT", "SELL")]
+
+    # The third leg fails: the ETH bought by leg 2 is hedged back to USDT and leg 4 never runs
+    broker = Broker(fail_on="SOLETH")
+    assert TradeStateMachine(broker).execute_legs(cycle_legs(c, broker, quantity=1000.0), c["base_currency"]) is False
+    eth = 1000.0 * c["legs"][0]["rate"] * c["legs"][1]["rate"]
+    assert [o[:2] for o in broker.orders] == [("BTCUSDT", "BUY"), ("ETHBTC", "BUY"), ("ETHUSDT", "SELL")]
+    assert abs(broker.orders[-1][2] - eth) < 1e-9
+
+
+def test_second_cycle_through_a_deferred_edge_is_reported():
+    scanner = ArbitrageScanner(fee=0.001, min_profit=0.0005)
+    for pair, base, quote in [("btcusdt", "BTC", "USDT"), ("ethusdt", "ETH", "USDT"), ("ethbtc", "ETH", "BTC"),
+                              ("solusdt", "SOL", "USDT"), ("solbtc", "SOL", "BTC")]:
+        scanner.add_market(pair, base, quote)
+    scanner.update_quote("btcusdt", 29999.0, 30001.0)
+    scanner.update_quote("ethusdt", 1799.9, 1800.1)
+    scanner.update_quote("ethbtc", 0.05999, 0.06001)
+    scanner.update_quote("solusdt", 35.99, 36.01)
+    scanner.update_quote("solbtc", 0.00117, 0.00123)
+
+    # BTCUSDT bid jumps: only the ETH route pays, and BTC > USDT is held deferred on it
+    (first,) = scanner.update_quote("btcusdt", 30300.0, 30301.0)
+    assert first["cycle"] == ["USDT", "ETH", "BTC", "USDT"]
+
+    # SOLBTC catches up: a second, slightly smaller cycle through the same deferred BTC > USDT edge
+    (second,) = scanner.update_quote("solbtc", 0.0011999, 0.0012001)
+    assert second["cycle"] == ["USDT", "SOL", "BTC", "USDT"]
+    assert 0 < second["expected_return"] < first["expected_return"]
+    assert abs(math.prod(leg["rate"] for leg in second["legs"]) - 1 - second["expected_return"]) < 1e-9
+    assert scanner.check_potentials()
+
+    # Both close with the BTCUSDT quote
+    assert scanner.update_quote("btcusdt", 29999.0, 30001.0) == []
+    assert not scanner.has_negative_cycle() and not scanner.deferred_at
@@ -0,0 +1,40 @@
+import sys
+import os
+import math
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from data_pipeline.order_book import OrderBook
+from feature_engineering.feature_engineer import FeatureEngineer
+from messaging.market_event import MarketEvent
+
+
+def book_event(pair, bids, asks):
+    book = OrderBook(pair)
+    book.load_snapshot({"lastUpdateId": 1, "bids": bids, "asks": asks})
+    return MarketEvent("orderbook", 0, "binance", pair, book=book)
+
+
+def test_imbalance_and_microprice_in_feature_vector():
+    fe = FeatureEngineer()
+    fe.update(book_event("ethbtc", [["0.050", "3"], ["0.049", "2"]], [["0.051", "1"], ["0.052", "2"]]))
+
+    fv = None
+    for i in range(12):
+        for pair, price in (("btcusdt", 30000.0), ("ethusdt", 1500.0), ("ethbtc", 0.05)):
+            fv = fe.update(MarketEvent("trade", i, "binance", pair, price=price, quantity=1.0))
+
+    w_bid, w_ask = 3 + 2 / 2, 1 + 2 / 2
+    assert abs(fv["imbalance"] - (w_bid - w_ask) / (w_bid + w_ask)) < 1e-12
+    assert abs(fv["microprice_ethbtc"] - (0.051 * 3 + 0.050 * 1) / 4) < 1e-12
+    assert fv["imbalance_btcusdt"] == 0.0 and math.isnan(fv["microprice_btcusdt"])  # Book not seen yet
+
+
+def test_book_feature_keys_do_not_change_as_books_arrive():
+    fe = FeatureEngineer()
+    keys = set(fe.book_features.as_dict())
+    assert keys == {f"{name}_{pair}" for pair in ("btcusdt", "ethusdt", "ethbtc") for name in ("imbalance", "microprice")}
+
+    for pair in ("ethbtc", "btcusdt", "ethusdt"):
+        fe.update(book_event(pair, [["1.0", "2"]], [["1.1", "1"]]))
+        assert set(fe.book_features.as_dict()) == keys
@@ -0,0 +1,73 @@
+import sys
+import os
+import logging
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from feature_engineering.feature_engineer import FeatureEngineer
+from filters.kalman_spread_estimator import KalmanSpreadEstimator, kalman_filter_batch
+from messaging.market_event import MarketEventBatch
+
+logging.getLogger("feature_engineer").setLevel(logging.WARNING)
+
+
+def interleaved_trades(n, seed=3):
+    rng = np.random.default_rng(seed)
+    pair = rng.choice(np.array(["btcusdt", "ethusdt", "ethbtc", "solusdt"]), size=n, p=[0.35, 0.35, 0.25, 0.05])
+    btc = 30000 * np.exp(np.cumsum(rng.normal(0, 1e-4, n)))
+    eth = 1800 * np.exp(np.cumsum(rng.normal(0, 1e-4, n)))
+    price = np.where(pair == "btcusdt", btc, np.where(pair == "ethusdt", eth, eth / btc + rng.normal(0, 1e-6, n)))
+    # Mostly 1ms apart, with occasional multi-second gaps so some legs go stale
+    gaps = np.where(rng.random(n) < 0.001, 8_000_000_000, 1_000_000)
+    timestamp = 1_700_000_000_000_000_000 + np.cumsum(gaps)
+    return MarketEventBatch(timestamp, pair, price, np.ones(n))
+
+
+def test_batch_matches_streaming_replay():
+    batch = interleaved_trades(30000)
+
+    # The reference is the live path: one MarketEvent at a time through update()
+    engineer = FeatureEngineer()
+    streaming = [fv for fv in (engineer.update(event) for event in batch.to_events()) if fv]
+    vectorized = FeatureEngineer().compute_batch_from_trades(batch)
+
+    assert len(streaming) == len(vectorized["spread"]) > 20000
+    assert vectorized["stale"].any() and not vectorized["stale"].all()
+    for key in ("timestamp", "spread", "spread_zscore", "volatility", "imbalance", "leg_age_ms", "stale"):
+        expected = np.array([fv[key] for fv in streaming])
+        np.testing.assert_array_equal(vectorized[key], expected, err_msg=key)
+
+    # update_batch is the same loop over the batch's arrays
+    assert FeatureEngineer().update_batch(batch) == streaming
+
+
+def test_kalman_batch_is_bit_identical_to_estimator():
+    rng = np.random.default_rng(11)
+    x = np.cumsum(rng.normal(0, 1e-3, 25000)) + 0.05
+    y = 0.9 * x + rng.normal(0, 1e-4, len(x))
+
+    # Small window and recenter interval so the exact window recompute runs many times
+    kalman = KalmanSpreadEstimator(window=50)
+    kalman.residuals.recenter_every = 1000
+    out = kalman_filter_batch(x, y, window=50, recenter_every=1000)
+    rows = []
+    for xi, yi in zip(x.tolist(), y.tolist()):
+        residual = kalman.update(xi, yi)
+        rows.append((kalman.alpha, kalman.beta, residual, kalman.spread_std, kalman.get_zscore()))
+
+    expected = np.array(rows)
+    for j, key in enumerate(("alpha", "beta", "residual", "spread_std", "zscore")):
+        np.testing.assert_array_equal(out[key], expected[:, j], err_msg=key)
+
+
+def test_kalman_batch_filters_triangle_columns_independently():
+    rng = np.random.default_rng(4)
+    x = np.cumsum(rng.normal(0, 1e-3, (3000, 3)), axis=0) + 0.05
+    y = 0.9 * x + rng.normal(0, 1e-4, x.shape)
+
+    out = kalman_filter_batch(x, y)
+    assert out["zscore"].shape == x.shape
+    for j in range(3):
+        np.testing.assert_array_equal(out["zscore"][:, j], kalman_filter_batch(x[:, j], y[:, j])["zscore"])
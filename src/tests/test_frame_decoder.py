@@ -0,0 +1,39 @@
+import sys
+import os
+import json
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from data_pipeline.data_normalizer import DataNormalizer
+from data_pipeline.frame_decoder import FrameDecoder, TRADE, DEPTH
+
+TRADE_MSG = {
+    "e": "trade", "E": 1700000000123, "s": "ETHBTC", "t": 42, "p": "0.05321", "q": "1.25",
+    "T": 1700000000120, "m": True, "M": True
+}
+
+
+def test_fast_trade_matches_normalizer():
+    decoder = FrameDecoder()
+    kind, event = decoder.decode(json.dumps(TRADE_MSG, separators=(",", ":")))
+    expected = DataNormalizer.normalize_binance_trade(TRADE_MSG)
+
+    assert kind == TRADE
+    assert decoder.fallbacks == 0
+    assert event.to_dict() == expected.to_dict()
+
+
+def test_combined_stream_and_depth_frames():
+    decoder = FrameDecoder()
+    depth = {"e": "depthUpdate", "E": 1, "s": "BTCUSDT", "U": 1, "u": 2, "b": [["1.0", "2"]], "a": []}
+    frames = [
+        json.dumps({"stream": "ethbtc@trade", "data": TRADE_MSG}),
+        json.dumps(depth),
+        json.dumps({"result": None, "id": 1})
+    ]
+
+    decoded = [decoder.decode(raw) for raw in frames]
+
+    assert [kind for kind, _ in decoded] == [TRADE, DEPTH, None]
+    assert decoded[0][1].price == 0.05321
+    assert decoded[1][1] == depth
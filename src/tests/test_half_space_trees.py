@@ -0,0 +1,70 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pytest
+from scipy.stats import spearmanr
+from sklearn.ensemble import IsolationForest
+
+from feature_engineering.feature_engineer import FeatureEngineer
+from scoring import scoring_engine
+from scoring.half_space_trees import HalfSpaceTrees
+from test_feature_engineer_batch import interleaved_trades
+
+ANOMALY_FEATURES = ("spread", "spread_zscore", "volatility", "imbalance")
+
+
+def test_scores_are_in_range_and_flag_outliers():
+    rng = np.random.default_rng(0)
+    # Features on very different scales, as spread and z-score are
+    X = rng.normal(size=(1000, 3)) * np.array([1e-5, 1.0, 1e3])
+    detector = HalfSpaceTrees(n_features=3, window=200)
+
+    scores = detector.run(X)
+    assert np.isnan(scores[:199]).all() and not np.isnan(scores[199:]).any()
+    assert ((scores[199:] >= 0.0) & (scores[199:] <= 1.0)).all()
+    assert 0.3 < scores[199:].mean() < 0.7  # In-distribution rows spread over the range
+
+    outlier = np.array([8e-5, 0.0, 0.0])
+    assert detector.score(outlier)[0] >= 0.99
+    assert detector.score(np.zeros(3))[0] < 0.5
+
+
+@pytest.fixture(scope="module")
+def replay():
+    features = FeatureEngineer().compute_batch_from_trades(interleaved_trades(1500))
+    X = np.column_stack([features[k] for k in ANOMALY_FEATURES])
+
+    # The previous per-tick scorer: refit a 100-tree IsolationForest on the trailing 200 rows
+    ticks = np.arange(199, len(X), 25)
+    forest = IsolationForest(n_estimators=100, contamination=0.05, random_state=42)
+    refit = []
+    for i in ticks:
+        window = X[i - 199:i + 1]
+        forest.fit(window)
+        refit.append(np.clip(1 - forest.decision_function(window[-1:])[0], 0.0, 1.0))
+    return X, ticks, np.array(refit)
+
+
+def test_scores_agree_with_isolation_forest_refit_on_replayed_features(replay):
+    X, ticks, refit = replay
+    streaming = HalfSpaceTrees(n_features=4, window=200, seed=42).run(X)
+
+    assert spearmanr(refit, streaming[ticks]).statistic > 0.7
+    flagged = refit >= 1.0  # Outside the forest's 5% contamination threshold
+    assert streaming[ticks][flagged].mean() > streaming[ticks][~flagged].mean() + 0.2
+
+
+def test_anomaly_score_keeps_the_refit_composite_contribution(replay, monkeypatch):
+    X, ticks, refit = replay
+    monkeypatch.setattr(scoring_engine, "anomaly_model", HalfSpaceTrees(n_features=4, window=200, seed=42))
+    scores = np.array([scoring_engine.compute_anomaly_score(dict(zip(ANOMALY_FEATURES, row))) for row in X])
+
+    assert (scores[:199] == 0.5).all()  # Warming up
+    assert ((scores[199:] >= scoring_engine.ANOMALY_FLOOR) & (scores[199:] <= 1.0)).all()
+    # The 0.2 * (1 - anomaly) composite term, and with it the composite_score > 0.8 gate, is unchanged
+    term, refit_term = 0.2 * (1 - scores[ticks]), 0.2 * (1 - refit)
+    assert abs(term.mean() - refit_term.mean()) < 0.005
+    assert spearmanr(refit, scores[ticks]).statistic > 0.7
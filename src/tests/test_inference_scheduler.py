@@ -0,0 +1,68 @@
+import sys
+import os
+import asyncio
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+from filters.inference_scheduler import InferenceScheduler
+from filters.ml_filter import MLFilter
+
+
+class RecordingFilter:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    def score_batch(self, fvs):
+        if self.fail:
+            raise RuntimeError("model down")
+        self.batches.append(len(fvs))
+        return [{"signal": 1, "confidence": fv["x"], "composite": 0.0} for fv in fvs]
+
+
+def test_concurrent_requests_share_batches_in_order():
+    async def run():
+        scorer = RecordingFilter()
+        scheduler = InferenceScheduler(scorer, max_batch=4, max_delay_us=50_000)
+        results = await asyncio.gather(*(scheduler.score({"x": float(i)}) for i in range(10)))
+        return scorer.batches, results
+
+    batches, results = asyncio.run(run())
+    assert batches == [4, 4, 2]  # Two full batches, then the deadline flushes the rest
+    assert [r["confidence"] for r in results] == [float(i) for i in range(10)]
+
+
+def test_lone_caller_is_not_held_for_the_deadline():
+    async def run():
+        scheduler = InferenceScheduler(RecordingFilter(), max_batch=32, max_delay_us=0)
+        start = asyncio.get_running_loop().time()
+        await scheduler.score({"x": 1.0})
+        return asyncio.get_running_loop().time() - start
+
+    assert asyncio.run(run()) < 0.01
+
+
+def test_batch_failure_reaches_every_waiter():
+    async def run():
+        scheduler = InferenceScheduler(RecordingFilter(fail=True), max_batch=8, max_delay_us=100)
+        return await asyncio.gather(*(scheduler.score({"x": 0.0}) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in asyncio.run(run()))
+
+
+def test_score_batch_matches_per_row_scoring(tmp_path):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(500, 6)), columns=MLFilter(model_path="", anomaly_path="").feature_order)
+    y = np.sign(X["spread"]).astype(int)
+    path = tmp_path / "rf.pkl"
+    joblib.dump(RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y), path)
+
+    rows = X.head(50).to_dict("records")
+    batched = MLFilter(model_path=str(path), anomaly_path="").score_batch(rows)
+    single = MLFilter(model_path=str(path), anomaly_path="")
+    assert batched == [single.predict_with_confidence(fv) for fv in rows]
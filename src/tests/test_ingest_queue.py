@@ -0,0 +1,57 @@
+import sys
+import os
+import asyncio
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from data_pipeline.ingest_queue import IngestQueue, BLOCK, DROP_OLDEST, CONFLATE
+
+
+def test_conflate_keeps_latest_book_per_pair():
+    async def run():
+        queue = IngestQueue(maxsize=10, policy=CONFLATE)
+        await queue.put("book-btc-1", key=("btcusdt", "orderbook"))
+        await queue.put("trade-1")
+        await queue.put("book-btc-2", key=("btcusdt", "orderbook"))
+        await queue.put("book-eth-1", key=("ethusdt", "orderbook"))
+        await queue.put("trade-2")
+        return queue, await queue.get_batch()
+
+    queue, batch = asyncio.run(run())
+    assert batch == ["book-btc-2", "trade-1", "book-eth-1", "trade-2"]
+    assert queue.conflated == 1
+    assert queue.dropped == 0
+
+
+def test_drop_oldest_when_full():
+    async def run():
+        queue = IngestQueue(maxsize=3, policy=DROP_OLDEST)
+        for i in range(5):
+            await queue.put(i)
+        return queue, await queue.get_batch()
+
+    queue, batch = asyncio.run(run())
+    assert batch == [2, 3, 4]
+    assert queue.dropped == 2
+
+
+def test_block_waits_for_consumer():
+    async def run():
+        queue = IngestQueue(maxsize=2, policy=BLOCK)
+        received = []
+
+        async def consumer():
+            for _ in range(5):
+                received.append(await queue.get())
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(consumer())
+        for i in range(5):
+            await queue.put(i)
+            assert queue.qsize() <= 2
+        await task
+        return queue, received
+
+    queue, received = asyncio.run(run())
+    assert received == [0, 1, 2, 3, 4]
+    assert queue.dropped == 0
@@ -0,0 +1,57 @@
+import sys
+import os
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from filters.kalman_spread_estimator import KalmanSpreadEstimator
+
+
+class ReferenceKalman:
+    """
+    The original NumPy matrix implementation, kept as the parity oracle.
+    """
+
+    def __init__(self, Q=1e-5, R=1e-3):
+        self.Q, self.R = Q, R
+        self.P = np.eye(2)
+        self.state = np.array([0.0, 1.0])
+        self.history = []
+        self.last_spread, self.spread_std = 0.0, 1.0
+
+    def update(self, x, y):
+        phi = np.array([1.0, x])
+        P_phi = self.P @ phi
+        S = max(phi @ P_phi + self.R, 1e-8)
+        K = P_phi / S
+        residual = y - np.dot(phi, self.state)
+        self.state += K * residual
+        P_new = self.P - np.outer(K, phi) @ self.P + self.Q * np.eye(2)
+        self.P = 0.5 * (P_new + P_new.T)
+        self.last_spread = residual
+        self.history = (self.history + [residual])[-200:]
+        self.spread_std = np.std(self.history) or 1.0
+        return residual
+
+
+def test_matches_matrix_implementation():
+    rng = np.random.default_rng(7)
+    x = np.cumsum(rng.normal(0, 1e-3, 25000)) + 0.05
+    y = 0.9 * x + rng.normal(0, 1e-4, len(x))
+
+    fast, ref = KalmanSpreadEstimator(), ReferenceKalman()
+    for xi, yi in zip(x.tolist(), y.tolist()):
+        r_fast, r_ref = fast.update(xi, yi), ref.update(xi, yi)
+        assert abs(r_fast - r_ref) < 1e-12
+        assert abs(fast.last_spread / fast.spread_std - ref.last_spread / ref.spread_std) < 1e-8
+
+    np.testing.assert_allclose(fast.state, ref.state, rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(fast.P, ref.P, rtol=1e-9, atol=1e-15)
+    np.testing.assert_allclose(fast.spread_history, ref.history, rtol=0, atol=1e-12)
+
+
+def test_constant_residual_falls_back_to_unit_std():
+    kalman = KalmanSpreadEstimator(Q=0.0, R=1e9)
+    kalman.update(0.0, 0.0)
+    assert kalman.spread_std == 1.0
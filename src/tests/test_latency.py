@@ -0,0 +1,50 @@
+import sys
+import os
+
+from prometheus_client import REGISTRY
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from metrics import latency
+
+
+def recorded(stage):
+    labels = {"stage": stage}
+    return (REGISTRY.get_sample_value("xalgo_stage_latency_seconds_count", labels),
+            REGISTRY.get_sample_value("xalgo_stage_latency_seconds_sum", labels))
+
+
+def test_each_observer_records_under_its_own_stage():
+    latency.set_enabled(True)
+    before = {stage: recorded(stage) for stage in latency.STAGES}
+
+    latency.observe(latency.FEATURES, latency.start())
+    latency.observe_between(latency.INGEST_QUEUE, 1_000_000_000, 1_003_000_000)
+    latency.observe_since_wall(latency.EXCHANGE_TO_RECEIVE, latency._wall_ns() - 2_000_000)
+
+    for stage in latency.STAGES:
+        count, total = recorded(stage)
+        if stage in (latency.FEATURES, latency.INGEST_QUEUE, latency.EXCHANGE_TO_RECEIVE):
+            assert count == before[stage][0] + 1
+        else:
+            assert (count, total) == before[stage]
+    assert abs(recorded(latency.INGEST_QUEUE)[1] - before[latency.INGEST_QUEUE][1] - 0.003) < 1e-12
+    assert recorded(latency.EXCHANGE_TO_RECEIVE)[1] - before[latency.EXCHANGE_TO_RECEIVE][1] >= 0.002
+
+
+def test_disabled_or_unset_marks_record_nothing():
+    latency.set_enabled(True)
+    before = recorded(latency.SIGNAL)
+    latency.observe(latency.SIGNAL, 0)
+    latency.observe_since_wall(latency.SIGNAL, None)
+    latency.observe_between(latency.SIGNAL, 0, 5)
+
+    latency.set_enabled(False)
+    try:
+        assert latency.start() == 0
+        latency.observe(latency.SIGNAL, 1)
+        latency.observe_between(latency.SIGNAL, 1, 5)
+        latency.observe_since_wall(latency.SIGNAL, 1)
+    finally:
+        latency.set_enabled(True)
+    assert recorded(latency.SIGNAL) == before
@@ -0,0 +1,104 @@
+import sys
+import os
+import asyncio
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import main.live_controller as live
+from feature_engineering.triangle_engine import TriangleEngine, TriangleUniverse
+from filters.inference_scheduler import InferenceScheduler
+from messaging.market_event import MarketEvent
+
+
+class RecordingRetrainer:
+    running = False
+
+    def __init__(self):
+        self.reasons = []
+
+    def trigger(self, reason=""):
+        self.reasons.append(reason)
+        return True
+
+
+class FillingRouter:
+    def __init__(self):
+        self.orders = []
+
+    def simulate_order_execution(self, signal, base_price, quantity_usd):
+        order = {"pair": "ETHBTC", "side": "long", "filled_price": 0.06, "quantity": quantity_usd / 0.06 / 30000.0}
+        self.orders.append(order)
+        return order
+
+
+class ApprovingInference:
+    async def score(self, fv):
+        return {"signal": 1, "confidence": 0.99, "composite": 0.9}
+
+
+def feature_vector():
+    return {"timestamp": 0, "spread": -1e-5, "spread_zscore": -2.5, "volatility": 1e-6, "imbalance": 0.1,
+            "btc_price": 30000.0, "eth_price": 1800.0, "eth_btc": 0.06, "leg_age_ms": 1.0, "stale": False}
+
+
+def test_filled_order_with_drifting_model_triggers_retraining(monkeypatch):
+    retrainer = RecordingRetrainer()
+    router = FillingRouter()
+    monkeypatch.setattr(live, "retrainer", retrainer)
+    monkeypatch.setattr(live, "execution_router", router)
+    monkeypatch.setattr(live, "inference", ApprovingInference())
+    monkeypatch.setattr(live, "push_scores_to_prometheus", lambda *scores: 0.9)
+    monkeypatch.setattr(live.feature_engineer, "update", lambda event: feature_vector())
+    monkeypatch.setattr(live.triangle_engine, "update", lambda event: [])
+    monkeypatch.setattr(live.signal_generator, "generate_signal",
+                        lambda fv: {"decision": "BUY ETHBTC", "side": "buy"})
+    # 2 of 10 predictions right: precision 0.2 is below the 0.55 drift threshold
+    monkeypatch.setattr(live.ml_filter, "predictions", 10)
+    monkeypatch.setattr(live.ml_filter, "correct_predictions", 2)
+
+    event = MarketEvent("trade", time.time_ns(), "binance", "ethbtc", price=0.06, quantity=1.0,
+                        recv_ns=time.time_ns())
+    asyncio.run(live.process_event(event))
+
+    assert len(router.orders) == 1
+    assert len(retrainer.reasons) == 1 and retrainer.reasons[0].startswith("precision=0.20")
+    assert live.drift_stats()["precision"] == 0.2
+
+
+class RecordingFilter:
+    def __init__(self):
+        self.batches = []
+
+    def score_batch(self, fvs):
+        self.batches.append([fv.get("triangle", "traded") for fv in fvs])
+        return [{"signal": 0, "confidence": 0.5, "composite": 0.0} for _ in fvs]
+
+
+def test_concurrent_events_score_their_triangles_in_one_batch(monkeypatch):
+    scorer = RecordingFilter()
+    engine = TriangleEngine(TriangleUniverse.from_assets(["BTC", "ETH", "BNB", "SOL"]))
+    monkeypatch.setattr(live, "inference", InferenceScheduler(scorer, max_delay_us=0))
+    monkeypatch.setattr(live, "triangle_engine", engine)
+    monkeypatch.setattr(live, "triangle_scores", {})
+    monkeypatch.setattr(live.feature_engineer, "update", lambda event: None)
+
+    prices = {"btcusdt": 30000.0, "ethusdt": 1800.0, "bnbusdt": 300.0, "solusdt": 20.0, "ethbtc": 0.06,
+              "bnbbtc": 0.01, "solbtc": 0.0006, "bnbeth": 0.1667, "soleth": 0.0111, "solbnb": 0.0667}
+    now = time.time_ns()
+
+    def trade(pair, i):
+        return MarketEvent("trade", now + i * 1_000_000, "binance", pair, price=prices[pair], quantity=1.0,
+                           recv_ns=time.time_ns())
+
+    async def run():
+        for i, pair in enumerate(sorted(prices)):
+            await live.process_event(trade(pair, i))
+        scorer.batches.clear()
+        # A BTCUSDT and an ETHUSDT tick each refresh three triangles, one of them the traded ETH/BTC one
+        await asyncio.gather(live.process_event(trade("btcusdt", 20)), live.process_event(trade("ethusdt", 21)))
+
+    asyncio.run(run())
+    assert len(scorer.batches) == 1 and len(scorer.batches[0]) == 4
+    assert "btcusdt/ethusdt/ethbtc" not in scorer.batches[0]  # Left to the decision path
+    assert set(scorer.batches[0]) <= set(live.triangle_scores)
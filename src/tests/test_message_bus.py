@@ -0,0 +1,88 @@
+import sys
+import os
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from messaging.message_bus import AsyncMessageBus, TRADES, FEATURES, ORDERS, DROP_OLDEST, UNBOUNDED
+
+
+def test_topic_routing_and_batches():
+    async def run():
+        bus = AsyncMessageBus()
+        trades, batches = [], []
+        bus.subscribe(TRADES, trades.append, name="signal")
+        bus.subscribe(TRADES, batches.append, name="db_writer", batch_size=4)
+        bus.subscribe(FEATURES, lambda msg: trades.append(("feature", msg)), name="other")
+        await bus.start()
+
+        for i in range(10):
+            bus.publish(TRADES, i)
+        await bus.drain()
+        await bus.stop()
+        return trades, batches
+
+    trades, batches = asyncio.run(run())
+    assert trades == list(range(10))
+    assert [x for batch in batches for x in batch] == list(range(10))
+    assert all(len(batch) <= 4 for batch in batches)
+
+
+def test_slow_consumer_does_not_block_fast_one():
+    async def run():
+        bus = AsyncMessageBus()
+        fast = []
+
+        async def slow_writer(msg):
+            await asyncio.sleep(0.05)
+
+        bus.subscribe(TRADES, fast.append, name="signal")
+        slow = bus.subscribe(TRADES, slow_writer, name="db_writer", maxsize=5)
+        await bus.start()
+
+        for i in range(50):
+            bus.publish(TRADES, i)
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+        await bus.stop()
+        return fast, slow
+
+    fast, slow = asyncio.run(run())
+    assert fast == list(range(50))
+    assert slow.dropped > 0
+    assert len(slow.queue) <= 5
+
+
+def test_orders_are_never_dropped_and_depth_tracks_backlog():
+    async def run():
+        bus = AsyncMessageBus()
+        written = []
+
+        async def slow_writer(order):
+            await asyncio.sleep(0.001)
+            written.append(order)
+
+        orders = bus.subscribe(ORDERS, slow_writer, name="db_writer", maxsize=5)
+        await bus.start()
+        for i in range(50):
+            bus.publish(ORDERS, i)
+        depth = REGISTRY.get_sample_value("xalgo_bus_queue_depth", {"topic": ORDERS, "subscriber": "db_writer"})
+        await bus.drain()
+        await bus.stop()
+        return orders, written, depth
+
+    orders, written, depth = asyncio.run(run())
+    assert orders.overflow == UNBOUNDED and orders.dropped == 0
+    assert written == list(range(50))
+    assert depth == 50  # Set on publish, not only after a batch is consumed
+
+
+def test_lossless_topic_rejects_a_dropping_policy():
+    bus = AsyncMessageBus()
+    with pytest.raises(ValueError):
+        bus.subscribe(ORDERS, print, overflow=DROP_OLDEST)
+    assert bus.subscribe(TRADES, print, overflow=UNBOUNDED).overflow == UNBOUNDED
+    assert bus.subscribe(TRADES, print).overflow == DROP_OLDEST
@@ -0,0 +1,80 @@
+import sys
+import os
+import multiprocessing
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+from filters import model_cache
+from filters.ml_filter import MLFilter
+
+
+def write_model(path, seed=0):
+    features = MLFilter(model_path="", anomaly_path="").feature_order
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(300, len(features))), columns=features)
+    y = np.sign(X["spread"]).astype(int)
+    joblib.dump(RandomForestClassifier(n_estimators=8, random_state=seed).fit(X, y), path)
+    return X
+
+
+def test_components_share_one_model_and_mapped_arrays(tmp_path):
+    model_cache.clear()
+    X = write_model(tmp_path / "a.pkl")
+    (tmp_path / "b.pkl").write_bytes((tmp_path / "a.pkl").read_bytes())
+
+    first = MLFilter(model_path=str(tmp_path / "a.pkl"), anomaly_path="")
+    second = MLFilter(model_path=str(tmp_path / "b.pkl"), anomaly_path="")  # Same bytes, other path
+    assert first.model is second.model
+    assert first.compiled is second.compiled
+
+    # Node arrays are read-only views of the cache files, not private heap copies
+    arrays = first.compiled.threshold
+    assert not arrays.flags.writeable and isinstance(arrays.base, np.memmap)
+
+    rows = X.head(40).to_numpy()
+    np.testing.assert_array_equal(first.predict_proba(rows), first.model.predict_proba(X.head(40)))
+
+
+def test_new_process_maps_the_cache_instead_of_compiling(tmp_path):
+    model_cache.clear()
+    write_model(tmp_path / "m.pkl")
+    expected = MLFilter(model_path=str(tmp_path / "m.pkl"), anomaly_path="").compiled.threshold.copy()
+
+    model_cache.clear()  # As if in a fresh process: only the on-disk cache remains
+    calls = []
+    compiled = model_cache.load_compiled(tmp_path / "m.pkl", None, calls.append)
+    assert calls == [] and np.array_equal(compiled.threshold, expected)
+
+
+def test_changed_artifact_is_reloaded(tmp_path):
+    model_cache.clear()
+    path = tmp_path / "m.pkl"
+    write_model(path, seed=0)
+    before = MLFilter(model_path=str(path), anomaly_path="")
+    write_model(path, seed=1)
+    os.utime(path, ns=(0, 0))  # Make sure the stat key changes even on coarse clocks
+    after = MLFilter(model_path=str(path), anomaly_path="")
+    assert after.model is not before.model
+    assert not np.array_equal(after.compiled.threshold, before.compiled.threshold)
+
+
+def _worker_predict(args):
+    path, rows = args
+    ml_filter = MLFilter(model_path=path, anomaly_path="")
+    return ml_filter.predict_proba(rows), ml_filter.compiled.threshold.base.filename
+
+
+def test_forked_workers_reuse_the_parent_load(tmp_path):
+    model_cache.clear()
+    X = write_model(tmp_path / "m.pkl")
+    parent = MLFilter(model_path=str(tmp_path / "m.pkl"), anomaly_path="")
+    rows = X.head(10).to_numpy()
+    with multiprocessing.get_context("fork").Pool(1) as pool:
+        proba, filename = pool.map(_worker_predict, [(str(tmp_path / "m.pkl"), rows)])[0]
+    np.testing.assert_array_equal(proba, parent.predict_proba(rows))
+    assert filename == parent.compiled.threshold.base.filename
@@ -0,0 +1,119 @@
+import sys
+import os
+import subprocess
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+from filters.ml_filter import MLFilter
+from filters.model_registry import ModelRegistry, list_versions, publish_model
+from strategy_core.signal_generator import SignalGenerator
+
+
+def live_filter():
+    return MLFilter(model_path="missing.pkl", anomaly_path="missing.pkl")
+
+
+def fit_model(feature_order, seed=0, trees=5):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(400, len(feature_order))), columns=feature_order)
+    y = np.where(X.iloc[:, 0] > 0.5, 1, np.where(X.iloc[:, 0] < -0.5, -1, 0))
+    return RandomForestClassifier(n_estimators=trees, random_state=seed).fit(X, y)
+
+
+def test_publish_poll_swap_and_rollback(tmp_path):
+    ml_filter = live_filter()
+    registry = ModelRegistry(tmp_path, ml_filter)
+    features = ml_filter.feature_order
+
+    assert publish_model(tmp_path, fit_model(features, seed=1), features) == 1
+    assert publish_model(tmp_path, fit_model(features, seed=2), features) == 2
+    assert list_versions(tmp_path) == [1, 2]
+
+    assert registry.poll() == 2  # Straight to the newest
+    assert ml_filter.active.version == 2 and ml_filter.compiled is not None
+    assert registry.poll() is None
+
+    fv = dict(zip(features, [0.9, 0, 0, 0, 0, 0]))
+    assert ml_filter.predict_with_confidence(fv)["signal"] == 1
+
+    # Nothing before v2 was live, so there is nothing to roll back to
+    assert registry.rollback() is None
+
+    publish_model(tmp_path, fit_model(features, seed=3), features)
+    assert registry.poll() == 3
+    assert registry.rollback() == 2
+    assert registry.poll() is None  # v3 was rolled back from; it is not reloaded
+    assert registry.status()["rejected"] == [3]
+
+
+def test_schema_mismatch_is_rejected_and_live_model_kept(tmp_path):
+    ml_filter = live_filter()
+    registry = ModelRegistry(tmp_path, ml_filter)
+    features = ml_filter.feature_order
+
+    publish_model(tmp_path, fit_model(features), features)
+    registry.poll()
+
+    wide = features + ["confidence_score", "anomaly_score"]
+    publish_model(tmp_path, fit_model(wide), wide)
+    assert registry.poll() is None
+    assert ml_filter.active.version == 1
+    assert 2 in registry.rejected
+
+
+def test_background_thread_swaps_in_new_versions(tmp_path):
+    ml_filter = live_filter()
+    registry = ModelRegistry(tmp_path, ml_filter, poll_interval=0.01)
+    registry.start()
+    try:
+        publish_model(tmp_path, fit_model(ml_filter.feature_order), ml_filter.feature_order)
+        for _ in range(500):
+            if ml_filter.active.version == 1:
+                break
+            time.sleep(0.01)
+    finally:
+        registry.stop()
+    assert ml_filter.active.version == 1
+
+
+def test_attached_filters_follow_swaps_and_rollbacks(tmp_path):
+    ml_filter = live_filter()
+    registry = ModelRegistry(tmp_path, ml_filter)
+    features = ml_filter.feature_order
+    generator = SignalGenerator(ml_filter=ml_filter)
+    other = live_filter()  # e.g. the execution controller's own SignalGenerator filter
+    registry.attach(other)
+
+    publish_model(tmp_path, fit_model(features, seed=1), features)
+    publish_model(tmp_path, fit_model(features, seed=2), features)
+    registry.poll()
+    publish_model(tmp_path, fit_model(features, seed=3), features)
+    registry.poll()
+    assert generator.ml_filter.active.version == other.active.version == 3
+    assert other.active is ml_filter.active
+
+    assert registry.rollback() == 2
+    assert other.active.version == 2
+
+
+def test_trainer_cli_publishes_a_version_the_registry_accepts(tmp_path):
+    features = live_filter().feature_order
+    wide = features + ["confidence_score", "cointegration_stability_score", "anomaly_score"]
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(300, len(wide))), columns=wide)
+    df["label"] = np.where(df["spread"] > 0.5, -1, np.where(df["spread"] < -0.5, 1, 0))
+    (tmp_path / "ml_model" / "data").mkdir(parents=True)
+    df.to_csv(tmp_path / "ml_model" / "data" / "features_triangular_labeled.csv", index=False)
+
+    script = os.path.join(os.path.dirname(__file__), "..", "tools", "train_ml_filter_combined.py")
+    env = dict(os.environ, XALGO_MODEL_REGISTRY=str(tmp_path / "registry"))
+    subprocess.run([sys.executable, script], cwd=tmp_path, env=env, check=True, capture_output=True)
+
+    ml_filter = live_filter()
+    assert ModelRegistry(tmp_path / "registry", ml_filter).poll() == 1
+    assert ml_filter.active.version == 1
@@ -0,0 +1,129 @@
+import sys
+import os
+import asyncio
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from data_pipeline.order_book import OrderBook, OrderBookManager, LocalDepthSource
+
+
+def replay(source, pair="btcusdt"):
+    manager = OrderBookManager(source, [pair])
+
+    async def run():
+        for msg in source.stream():
+            await manager.on_depth_update(msg)
+            await asyncio.sleep(0)  # A socket reader yields between frames; resync tasks run here
+        await manager.close()
+
+    asyncio.run(run())
+    return manager
+
+
+def test_snapshot_and_diffs():
+    book = OrderBook("btcusdt")
+    book.load_snapshot({
+        "lastUpdateId": 10,
+        "bids": [["100.0", "1"], ["99.0", "2"]],
+        "asks": [["101.0", "1"], ["102.0", "3"]]
+    })
+
+    assert book.apply_diff({"U": 5, "u": 9, "b": [["100.0", "0"]], "a": []})  # stale, ignored
+    assert book.best_bid() == 100.0
+
+    assert book.apply_diff({"U": 11, "u": 12, "b": [["100.5", "4"], ["99.0", "0"]], "a": [["101.0", "0"]]})
+    assert book.best_bid() == 100.5
+    assert book.best_ask() == 102.0
+    (bid_px, bid_qty), (ask_px, _) = book.depth(5)
+    assert bid_px.tolist() == [100.5, 100.0]
+    assert bid_qty.tolist() == [4.0, 1.0]
+    assert ask_px.tolist() == [102.0]
+
+
+def test_gap_marks_book_unsynced():
+    book = OrderBook("btcusdt")
+    book.load_snapshot({"lastUpdateId": 10, "bids": [], "asks": []})
+    assert not book.apply_diff({"U": 13, "u": 14, "b": [], "a": []})
+    assert not book.synced
+
+
+def test_manager_matches_reference_without_gaps():
+    source = LocalDepthSource.synthetic(n_updates=2000)
+    manager = replay(source)
+    book = manager.get_book("btcusdt")
+
+    assert book.synced
+    assert manager.resyncs["btcusdt"] == 1
+    assert book.to_snapshot() == source.reference.to_snapshot()
+
+
+def test_manager_resyncs_across_gaps():
+    source = LocalDepthSource.synthetic(n_updates=2100, drop_every=250)
+    manager = replay(source)
+    book = manager.get_book("btcusdt")
+
+    assert book.synced
+    assert manager.resyncs["btcusdt"] == 1 + 2100 // 250
+    assert book.to_snapshot() == source.reference.to_snapshot()
+
+
+class SlowSnapshotSource:
+    """
+    Serves snapshots after `delay` seconds; the first `stale` snapshots are older than the stream.
+    """
+
+    def __init__(self, source, delay=0.0, stale=0):
+        self.source = source
+        self.delay = delay
+        self.stale = stale
+        self.requested_at = []
+
+    async def get_snapshot(self, pair):
+        self.requested_at.append(asyncio.get_running_loop().time())
+        await asyncio.sleep(self.delay)
+        if len(self.requested_at) <= self.stale:
+            return dict(self.source.snapshots[pair][0], lastUpdateId=0)
+        return self.source.snapshots[pair][-1]
+
+
+def test_burst_of_diffs_while_unsynced_costs_one_snapshot_and_never_blocks():
+    source = LocalDepthSource.synthetic(n_updates=300)
+    slow = SlowSnapshotSource(source, delay=0.05)
+    manager = OrderBookManager(slow, ["btcusdt"])
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for msg in source.diffs[:50]:
+            assert await manager.on_depth_update(msg) is None  # Buffered, not waiting on the snapshot
+            await asyncio.sleep(0)
+        assert loop.time() - started < 0.05
+        await asyncio.sleep(0.1)  # Snapshot lands; the buffered diffs are replayed on it
+        for msg in source.diffs[50:]:
+            assert await manager.on_depth_update(msg) is not None
+        await manager.close()
+
+    asyncio.run(run())
+    assert len(slow.requested_at) == 1
+    assert manager.get_book("btcusdt").to_snapshot() == source.reference.to_snapshot()
+
+
+def test_snapshot_older_than_buffered_diffs_is_retried_with_backoff():
+    source = LocalDepthSource.synthetic(n_updates=300)
+    source.snapshots["btcusdt"] = [source.reference.to_snapshot()]
+    source.snapshots["btcusdt"][0]["lastUpdateId"] = source.diffs[9]["u"]
+    # Stale snapshots (lastUpdateId=0) cannot be bridged by the first buffered diff (U=101)
+    slow = SlowSnapshotSource(source, stale=3)
+    manager = OrderBookManager(slow, ["btcusdt"], min_backoff=0.01, max_backoff=0.03)
+
+    async def run():
+        for msg in source.diffs[:10]:
+            await manager.on_depth_update(msg)
+        while manager.resyncing("btcusdt"):
+            await asyncio.sleep(0.005)
+
+    asyncio.run(run())
+    gaps = [b - a for a, b in zip(slow.requested_at, slow.requested_at[1:])]
+    assert len(slow.requested_at) == 4
+    assert gaps[0] >= 0.01 and gaps[1] >= 0.02 and 0.03 <= gaps[2] < 0.06  # Doubling, capped
+    assert manager.get_book("btcusdt").synced
@@ -0,0 +1,74 @@
+import sys
+import os
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+
+from filters.ml_filter import MLFilter
+from filters.model_registry import ModelRegistry
+from filters.retraining import RetrainingService
+
+
+def labelled_dataset(path, feature_order, n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.normal(size=(n, len(feature_order))), columns=feature_order)
+    df["label"] = np.where(df["spread"] > 0.5, -1, np.where(df["spread"] < -0.5, 1, 0))
+    df.to_csv(path, index=False)
+
+
+def test_drift_retraining_runs_out_of_process_and_publishes(tmp_path):
+    ml_filter = MLFilter(model_path="missing.pkl", anomaly_path="missing.pkl")
+    registry = ModelRegistry(tmp_path / "registry", ml_filter)
+    data = tmp_path / "features.csv"
+    labelled_dataset(data, ml_filter.feature_order)
+
+    service = RetrainingService(registry, data_path=str(data), registry_dir=str(tmp_path / "registry"),
+                                min_interval=3600, niceness=1)
+    service.start()
+    try:
+        assert service.trigger("test drift")
+        assert not service.trigger("again")  # One run in flight, and debounced for an hour after
+        version, _, cached = service._future.result(timeout=120)
+        assert version == 1 and not cached
+        for _ in range(500):  # The done-callback may still be running
+            if service.runs:
+                break
+            time.sleep(0.01)
+        assert service.last_version == 1 and not service.running
+
+        # The worker ran the training, the live process only swaps the artifact in
+        assert registry.poll() == 1
+        assert ml_filter.active.version == 1
+
+        service.min_interval = 0
+        assert service.trigger("retrain on the same data")
+        version, _, cached = service._future.result(timeout=120)
+        assert version == 2 and cached  # Dataset reused from the worker's cache
+    finally:
+        service.stop()
+
+
+def test_worker_is_not_forked_from_a_multithreaded_process(tmp_path):
+    ml_filter = MLFilter(model_path="missing.pkl", anomaly_path="missing.pkl")
+    data = tmp_path / "features.csv"
+    labelled_dataset(data, ml_filter.feature_order)
+    service = RetrainingService(None, data_path=str(data), registry_dir=str(tmp_path / "registry"),
+                                feature_order=ml_filter.feature_order, niceness=0)
+
+    release = threading.Event()
+    other = threading.Thread(target=release.wait)  # Stands in for the metrics server thread
+    other.start()
+    try:
+        service.start()
+        assert service._pool._mp_context.get_start_method() == "forkserver"
+        assert service.trigger("drift")
+        version, _, _ = service._future.result(timeout=120)
+        assert version == 1
+    finally:
+        release.set()
+        other.join()
+        service.stop()
@@ -0,0 +1,97 @@
+import sys
+import os
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.ring_buffer import RingBuffer
+
+
+def sequential_stats(window):
+    # The plain oldest-first sums _recenter() is documented to reproduce
+    total = 0.0
+    for v in window:
+        total += v
+    mean = total / len(window)
+    m2 = 0.0
+    for v in window:
+        m2 += (v - mean) * (v - mean)
+    return mean, m2 / len(window)
+
+
+def test_wraparound_keeps_oldest_first_order():
+    rb = RingBuffer(5)
+    with pytest.raises(IndexError):
+        rb.last()
+    for i in range(3):
+        rb.push(i)
+    assert rb.view().tolist() == [0.0, 1.0, 2.0] and not rb.full()
+
+    for i in range(3, 13):
+        rb.append(i)
+        expected = list(range(max(0, i - 4), i + 1))
+        assert rb.view().tolist() == expected
+        assert list(rb) == expected
+        assert rb.last() == i and rb[0] == expected[0] and rb[-1] == i
+    assert len(rb) == rb.maxlen == 5 and rb.full()
+    assert rb.view().base is not None  # Zero-copy slice of the backing array
+
+    rb.clear()
+    assert len(rb) == 0 and rb.view().size == 0 and rb.mean() == 0.0 and rb.var() == 0.0
+    rb.push(7)
+    assert rb.view().tolist() == [7.0] and rb.mean() == 7.0
+
+
+def test_width_holds_rows_without_statistics():
+    rb = RingBuffer(4, width=3)
+    for i in range(11):
+        rb.push([i, 10 * i, 100 * i])
+        view = rb.view()
+        first = max(0, i - 3)
+        assert view.shape == (i - first + 1, 3)
+        assert view[:, 0].tolist() == list(range(first, i + 1))
+        assert view[:, 2].tolist() == [100 * j for j in range(first, i + 1)]
+    assert rb.last().tolist() == [10, 100, 1000]
+    assert rb.mean() == 0.0  # Rows are not tracked
+
+    ints = RingBuffer(3, dtype=np.int64)
+    for i in range(5):
+        ints.push(i)
+    assert ints.view().tolist() == [2, 3, 4] and ints.view().dtype == np.int64
+
+
+@pytest.mark.parametrize("capacity", [1, 7, 200])
+def test_running_stats_match_numpy_over_long_streams(capacity):
+    rng = np.random.default_rng(capacity)
+    # Large offset and shifting scale: the case where a naive sum-of-squares loses precision
+    values = 1e4 + np.cumsum(rng.normal(0, 1, 50_000)) * rng.choice([1e-3, 1.0, 1e3], size=50_000)
+    rb = RingBuffer(capacity)  # Default recenter_every=10000: five exact recomputes over the stream
+    for i, v in enumerate(values):
+        rb.push(v)
+        if i % 997 == 0 or i == len(values) - 1:
+            window = values[max(0, i - capacity + 1):i + 1]
+            scale = max(np.abs(window).max(), 1.0)
+            assert abs(rb.mean() - np.mean(window)) <= 1e-9 * scale
+            assert abs(rb.var() - np.var(window)) <= 1e-9 * scale ** 2
+            assert abs(rb.std() - np.std(window)) <= 1e-9 ** 0.5 * scale  # sqrt amplifies error near zero
+            assert abs(rb.sum() - np.sum(window)) <= 1e-9 * scale * capacity
+
+
+def test_recenter_resets_statistics_to_exact_sums():
+    rng = np.random.default_rng(5)
+    values = 1e6 + rng.normal(0, 1e-3, 5_000)
+    rb = RingBuffer(64, recenter_every=1000)
+    for i, v in enumerate(values, start=1):
+        rb.push(v)
+        if i % 1000 == 0:
+            mean, var = sequential_stats(rb.view().tolist())
+            # Bit-for-bit, not approximately: compiled batch kernels rely on it
+            assert rb.mean() == mean and rb.var() == var
+
+    # Recentering also happens before the window is full
+    early = RingBuffer(100, recenter_every=10)
+    for v in values[:10]:
+        early.push(v)
+    assert (early.mean(), early.var()) == sequential_stats(values[:10].tolist())
@@ -0,0 +1,66 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+
+from filters.ml_filter import MLFilter
+from filters.tree_ensemble import CompiledForest, fidelity_error
+
+FEATURES = ["btc_usd", "eth_usd", "eth_btc", "implied_ethbtc", "spread", "z_score"]
+
+
+def training_frame(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    btc = 30000 + rng.normal(0, 500, n)
+    eth = 2000 + rng.normal(0, 40, n)
+    implied = eth / btc
+    eth_btc = implied + rng.normal(0, 2e-4, n)
+    spread = eth_btc - implied
+    X = pd.DataFrame({"btc_usd": btc, "eth_usd": eth, "eth_btc": eth_btc, "implied_ethbtc": implied,
+                      "spread": spread, "z_score": spread / 2e-4}, columns=FEATURES)
+    y = np.where(spread > 1e-4, -1, np.where(spread < -1e-4, 1, 0))
+    return X, y
+
+
+@pytest.fixture(scope="module")
+def forest():
+    X, y = training_frame()
+    X.iloc[::50, 5] = np.nan  # Exercise the learned missing-value directions
+    return RandomForestClassifier(n_estimators=40, max_depth=7, random_state=42).fit(X, y), X
+
+
+def test_compiled_forest_matches_predict_proba(forest):
+    model, X = forest
+    compiled = CompiledForest.from_model(model)
+
+    rows = np.vstack([X.to_numpy(), compiled.probe_rows(2000)])
+    expected = model.predict_proba(pd.DataFrame(rows, columns=FEATURES))
+    np.testing.assert_array_equal(compiled.predict_proba(rows), expected)
+    np.testing.assert_array_equal(compiled.predict_proba(rows[7]), expected[7:8])  # Single 1D row
+    assert fidelity_error(model, compiled, rows) == 0.0
+
+
+def test_unsupported_models_are_rejected():
+    X, y = training_frame(300)
+    with pytest.raises(TypeError):
+        CompiledForest.from_model(GradientBoostingClassifier(n_estimators=5).fit(X, y))
+
+
+def test_ml_filter_compiled_path_matches_sklearn_path(forest, tmp_path):
+    model, X = forest
+    path = tmp_path / "rf.pkl"
+    joblib.dump(model, path)
+    missing = str(tmp_path / "missing_anomaly.pkl")
+
+    compiled = MLFilter(model_path=str(path), anomaly_path=missing)
+    reference = MLFilter(model_path=str(path), anomaly_path=missing, compile_model=False)
+    assert compiled.compiled is not None and reference.compiled is None
+
+    for fv in X.head(200).to_dict("records"):
+        a, b = compiled.predict_with_confidence(fv), reference.predict_with_confidence(fv)
+        assert (a["signal"], a["confidence"]) == (b["signal"], b["confidence"])
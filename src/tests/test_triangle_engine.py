@@ -0,0 +1,61 @@
+import sys
+import os
+import logging
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from feature_engineering.feature_engineer import FeatureEngineer
+from feature_engineering.triangle_engine import TriangleEngine, TriangleUniverse
+from messaging.market_event import MarketEvent
+
+logging.getLogger("feature_engineer").setLevel(logging.WARNING)
+
+
+def test_universe_builds_triangles_and_symbol_index():
+    universe = TriangleUniverse.from_assets(["BTC", "ETH", "BNB"])
+    assert ("btcusdt", "ethusdt", "ethbtc") in universe.triangles
+    assert ("ethusdt", "bnbusdt", "bnbeth") in universe.triangles
+    assert ("ethbtc", "bnbbtc", "bnbeth") in universe.triangles
+    assert len(universe) == 4
+
+    for pair in universe.symbols:
+        tris = universe.triangles_for(pair)
+        assert tris == [t for t, tri in enumerate(universe.triangles) if pair in tri]
+    assert universe.triangles_for("solusdt") == []
+
+
+def test_each_triangle_matches_a_streaming_feature_engineer():
+    universe = TriangleUniverse.from_assets(["BTC", "ETH", "BNB", "SOL"])
+    engine = TriangleEngine(universe, max_leg_age_ms=50)
+    reference = [FeatureEngineer(legs=tri, max_leg_age_ms=50) for tri in universe.triangles]
+
+    rng = np.random.default_rng(5)
+    usd = {"USDT": 1.0, "BTC": 30000.0, "ETH": 1800.0, "BNB": 300.0, "SOL": 20.0}
+    emitted = 0
+    ts = 1_700_000_000_000_000_000
+    for _ in range(6000):
+        ts += int(rng.choice([1_000_000, 80_000_000], p=[0.98, 0.02]))
+        base, quote = universe.markets[rng.integers(len(universe.markets))]
+        usd[base] *= np.exp(rng.normal(0, 1e-4))
+        price = usd[base] / usd[quote]
+        pair = f"{base}{quote}".lower()
+
+        ids = engine.on_tick(pair, price, 1.0, ts).tolist()
+        expected = {}
+        for t, fe in enumerate(reference):
+            fv = fe.update(MarketEvent("trade", ts, "binance", pair, price=price, quantity=1.0))
+            if fv:
+                expected[t] = fv
+
+        assert sorted(ids) == sorted(expected)
+        for t in ids:
+            got, fv = engine.feature_vector(t), expected[t]
+            emitted += 1
+            assert got["timestamp"] == fv["timestamp"] and got["stale"] == fv["stale"]
+            assert got["spread"] == fv["spread"]
+            assert got["spread_zscore"] == fv["spread_zscore"]
+            assert got["volatility"] == fv["volatility"]
+
+    assert emitted > 10000
@@ -0,0 +1,53 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from feature_engineering.feature_engineer import FeatureEngineer
+from feature_engineering.triangle_state import TriangleState
+from messaging.market_event import MarketEvent
+
+MS = 1_000_000
+
+
+def trade(pair, price, ts_ms):
+    return MarketEvent("trade", ts_ms * MS, "binance", pair, price=price, quantity=1.0)
+
+
+def test_implied_and_spread_track_leg_changes():
+    tri = TriangleState()
+    assert not tri.update("solusdt", 20.0, 1.0, 0)
+    tri.update("ethbtc", 0.05, 1.0, 1 * MS)
+    tri.update("btcusdt", 30000.0, 1.0, 2 * MS)
+    assert not tri.complete() and tri.stale()
+
+    tri.update("ethusdt", 1500.0, 2.0, 3 * MS)
+    assert tri.complete()
+    assert tri.implied == 1500.0 / 30000.0
+    assert tri.spread == 0.05 - 1500.0 / 30000.0
+    assert tri.leg_age_ns() == 2 * MS
+
+    tri.update("ethbtc", 0.051, 1.0, 4 * MS)
+    assert tri.spread == 0.051 - 1500.0 / 30000.0
+    tri.update("btcusdt", 25000.0, 1.0, 5 * MS)
+    assert tri.implied == 1500.0 / 25000.0
+    assert tri.leg_age_ns() == 2 * MS  # ethusdt at 3ms is now the oldest leg
+
+
+def test_warm_up_waits_for_fresh_legs_and_tags_staleness():
+    fe = FeatureEngineer(max_leg_age_ms=100)
+    assert fe.update(trade("btcusdt", 30000.0, 0)) is None
+    assert fe.update(trade("ethusdt", 1500.0, 10)) is None
+    # Complete, but btcusdt is 500ms old: still warming up
+    assert fe.update(trade("ethbtc", 0.05, 500)) is None
+
+    fv = fe.update(trade("btcusdt", 30000.0, 520))
+    assert fv is None  # ethusdt (10ms) is still stale
+    fv = fe.update(trade("ethusdt", 1500.0, 530))
+    assert fv["stale"] is False and abs(fv["leg_age_ms"] - 30.0) < 1e-9
+    assert fv["timestamp"] == 530 * MS
+    assert (fv["btc_price"], fv["eth_price"], fv["eth_btc"]) == (30000.0, 1500.0, 0.05)
+
+    # After warm-up, vectors keep flowing but are tagged once a leg goes quiet
+    fv = fe.update(trade("btcusdt", 30001.0, 900))
+    assert fv["stale"] is True and abs(fv["leg_age_ms"] - 400.0) < 1e-9
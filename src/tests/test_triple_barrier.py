@@ -0,0 +1,80 @@
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from feature_engineering.triple_barrier import label_spread, triple_barrier_labels
+
+
+def reference_label_triple_barrier(df, horizon, vol_mult):
+    """
+    The original pandas loop from scripts/train_triangular_model.py, kept as the parity oracle.
+    """
+    labels = np.zeros(len(df))
+    rolling_std = df['spread'].rolling(horizon).std()
+
+    for i in range(len(df) - horizon):
+        current_spread = df['spread'].iloc[i]
+        thresh = vol_mult * rolling_std.iloc[i]
+        future = df['spread'].iloc[i+1:i+horizon+1]
+
+        tp = current_spread + thresh
+        sl = current_spread - thresh
+
+        if (future >= tp).any():
+            labels[i] = 1
+        elif (future <= sl).any():
+            labels[i] = -1
+        else:
+            labels[i] = 0
+    return labels
+
+
+def spread_frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    spread = np.cumsum(rng.normal(0, 1e-5, n))
+    spread[rng.random(n) < 0.01] = np.nan
+    return pd.DataFrame({"spread": spread})
+
+
+def test_matches_original_labeler():
+    df = spread_frame(3000)
+    for horizon, vol_mult in ((10, 1.0), (30, 2.0)):
+        labels, hits = label_spread(df["spread"], horizon, vol_mult)
+        np.testing.assert_array_equal(labels, reference_label_triple_barrier(df, horizon, vol_mult))
+        assert (hits[-horizon:] == -1).all()
+        assert (hits[:-horizon] > np.arange(len(df) - horizon)).all()
+
+
+def test_parallel_chunks_match_single_pass():
+    df = spread_frame(50_000, seed=1)
+    serial = label_spread(df["spread"], 50, 1.5, lower_mult=0.8)
+    chunked = label_spread(df["spread"], 50, 1.5, lower_mult=0.8, n_jobs=4)
+    rng = np.random.default_rng(2)
+    values = df["spread"].to_numpy()
+    vertical = np.arange(len(values)) + rng.integers(1, 200, len(values))
+    loose = triple_barrier_labels(values, values + 2e-5, values - 1e-5, vertical=vertical)
+    loose_chunked = triple_barrier_labels(values, values + 2e-5, values - 1e-5, vertical=vertical, n_jobs=3,
+                                          chunk_size=7000)
+    for a, b in ((serial, chunked), (loose, loose_chunked)):
+        np.testing.assert_array_equal(a[0], b[0])
+        np.testing.assert_array_equal(a[1], b[1])
+
+
+def test_first_touch_and_hit_times():
+    values = np.array([0.0, -1.0, 2.0, 0.0, 0.0, 0.0])
+    upper, lower = values + 1.5, values - 0.5
+
+    labels, hits = triple_barrier_labels(values, upper, lower, horizon=3, first_touch=True)
+    assert labels.tolist()[:3] == [-1, 1, -1] and hits.tolist()[:3] == [1, 2, 3]
+
+    # Upper barrier anywhere before the vertical barrier wins (original behaviour)
+    labels, hits = triple_barrier_labels(values, upper, lower, horizon=3, first_touch=False)
+    assert labels.tolist()[:3] == [1, 1, -1] and hits.tolist()[:3] == [2, 2, 3]
+
+    # No touch: label 0 at the vertical barrier; rows without a full horizon are unlabeled
+    labels, hits = triple_barrier_labels(values, values + 10, values - 10, horizon=2)
+    assert labels.tolist() == [0] * 6 and hits.tolist() == [2, 3, 4, 5, -1, -1]
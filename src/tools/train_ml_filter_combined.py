@@ -5,17 +5,31 @@ Uses features from confidence, anomaly, and cointegration metrics.
 """
 
 import os
+import sys
 import pandas as pd
 import joblib
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import TimeSeriesSplit
 from sklearn.metrics import classification_report, accuracy_score
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from filters.ml_filter import FEATURE_ORDER
+from filters.model_registry import publish_model
+
 # -------------------------------
 # Config
 # -------------------------------
 DATA_PATH = "ml_model/data/features_triangular_labeled.csv"
 MODEL_OUTPUT_PATH = "ml_model/triangular_rf_model.pkl"
+REGISTRY_DIR = os.getenv("XALGO_MODEL_REGISTRY", "ml_model/registry")
+
+# Select inference-safe feature columns
+FEATURE_COLS = [
+    "btc_usd", "eth_usd", "eth_btc",
+    "implied_ethbtc", "spread", "z_score",
+    "confidence_score", "cointegration_stability_score", "anomaly_score"
+]
 
 # -------------------------------
 # Basic Fallback Labeling
@@ -52,14 +66,7 @@ def load_data(path=DATA_PATH):
 # -------------------------------
 # Train Model with Composite Features
 # -------------------------------
-def train_model(df):
-    # Select inference-safe feature columns
-    feature_cols = [
-        "btc_usd", "eth_usd", "eth_btc",
-        "implied_ethbtc", "spread", "z_score",
-        "confidence_score", "cointegration_stability_score", "anomaly_score"
-    ]
-
+def train_model(df, feature_cols=FEATURE_COLS):
     if not all(col in df.columns for col in feature_cols):
         missing = [col for col in feature_cols if col not in df.columns]
         print(f"❌ Missing required features: {missing}")
@@ -101,5 +108,10 @@ if __name__ == "__main__":
         model = train_model(df)
         if model:
             save_model(model)
+        # The registry only accepts MLFilter's live schema, so publish a model trained on exactly those columns
+        live_model = train_model(df, feature_cols=FEATURE_ORDER)
+        if live_model:
+            version = publish_model(REGISTRY_DIR, live_model, FEATURE_ORDER, source=DATA_PATH)
+            print(f"✅ Published model v{version} to {REGISTRY_DIR}")
     else:
         print("⚠️ Training aborted — data invalid or missing.")
@@ -0,0 +1,116 @@
+# /src/utils/ring_buffer.py
+
+import math
+
+import numpy as np
+
+from utils.rolling_kernels import window_moments
+
+
+class RingBuffer:
+    """
+    Fixed-capacity rolling window backed by one preallocated NumPy array.
+
+    Every value is written twice (at i and i + capacity), so the current window is
+    always a contiguous slice and view() is zero-copy. For scalar windows the
+    sum, mean and variance are maintained incrementally (sliding Welford) and
+    recomputed exactly every `recenter_every` pushes to bound float drift.
+
+    Pass `width` to hold fixed-size vectors (rows) instead of scalars; rows get
+    O(1) push and zero-copy views but no running statistics.
+    """
+
+    def __init__(self, capacity: int, dtype=np.float64, width: int = None, recenter_every: int = 10000):
+        self.capacity = capacity
+        self.width = width
+        shape = (2 * capacity,) if width is None else (2 * capacity, width)
+        self._buf = np.zeros(shape, dtype=dtype)
+        self._pos = 0          # Next write slot in [0, capacity)
+        self._count = 0
+        self._track = width is None and np.issubdtype(self._buf.dtype, np.floating)
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._pushes = 0
+        self.recenter_every = recenter_every
+
+    @property
+    def maxlen(self):
+        return self.capacity
+
+    def __len__(self):
+        return self._count
+
+    def full(self) -> bool:
+        return self._count == self.capacity
+
+    def clear(self):
+        self._pos = self._count = self._pushes = 0
+        self._mean = self._m2 = 0.0
+
+    def push(self, value):
+        pos, cap = self._pos, self.capacity
+
+        if self._track:
+            value = float(value)
+            if self._count < cap:
+                self._count += 1
+                delta = value - self._mean
+                self._mean += delta / self._count
+                self._m2 += delta * (value - self._mean)
+            else:
+                old = float(self._buf[pos])
+                old_mean = self._mean
+                self._mean = old_mean + (value - old) / cap
+                self._m2 += (value - old) * (value - self._mean + old - old_mean)
+        elif self._count < cap:
+            self._count += 1
+
+        self._buf[pos] = value
+        self._buf[pos + cap] = value
+        self._pos = pos + 1 if pos + 1 < cap else 0
+
+        if self._track:
+            self._pushes += 1
+            if self._pushes % self.recenter_every == 0:
+                self._recenter()
+
+    append = push  # deque-compatible name
+
+    def _recenter(self):
+        # Plain sequential sums, oldest first: the kernel compiled rolling windows share, so they match bit-for-bit
+        self._mean, self._m2 = window_moments(self.view().astype(np.float64, copy=False), self._count, 0, self._count)
+
+    def view(self) -> np.ndarray:
+        """
+        Zero-copy contiguous view of the window, oldest first.
+        """
+        end = self._pos + self.capacity
+        return self._buf[end - self._count:end]
+
+    def last(self):
+        if not self._count:
+            raise IndexError("last() on empty RingBuffer")
+        return self._buf[self._pos + self.capacity - 1]
+
+    def __getitem__(self, i):
+        return self.view()[i]
+
+    def __iter__(self):
+        return iter(self.view())
+
+    def sum(self) -> float:
+        return self._mean * self._count
+
+    def mean(self) -> float:
+        return self._mean if self._count else 0.0
+
+    def var(self) -> float:
+        """
+        Population variance of the window (matches np.var / np.std).
+        """
+        if not self._count or self._m2 <= 0.0:
+            return 0.0
+        return self._m2 / self._count
+
+    def std(self) -> float:
+        return math.sqrt(self.var())
@@ -0,0 +1,87 @@
+# /src/utils/rolling_kernels.py
+
+import numpy as np
+from numba import njit
+
+# Rolling-window state rows used by welford_push: write position, count, pushes, mean, m2
+POS, COUNT, PUSHES, MEAN, M2 = range(5)
+# Kalman state rows used by kalman_step: intercept, slope, covariance [[p00, p01], [p01, p11]]
+ALPHA, BETA, P00, P01, P11 = range(5)
+
+
+@njit(cache=True)
+def window_moments(buf, size, start, count):
+    """
+    Mean and sum of squared deviations of the `count` values of ring buf[:size]
+    starting at `start`, as plain sequential sums, oldest first. RingBuffer's
+    exact recenter, so compiled rolling windows reproduce it bit-for-bit.
+    """
+    total = 0.0
+    for j in range(count):
+        total += buf[(start + j) % size]
+    mean = total / count
+    m2 = 0.0
+    for j in range(count):
+        d = buf[(start + j) % size] - mean
+        m2 += d * d
+    return mean, m2
+
+
+@njit(cache=True)
+def welford_push(buf, size, state, value, recenter_every):
+    """
+    Pushes `value` into the ring buf[:size] and slides its mean / m2 (the same
+    update as RingBuffer.push), recomputing both exactly every `recenter_every`
+    pushes. `state` holds POS, COUNT, PUSHES, MEAN, M2 and is updated in place.
+    """
+    pos, count = int(state[POS]), int(state[COUNT])
+    mean, m2 = state[MEAN], state[M2]
+    if count < size:
+        count += 1
+        delta = value - mean
+        mean += delta / count
+        m2 += delta * (value - mean)
+    else:
+        old = buf[pos]
+        old_mean = mean
+        mean = old_mean + (value - old) / size
+        m2 += (value - old) * (value - mean + old - old_mean)
+    buf[pos] = value
+    pos = pos + 1 if pos + 1 < size else 0
+
+    pushes = int(state[PUSHES]) + 1
+    if pushes % recenter_every == 0:
+        mean, m2 = window_moments(buf, size, pos if count == size else 0, count)
+    state[POS], state[COUNT], state[PUSHES] = pos, count, pushes
+    state[MEAN], state[M2] = mean, m2
+
+
+@njit(cache=True)
+def kalman_step(k, x, y, Q, R):
+    """
+    One KalmanSpreadEstimator.update of the regression y = alpha + beta * x on
+    state `k` (ALPHA, BETA, P00, P01, P11, updated in place); returns the residual.
+    """
+    p00, p01, p11 = k[P00], k[P01], k[P11]
+    pp0 = p00 + p01 * x
+    pp1 = p01 + p11 * x
+    S = pp0 + pp1 * x + R
+    if S < 1e-8:
+        S = 1e-8
+    k0 = pp0 / S
+    k1 = pp1 / S
+
+    r = y - (k[ALPHA] + k[BETA] * x)
+    k[ALPHA] += k0 * r
+    k[BETA] += k1 * r
+    k[P00] = p00 - k0 * pp0 + Q
+    k[P01] = p01 - k0 * pp1
+    k[P11] = p11 - k1 * pp1 + Q
+    return r
+
+
+@njit(cache=True)
+def window_std(state):
+    # Population std of a welford_push window; 1.0 when flat, as KalmanSpreadEstimator.spread_std
+    std = np.sqrt(state[M2] / state[COUNT]) if state[M2] > 0.0 else 0.0
+    return std if std != 0.0 else 1.0